@@ -33,6 +33,8 @@ Please cite this paper when you use this software (cf. README.md)
 import TRIVARIATE_SYN
 import TRIVARIATE_UNQ
 import TRIVARIATE_QP
+import TRIVARIATE_BACKENDS
+import TRIVARIATE_MAXENT
 
 import multiprocessing as mp
 from multiprocessing import Pool
@@ -41,8 +43,13 @@ from scipy import sparse
 import numpy as np
 from numpy import linalg as LA
 import math
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import time
+import sys
+try:
+    import resource
+except ImportError:
+    resource = None
 
 log = math.log2
 ln  = math.log
@@ -60,23 +67,167 @@ class MAXENT3D_PID_Exception(Exception):
     pass
 
 
-class Solve_w_ECOS():
+class Support_Index():
+
+    """Array-backed index of a support
 
-    """Solve_w_Ecos.
-    
     (c) Abdullah Makkeh, Dirk Oliver Theis
 
     Permission to use and modify under Apache License version 2.0
 
-    Implements the ecos initialization and functions needed to be used by the children classes that computes PID terms  
-    
+    Stores the cells of a support (e.g., the quadruples (t,x,y,z)) as a
+    structure of int32 columns in lexicographic order; the position of a
+    cell is found by binary search in the sorted raveled keys.
+
     Methods:
-      condentropy__orig(pdf, output)
-               Computes H(T|X,Y,Z) w.r.t the original distribution P
-      entropy_V(V,pdf,output)
-          Computes H(T), H(X), H(Y), or H(Z) w.r.t the original distribution P
+      index(*columns)
+          Computes the positions of cells in the support
+      project(which)
+          Computes the distinct projections of the support onto some columns
+    """
+    def __init__(self, columns, shape):
+        """
+        Args:
+            columns: tuple of numpy.array - the codes of the cells, one
+                     array per variable, in lexicographic order
+
+            shape: tuple - the alphabet sizes of the variables
+        """
+        self.shape       = tuple( int(k) for k in shape )
+        self.columns     = tuple( np.ascontiguousarray(v, dtype=np.int32) for v in columns )
+        self.keys        = np.ravel_multi_index(self.columns, self.shape).astype(np.int64)
+        self.projections = dict()
+    #^ init()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def index(self, *columns):
+        """Computes the positions of cells in the support
+
+        Args:
+            *columns: numpy.array - the codes of the cells, one array per variable
+
+        Returns:
+            numpy.array - the positions of the cells (-1 if not in the support)
+        """
+        keys = np.ravel_multi_index(columns, self.shape)
+        idx  = np.searchsorted(self.keys, keys)
+        hit  = idx < len(self.keys)
+        hit[hit] = self.keys[idx[hit]] == keys[hit]
+        return np.where(hit, idx, -1)
+    #^ index()
+
+    def project(self, which):
+        """Computes the distinct projections of the support onto some columns
+
+        Args:
+            which: tuple - the positions of the columns, e.g., (0,1,2) for (t,x,y)
+
+        Returns:
+            Support_Index - the distinct projections in lexicographic order
+
+            numpy.array - the position of the projection of each cell
+        """
+        which = tuple(which)
+        if which not in self.projections:
+            shape = tuple( self.shape[k] for k in which )
+            keys  = np.ravel_multi_index([ self.columns[k] for k in which ], shape)
+            keys, inv = np.unique(keys, return_inverse=True)
+            self.projections[which] = ( Support_Index(np.unravel_index(keys, shape), shape), inv.ravel() )
+        #^ if
+        return self.projections[which]
+    #^ project()
+#^ class Support_Index
+
+class Model_Cache():
+
+    """LRU cache of model templates
+
+    (c) Abdullah Makkeh, Dirk Oliver Theis
+
+    Permission to use and modify under Apache License version 2.0
+
+    The support and the matrices c, G, h, dims, A of the cone programs only
+    depend on which cells of the marginals are positive, the probabilities
+    only enter the right-hand side b. The templates are stored under a
+    fingerprint of the support (cf. Solve_w_ECOS.support_key), so a pid()
+    of a distribution with a known support only fills in b.
+
+    The cache is only used by pid(..., model_cache='on') (cf. PID_Context).
+    Its templates stay in memory after the call, up to maxsize of them (a
+    pid() call stores one support and up to four programs), until they are
+    dropped as the least recently used or by clear().
+
+    Methods:
+      get(key)
+          Returns the template stored under key (None if there is none)
+      put(key,template)
+          Stores a template, dropping the least recently used one if full
+      clear()
+          Removes all templates
+    """
+    def __init__(self, maxsize=16):
+        """
+        Args:
+            maxsize: int - maximal number of templates (0 disables the cache)
+        """
+        self.maxsize   = maxsize
+        self.templates = OrderedDict()
+        self.hits      = 0
+        self.misses    = 0
+    #^ init()
+
+    def get(self, key):
+        if key in self.templates:
+            self.templates.move_to_end(key)
+            self.hits += 1
+            return self.templates[key]
+        #^ if
+        self.misses += 1
+        return None
+    #^ get()
+
+    def put(self, key, template):
+        if self.maxsize <= 0: return
+        self.templates[key] = template
+        self.templates.move_to_end(key)
+        while len(self.templates) > self.maxsize:
+            self.templates.popitem(last=False)
+        #^ while
+    #^ put()
+
+    def clear(self):
+        self.templates.clear()
+        self.hits   = 0
+        self.misses = 0
+    #^ clear()
+#^ class Model_Cache
+
+# The templates of the cone programs of this process (used by pid(..., model_cache='on'))
+model_cache = Model_Cache()
+
+
+class PID_Context():
+
+    """The data shared by all cone programs of one pid() call
+
+    (c) Abdullah Makkeh, Dirk Oliver Theis
+
+    Permission to use and modify under Apache License version 2.0
+
+    Holds the alphabets, the marginals, and the support of (T,X,Y,Z). It is
+    built once per pid() call and referenced (not copied) by Solve_w_ECOS,
+    Opt_I, and Opt_II; with parallel='on' it is shipped to each worker once
+    (cf. init_worker()). It must not be modified after construction.
+
+    Methods:
+      init_from_arrays(marg_tx,marg_ty,marg_tz,marg_xy,marg_xz,marg_yz)
+          Initializes the support from the dense marginals
+      marginal_rhs(n_coupling)
+          Computes the right-hand side b of the cone programs
     """
-    def __init__(self, marg_tx, marg_ty, marg_tz, marg_xy, marg_xz, marg_yz):
+    def __init__(self, marg_tx, marg_ty, marg_tz, marg_xy, marg_xz, marg_yz, alphabets=None, use_cache=False):
 
         """
         (c) Abdullah Makkeh, Dirk Oliver Theis
@@ -95,48 +246,252 @@ class Solve_w_ECOS():
             marg_xz: dict() P(X,Z)
 
             marg_yz: dict() P(Y,Z)
+
+            (or the dense marginals numpy.array of a tensor pdf)
+
+            alphabets: list - [T, X, Y, Z] symbols of the codes of the dense
+                       marginals (default = None: the codes themselves)
+
+            use_cache: bool - if True, the support and the model templates
+                       are taken from and stored in model_cache
+                       (default = False)
+
+        The symbols are interned: self.alphabets = [T, X, Y, Z] lists the
+        symbols, and the support, the marginals, and the models use their
+        codes 0..n-1 (cf. Solve_w_ECOS.decode_pdf()).
+        """
+        if type(marg_tx) is np.ndarray and alphabets is not None:
+            # Dense marginals of a coded pdf (cf. coded_pdf())
+            self.alphabets = alphabets
+        elif type(marg_tx) is np.ndarray:
+            # Dense marginals of a tensor pdf: the indices are the codes
+            self.alphabets = [ list(range(marg_tx.shape[0])), list(range(marg_tx.shape[1])),
+                               list(range(marg_ty.shape[1])), list(range(marg_tz.shape[1])) ]
+        else:
+            # Codebook: map the symbols of T, X, Y, Z to 0..n-1 once, all
+            # internal work is done on the codes
+            self.alphabets, marg_tx, marg_ty, marg_tz, marg_xy, marg_xz, marg_yz = intern_marginals(marg_tx, marg_ty, marg_tz, marg_xy, marg_xz, marg_yz)
+        #^ if arrays
+
+        self.use_cache = use_cache
+        self.init_from_arrays(marg_tx, marg_ty, marg_tz, marg_xy, marg_xz, marg_yz)
+    #^ init()
+
+    def init_from_arrays(self, marg_tx, marg_ty, marg_tz, marg_xy, marg_xz, marg_yz):
+        """Initializes the support from the dense marginals of a tensor pdf
+
+        The support { (t,x,y,z) : P(t,x)>0, P(t,y)>0, P(t,z)>0 } is
+        obtained by joining the supports of the three marginals on t (cf.
+        support_of_marginals()), and stored in lexicographic order.
+
+        Args:
+            marg_tx: numpy.array - P(T,X) of shape |T|x|X|
+
+            marg_ty: numpy.array - P(T,Y) of shape |T|x|Y|
+
+            marg_tz: numpy.array - P(T,Z) of shape |T|x|Z|
+
+            marg_xy: numpy.array - P(X,Y) of shape |X|x|Y|
+
+            marg_xz: numpy.array - P(X,Z) of shape |X|x|Z|
+
+            marg_yz: numpy.array - P(Y,Z) of shape |Y|x|Z|
+        """
+        # Probability density funciton data (dense, indexed by codes)
+        self.P_tx         = marg_tx
+        self.P_ty         = marg_ty
+        self.P_tz         = marg_tz
+
+        self.P_xy         = marg_xy
+        self.P_xz         = marg_xz
+        self.P_yz         = marg_yz
+
+        # Dict views for the model builders
+        self.b_tx         = marginal_of_array(marg_tx)
+        self.b_ty         = marginal_of_array(marg_ty)
+        self.b_tz         = marginal_of_array(marg_tz)
+
+        self.b_xy         = marginal_of_array(marg_xy)
+        self.b_xz         = marginal_of_array(marg_xz)
+        self.b_yz         = marginal_of_array(marg_yz)
+
+        self.T            = set( np.nonzero( marg_tx.sum(axis=1) > 0 )[0].tolist() )
+        self.X            = set( np.nonzero( marg_tx.sum(axis=0) > 0 )[0].tolist() )
+        self.Y            = set( np.nonzero( marg_ty.sum(axis=0) > 0 )[0].tolist() )
+        self.Z            = set( np.nonzero( marg_tz.sum(axis=0) > 0 )[0].tolist() )
+
+        # Position of the (t,x), (t,y), (t,z) marginal equations (-1 if P = 0)
+        self.rank_tx      = marginal_ranks(marg_tx)
+        self.rank_ty      = marginal_ranks(marg_ty)
+        self.rank_tz      = marginal_ranks(marg_tz)
+
+        # The quadruples (t,x,y,z) of the support, shared by all pdfs with
+        # the same positive cells of P(T,X), P(T,Y), P(T,Z) (cf. Model_Cache)
+        shape             = marg_tx.shape + marg_ty.shape[1:] + marg_tz.shape[1:]
+        self.support_key  = ( shape, np.packbits(marg_tx > 0).tobytes(), np.packbits(marg_ty > 0).tobytes(), np.packbits(marg_tz > 0).tobytes() )
+        self.support      = model_cache.get( ('support', self.support_key) ) if self.use_cache else None
+        if self.support is None:
+            self.support  = Support_Index( support_of_marginals(marg_tx, marg_ty, marg_tz), shape )
+            if self.use_cache: model_cache.put( ('support', self.support_key), self.support )
+        #^ if
+    #^ init_from_arrays()
+
+    def marginal_rhs(self, n_coupling):
+        """Computes the right-hand side b of the cone programs
+
+        Args:
+            n_coupling: int - number of coupling equations (they come first)
+
+        Returns:
+            numpy.array - 0 for the coupling equations, followed by the
+                          positive entries of P(T,X), P(T,Y), and P(T,Z) for
+                          the marginal equations (in row-major order)
+        """
+        return np.concatenate(( np.zeros(n_coupling), self.P_tx[self.P_tx > 0], self.P_ty[self.P_ty > 0], self.P_tz[self.P_tz > 0] )).astype(np.double)
+    #^ marginal_rhs()
+#^ class PID_Context
+
+
+class Solve_w_ECOS():
+
+    """Solve_w_Ecos.
+    
+    (c) Abdullah Makkeh, Dirk Oliver Theis
+
+    Permission to use and modify under Apache License version 2.0
+
+    Implements the ecos initialization and functions needed to be used by the children classes that computes PID terms  
+    
+    Methods:
+      condentropy__orig(pdf, output)
+               Computes H(T|X,Y,Z) w.r.t the original distribution P
+      entropy_V(V,pdf,output)
+          Computes H(T), H(X), H(Y), or H(Z) w.r.t the original distribution P
+      decode_pdf(q)
+          Maps a distribution on the (coded) support back to the original symbols
+      marginal_rhs(n_coupling)
+          Computes the right-hand side b of the cone programs
+      index_dtype(n)
+          Integer type of the indices of the sparse matrices of the cone programs
+      model(c, G, h, dims, A, b)
+          Returns a cone program (and keeps it on the object if keep_model)
+    """
+    def __init__(self, marg_tx=None, marg_ty=None, marg_tz=None, marg_xy=None, marg_xz=None, marg_yz=None, alphabets=None, context=None):
+
+        """
+        (c) Abdullah Makkeh, Dirk Oliver Theis
+
+        Permission to use and modify under Apache License version 2.0
+        
+        Args: 
+            marg_tx, ..., marg_yz, alphabets: as in PID_Context()
+
+            context: PID_Context - shared data of the pid() call; if given,
+                     the marginals are ignored
+                     (default = None: built from the marginals)
+
+        The data of the context are referenced, not copied: self.alphabets,
+        self.support, self.P_tx, etc. are the objects of self.context.
         """
         # ECOS parameters
         self.ecos_kwargs   = dict()
         self.verbose       = False
-
-        # Probability density funciton data
-        self.b_tx         = dict(marg_tx)
-        self.b_ty         = dict(marg_ty)
-        self.b_tz         = dict(marg_tz)
-
-        self.b_xy         = dict(marg_xy)
-        self.b_xz         = dict(marg_xz)
-        self.b_yz         = dict(marg_yz)
-
-        self.T            =set([ t for t,x in self.b_tx.keys() ]
-                               + [ t for t,y in self.b_ty.keys() ]
-                               + [ t for t,z in self.b_tz.keys() ])
-        self.X            = set( [ x  for t,x in self.b_tx.keys() ] )
-        self.Y            = set( [ y  for t,y in self.b_ty.keys() ] )
-        self.Z            = set( [ z  for t,z in self.b_tz.keys() ] )
-        self.idx_of_quad  = dict()
-        self.quad_of_idx  = []
-
-        # Do stuff:
-        for t in self.T:
-            for x in self.X:
-                if (t,x) in self.b_tx.keys():
-                    for y in self.Y:
-                        if (t,y) in self.b_ty.keys():
-                            for z in self.Z:
-                                if (t,z) in self.b_tz.keys():
-                                    self.idx_of_quad[ (t,x,y,z) ] = len( self.quad_of_idx )
-                                    self.quad_of_idx.append( (t,x,y,z) )
-                                #^ if
-                            #^ for z
-                        #^ if
-                    #^ for y
-                #^ if
-            #^ for x
-        #^ for t
+        # Backend of TRIVARIATE_BACKENDS which solves the programs
+        self.cone_solver   = 'ECOS'
+        # Solve the independent blocks of the programs separately (cf. TRIVARIATE_PRESOLVE)
+        self.decompose     = False
+        # Fix the variables pinned by the marginals before ECOS (cf. TRIVARIATE_PRESOLVE)
+        self.presolve      = False
+        # Keep self.c, self.G, self.h, self.dims, self.A, self.b after create_model()
+        self.keep_model    = False
+        # Data of the optima of an earlier pid() call (cf. TRIVARIATE_MAXENT.warm_point())
+        self.warm_start    = None
+
+        if context is None:
+            context = PID_Context(marg_tx, marg_ty, marg_tz, marg_xy, marg_xz, marg_yz, alphabets)
+        #^ if
+        self.context      = context
+        self.alphabets    = context.alphabets
+
+        self.P_tx         = context.P_tx
+        self.P_ty         = context.P_ty
+        self.P_tz         = context.P_tz
+        self.P_xy         = context.P_xy
+        self.P_xz         = context.P_xz
+        self.P_yz         = context.P_yz
+
+        self.b_tx         = context.b_tx
+        self.b_ty         = context.b_ty
+        self.b_tz         = context.b_tz
+        self.b_xy         = context.b_xy
+        self.b_xz         = context.b_xz
+        self.b_yz         = context.b_yz
+
+        self.T            = context.T
+        self.X            = context.X
+        self.Y            = context.Y
+        self.Z            = context.Z
+
+        self.rank_tx      = context.rank_tx
+        self.rank_ty      = context.rank_ty
+        self.rank_tz      = context.rank_tz
+
+        self.support_key  = context.support_key
+        self.support      = context.support
     #^ init()
 
+    def decode_pdf(self, q):
+        """Maps a distribution on the support back to the original symbols
+
+        Args:
+            q: numpy.array - values on the support, q[i] belongs to the i-th
+               quadruple of self.support
+               (e.g., sol_rpq[2::3] of the optimal solution of Opt_I)
+
+        Returns:
+            dictionary - keys: (t,x,y,z) symbols
+                         values: q[i]
+        """
+        T,X,Y,Z = self.alphabets
+        quads = zip( *[ v.tolist() for v in self.support.columns ] )
+        return { (T[t],X[x],Y[y],Z[z]): float(q[i]) for i,(t,x,y,z) in enumerate(quads) }
+    #^ decode_pdf()
+
+    def marginal_rhs(self, n_coupling):
+        """Computes the right-hand side b of the cone programs (cf. PID_Context.marginal_rhs())"""
+        return self.context.marginal_rhs(n_coupling)
+    #^ marginal_rhs()
+
+    def index_dtype(self, n):
+        """Integer type of the indices of the sparse matrices of the cone programs
+
+        Args:
+            n: int - largest index or number of nonzeros
+
+        Returns:
+            numpy.int32 if n fits into it (as scipy stores it anyway), else numpy.int64
+        """
+        return np.int32 if n < np.iinfo(np.int32).max else np.int64
+    #^ index_dtype()
+
+    def model(self, c, G, h, dims, A, b):
+        """Returns a cone program, kept on the object only if self.keep_model
+
+        The matrices are shared with the model cache and ECOS, so the object
+        holds no copies of them unless asked (keep_solver_object in pid()).
+
+        Args:
+            c, G, h, dims, A, b: the cone program (as for ecos.solve())
+
+        Returns:
+            tuple - (c, G, h, dims, A, b)
+        """
+        if self.keep_model:
+            self.c, self.G, self.h, self.dims, self.A, self.b = c, G, h, dims, A, b
+        #^ if
+        return c, G, h, dims, A, b
+    #^ model()
+
     def condentropy__orig(self,pdf,output):
 
         """Computes H(T|X,Y,Z) w.r.t. the original distribution P of (T,X,Y,Z)
@@ -145,6 +500,7 @@ class Solve_w_ECOS():
              pdf: dictionary - the original distribution of (T,X,Y,Z)
                     Keys: (t,x,y,z)
                     values: P(t,x,y,z)
+                    (or numpy.array of shape |T|x|X|x|Y|x|Z|)
 
              output: int - print different outputs based on (int) to console
 
@@ -153,6 +509,12 @@ class Solve_w_ECOS():
         """
         
         itic = time.process_time()
+        if type(pdf) is np.ndarray:
+            mysum = -plogp_ratio_sum( pdf, pdf.sum(axis=0)[None,:,:,:] )
+            itoc = time.process_time()
+            if output == 2: print("MAXENT3D_PID.condentropy__orig(): Time to compute H(T|XYZ) of the input pdf:", itoc - itic, "secs")
+            return mysum
+        #^ if tensor
         mysum = 0.
         marg_xyz = defaultdict(lambda: 0.)
         for txyz, i in pdf.items():
@@ -188,6 +550,7 @@ class Solve_w_ECOS():
              pdf: dictionary - the input distribution of (T,X,Y,Z)
                     Keys: (t,x,y,z)
                     values: P(t,x,y,z)
+                    (or numpy.array of shape |T|x|X|x|Y|x|Z|)
 
              output: int - print different outputs based on (int) to console
 
@@ -197,8 +560,17 @@ class Solve_w_ECOS():
             mysum: float - H(V)
         """
 
+        if type(pdf) is np.ndarray and V in (1,2,3,4):
+            itic = time.process_time()
+            axes = tuple( i for i in range(4) if i != V-1 )
+            mysum = -plogp_ratio_sum( pdf.sum(axis=axes), 1. )
+            itoc = time.process_time()
+            if output == 2: print("MAXENT3D_PID.entropy_V(): Time to compute H of variable",V,":", itoc - itic, "secs")
+            return mysum
+        #^ if tensor
+
         marg_V = defaultdict(lambda: 0.)
-        num_V  = defaultdict(lambda: 0.) 
+        num_V  = defaultdict(lambda: 0.)
         mysum = 0.
         if V == 1:
             # H(S)
@@ -299,7 +671,18 @@ class Opt_I(Solve_w_ECOS):
           Checks the KKT conditions of the exponential Cone Program min_{Delta_p}H(T|X,Y,Z)
        condentropy(sol_rpq,output)
           evalutes the value of H(T|X,Y,Z) at the optimal distribution
+
+    Attributes:
+       syn_formulation: string - 'standard' (variables (r,p,q) and q-p
+                        coupling equations), 'reduced' (variables (r,q),
+                        the coupling is in the cones, cf.
+                        TRIVARIATE_SYN.create_model_reduced()), or
+                        'auxiliary' (variables (r,q) and one marginal
+                        variable per (x,y,z), O(n) nonzeros, cf.
+                        TRIVARIATE_SYN.create_model_auxiliary())
     """
+    syn_formulation = 'standard'
+
     def create_model(self, output):
         """Creates the exponential Cone Program min_{q in Delta_d}H(T|X,Y,Z) of the form 
 
@@ -338,7 +721,23 @@ class Opt_I(Solve_w_ECOS):
         
         """
         
-        return TRIVARIATE_SYN.create_model(self, output)
+        assert self.syn_formulation in ('standard', 'reduced', 'auxiliary'), "MAXENT3D_PID.Opt_I.create_model(): syn_formulation must be 'standard', 'reduced', or 'auxiliary'"
+        key = ('SYN', self.syn_formulation, self.support_key)
+        template = model_cache.get(key) if self.context.use_cache else None
+        if template is None:
+            if self.syn_formulation == 'reduced':     model = TRIVARIATE_SYN.create_model_reduced(self, output)
+            elif self.syn_formulation == 'auxiliary': model = TRIVARIATE_SYN.create_model_auxiliary(self, output)
+            else:                                     model = TRIVARIATE_SYN.create_model(self, output)
+            if self.context.use_cache: model_cache.put(key, model[:5])
+            return model
+        #^ if
+
+        # Known support: only the right-hand side depends on the pdf
+        c, G, h, dims, A = template
+        # (the coupling equations come first, then the marginal equations)
+        b = self.marginal_rhs(A.shape[0] - len(self.b_tx) - len(self.b_ty) - len(self.b_tz))
+        if output > 0: print("TRIVARIATE_SYN.create_model(): Reused the model template [min - H(S|X,Y,Z)]")
+        return self.model(c, G, h, dict(dims), A, b)
     
     def solve(self, c, G, h, dims, A, b, output):
         """Solves the exponential Cone Program min_{Delta_p}H(T|X,Y,Z)
@@ -469,12 +868,9 @@ class Opt_II(Solve_w_ECOS):
         Returns: 
             (if [1,2] v,w=x,y|if [1,3] v,w=x,z|if [2,3] v,w=y,z|)
 
-            dictionary
+            Support_Index - the triplets (t,v,w)
 
-              keys: (t,v,w)
-              values: their indices 
-
-            list of (t,v,w)
+            numpy.array - the position of the triplet of each quadruple of the support
         """
         return TRIVARIATE_UNQ.initialization(self, which_sources)
 
@@ -509,57 +905,15 @@ class Opt_II(Solve_w_ECOS):
              output: int - print different outputs based on (int) to console
              
         Returns: 
-            dictionary - optimal marginal distribution of T
-              keys: t
-              values: Q(t)
-
-            dictionary - optimal marginal distribution of X
-              keys: x
-              values: Q(x)
-
-            dictionary - optimal marginal distribution of Y
-              keys: y
-              values: Q(y)
-
-            dictionary - optimal marginal distribution of Z
-              keys: z
-              values: Q(z)
+            numpy.array - optimal marginal distributions of T, X, Y, and Z
+              (four arrays indexed by the codes, e.g., Q[t])
 
-            dictionary - optimal marginal distribution of (T,X)
-              keys: t,x
-              values: Q(t,x)
+            numpy.array - optimal marginal distributions of (T,X), (T,Y), (T,Z), (X,Y), (X,Z), and (Y,Z)
+              (six dense arrays indexed by the codes, e.g., Q[t,x])
 
-            dictionary - optimal marginal distribution of (T,Y)
-              keys: t,y
-              values: Q(t,y)
-
-            dictionary - optimal marginal distribution of (T,Z)
-              keys: t,z
-              values: Q(t,z)
-
-            dictionary - optimal marginal distribution of (X,Y)
-              keys: x,y
-              values: Q(x,y)
-
-            dictionary - optimal marginal distribution of (X,Z)
-              keys: x,z
-              values: Q(x,z)
-
-            dictionary - optimal marginal distribution of (Y,Z)
-              keys: y,z
-              values: Q(y,z)
-
-            dictionary - optimal marginal distribution of (T,X,Y)
-              keys: t,x,y
-              values: Q(t,x,y)
-
-            dictionary - optimal marginal distribution of (T,X,Z)
-              keys: t,x,z
-              values: Q(t,x,z)
-
-            dictionary - optimal marginal distribution of (T,Y,Z)
-              keys: t,y,z
-              values: Q(t,y,z)
+            numpy.array - optimal marginal distributions of (T,X,Y), (T,X,Z), and (T,Y,Z)
+              (three arrays aligned with the triplets of initialization([1,2]),
+               initialization([1,3]), and initialization([2,3]), respectively)
         """
 
         return TRIVARIATE_UNQ.marginals(self, which_sources,sol_rpq, output)
@@ -607,9 +961,25 @@ class Opt_II(Solve_w_ECOS):
         
         """
 
-        return TRIVARIATE_UNQ.create_model(self, which_sources, output)
+        if which_sources == [1,2]:   b_uv = self.P_xy
+        elif which_sources == [1,3]: b_uv = self.P_xz
+        else:                        b_uv = self.P_yz
+        key = ('UNQ', tuple(which_sources), self.support_key, b_uv.shape, np.packbits(b_uv > 0).tobytes())
+        template = model_cache.get(key) if self.context.use_cache else None
+        if template is None:
+            model = TRIVARIATE_UNQ.create_model(self, which_sources, output)
+            if self.context.use_cache: model_cache.put(key, model[:5])
+            return model
+        #^ if
+
+        # Known support: only the right-hand side depends on the pdf
+        trips,trip_of_quad = self.initialization(which_sources)
+        c, G, h, dims, A = template
+        b = self.marginal_rhs(2*len(trips))
+        if output > 0: print("TRIVARIATE_UNQ.create_model(): Reused the model template [min -H(S|"+"XYZ"[which_sources[0]-1]+","+"XYZ"[which_sources[1]-1]+")]")
+        return self.model(c, G, h, dict(dims), A, b)
     
-    def solve(self, c, G, h, dims, A, b, output):
+    def solve(self, c, G, h, dims, A, b, output, which_sources=None):
         """Solves the exponential Cone Program min_{Delta_p}H(T|U,V) where U,V in {X,Y,Z}
         
         Args:
@@ -629,6 +999,9 @@ class Opt_II(Solve_w_ECOS):
             b: numpy.array - L.H.S. of equalities 
 
             output: int - print different outputs based on (int) to console
+
+            which_sources: list(int) - [1,2], [1,3], or [2,3] (needed by the
+                           NumPy engine only, default = None)
  
        Returns: 
 
@@ -644,7 +1017,7 @@ class Opt_II(Solve_w_ECOS):
 
         """
 
-        return TRIVARIATE_UNQ.solve(self, c, G, h, dims, A, b, output)
+        return TRIVARIATE_UNQ.solve(self, c, G, h, dims, A, b, output, which_sources)
     
     def dual_value(self, sol_lambda, b):
         """Evaluates the dual value of H(T|U,V) where U,V in {X,Y,Z}
@@ -707,29 +1080,12 @@ class Opt_II(Solve_w_ECOS):
 
              output: int - print different outputs based on (int) to console
 
-             marg_XY: dictionary - optimal marginal distribution of (X,Y)
-                      keys: x,y
-                      values: Q(x,y)
-
-             marg_XZ: dictionary - optimal marginal distribution of (X,Z)
-                      keys: x,z
-                      values: Q(x,z)
-
-             marg_YZ: dictionary - optimal marginal distribution of (Y,Z)
-                      keys: y,z
-                      values: Q(y,z)
-
-             marg_TXY: dictionary - optimal marginal distribution of (T,X,Y)
-                       keys: t,x,y
-                       values: Q(t,x,y)
+             marg_XY, marg_XZ, marg_YZ: numpy.array - optimal marginal distributions
+                      of (X,Y), (X,Z), and (Y,Z) (dense, e.g., Q[x,y])
 
-             marg_TXZ: dictionary - optimal marginal distribution of (T,X,Z)
-                       keys: t,x,z
-                       values: Q(t,x,z)
-
-             marg_TYZ: dictionary - optimal marginal distribution of (T,Y,Z)
-                       keys: t,y,z
-                       values: Q(t,y,z)
+             marg_TXY, marg_TXZ, marg_TYZ: numpy.array - optimal marginal distributions
+                       of (T,X,Y), (T,X,Z), and (T,Y,Z) (aligned with the triplets,
+                       cf. marginals())
 
         Returns: 
             (if [1,2]: U,V=X,Y | if [1,3]: U,V=X,Z | if [2,3]: U,V=Y,Z)
@@ -793,6 +1149,8 @@ class QP():
         # ECOS parameters
         self.ecos_kwargs   = dict()
         self.verbose       = False
+        # Backend of TRIVARIATE_BACKENDS which solves the program
+        self.cone_solver   = 'ECOS'
 
         # Probability density funciton data
         self.CI_e, self.CI_c     = CI
@@ -950,14 +1308,18 @@ def marginal_tx(p):
             p: dictionary - original distribution of (T,X,Y,Z)
                  keys: (t,x,y,z)
                  values: P(t,x,y,z)
+               or numpy.array of shape |T|x|X|x|Y|x|Z|
 
        Returns: 
             dictionary - original marginal distribution of T and X
               keys: (t,x)
               values: P(t,x)
+            (numpy.array of shape |T|x|X| if p is a numpy.array)
     
     """
     
+    if type(p) is np.ndarray: return p.sum(axis=(2,3))
+
     marg = dict()
     for txyz,r in p.items():
         t,x,y,z = txyz
@@ -977,14 +1339,18 @@ def marginal_ty(p):
             p: dictionary - original distribution of (T,X,Y,Z)
                  keys: (t,x,y,z)
                  values: P(t,x,y,z)
+               or numpy.array of shape |T|x|X|x|Y|x|Z|
 
        Returns: 
             dictionary - original marginal distribution of T and Y
               keys: (t,y)
               values: P(t,y)
+            (numpy.array of shape |T|x|Y| if p is a numpy.array)
 
     """
     
+    if type(p) is np.ndarray: return p.sum(axis=(1,3))
+
     marg = dict()
     for txyz,r in p.items():
         t,x,y,z = txyz
@@ -1004,14 +1370,18 @@ def marginal_tz(p):
             p: dictionary - original distribution of (T,X,Y,Z)
                  keys: (t,x,y,z)
                  values: P(t,x,y,z)
+               or numpy.array of shape |T|x|X|x|Y|x|Z|
 
        Returns: 
             dictionary - original marginal distribution of T and Z
               keys: (t,z)
               values: P(t,z)
+            (numpy.array of shape |T|x|Z| if p is a numpy.array)
 
     """
     
+    if type(p) is np.ndarray: return p.sum(axis=(1,2))
+
     marg = dict()
     for txyz,r in p.items():
         t,x,y,z = txyz
@@ -1031,14 +1401,18 @@ def marginal_xy(p):
             p: dictionary - original distribution of (T,X,Y,Z) 
                  keys: (t,x,y,z)
                  values: P(t,x,y,z)
+               or numpy.array of shape |T|x|X|x|Y|x|Z|
 
        Returns: 
             dictionary - original marginal distribution of X and Y
               keys: (x,y)
               values: P(x,y)
+            (numpy.array of shape |X|x|Y| if p is a numpy.array)
 
     """
     
+    if type(p) is np.ndarray: return p.sum(axis=(0,3))
+
     marg = dict()
     for txyz,r in p.items():
         t,x,y,z = txyz
@@ -1058,14 +1432,18 @@ def marginal_xz(p):
             p: dictionary - original distribution of (T,X,Y,Z) 
                  keys: (t,x,y,z)
                  values: P(t,x,y,z)
+               or numpy.array of shape |T|x|X|x|Y|x|Z|
 
        Returns: 
             dictionary - original marginal distribution of X and Z
               keys: (x,z)
               values: P(x,z)
+            (numpy.array of shape |X|x|Z| if p is a numpy.array)
 
     """
     
+    if type(p) is np.ndarray: return p.sum(axis=(0,2))
+
     marg = dict()
     for txyz,r in p.items():
         t,x,y,z = txyz
@@ -1085,14 +1463,18 @@ def marginal_yz(p):
             p: dictionary - original distribution of (T,X,Y,Z) 
                  keys: (t,x,y,z)
                  values: P(t,x,y,z)
+               or numpy.array of shape |T|x|X|x|Y|x|Z|
 
        Returns: 
             dictionary - original marginal distribution of Y and Z
               keys: (y,z)
               values: P(y,z)
+            (numpy.array of shape |Y|x|Z| if p is a numpy.array)
 
     """
     
+    if type(p) is np.ndarray: return p.sum(axis=(0,1))
+
     marg = dict()
     for txyz,r in p.items():
         t,x,y,z = txyz
@@ -1101,6 +1483,304 @@ def marginal_yz(p):
     return marg
 #^ marginal_yz()
 
+def marginal_of_array(marg):
+    """Returns the dictionary view of a dense marginal
+
+       Args:
+            marg: numpy.array - marginal distribution, e.g., P(T,X) of shape |T|x|X|
+
+       Returns:
+            dictionary - the positive entries of marg
+              keys: index tuples, e.g., (t,x)
+              values: marg[t,x]
+    """
+    idx = np.nonzero(marg > 0)
+    return dict( zip( zip( *[ i.tolist() for i in idx ] ), marg[idx].tolist() ) )
+#^ marginal_of_array()
+
+def coded_pdf(pdf):
+    """Codes the support of a pdf by integer arrays
+
+       Args:
+            pdf: dictionary - distribution of (T,X,Y,Z)
+                   keys: (t,x,y,z)
+                   values: P(t,x,y,z)
+                 (or numpy.array of shape |T|x|X|x|Y|x|Z|)
+
+       Returns:
+            codes: list - [t, x, y, z] integer arrays, the codes of the
+                   support entries
+
+            values: numpy.array - P(t,x,y,z) of the support entries
+
+            alphabets: list - [T, X, Y, Z] where the code i of X stands
+                       for the symbol X[i]
+    """
+    if type(pdf) is np.ndarray:
+        codes  = list( np.nonzero(pdf > 0) )
+        return codes, pdf[tuple(codes)], [ list(range(n)) for n in pdf.shape ]
+    #^ if tensor
+
+    keys   = list( pdf.keys() )
+    values = np.fromiter( pdf.values(), dtype=np.double, count=len(keys) )
+    codes     = []
+    alphabets = []
+    for i in range(4):
+        column = [ k[i] for k in keys ]
+        V      = alphabet_of(column)
+        code   = { v: j for j,v in enumerate(V) }
+        codes.append( np.fromiter( (code[v] for v in column), dtype=np.int64, count=len(keys) ) )
+        alphabets.append( V )
+    #^ for
+    return codes, values, alphabets
+#^ coded_pdf()
+
+def marginals_of_codes(codes, values, shape):
+    """Computes all first and second order marginals of a coded pdf
+
+       The six pairwise marginals are counted with np.bincount, the first
+       order marginals are sums of them.
+
+       Args:
+            codes: list - [t, x, y, z] integer arrays (cf. coded_pdf())
+
+            values: numpy.array - P(t,x,y,z) of the entries
+
+            shape: tuple - (|T|,|X|,|Y|,|Z|)
+
+       Returns:
+            numpy.array - P(T), P(X), P(Y), P(Z), P(T,X), P(T,Y), P(T,Z),
+                          P(X,Y), P(X,Z), P(Y,Z)  (dense, indexed by codes)
+    """
+    def pair(a, b):
+        idx = codes[a]*shape[b] + codes[b]
+        return np.bincount(idx, weights=values, minlength=shape[a]*shape[b]).reshape(shape[a], shape[b])
+    #^ pair()
+
+    b_tx, b_ty, b_tz = pair(0,1), pair(0,2), pair(0,3)
+    b_xy, b_xz, b_yz = pair(1,2), pair(1,3), pair(2,3)
+    return b_tx.sum(axis=1), b_tx.sum(axis=0), b_ty.sum(axis=0), b_tz.sum(axis=0), b_tx, b_ty, b_tz, b_xy, b_xz, b_yz
+#^ marginals_of_codes()
+
+def exchangeable_sources(codes, values, shape):
+    """Finds the pairs of sources whose swap leaves a coded pdf invariant
+
+       The code i of one source is identified with the code i of the other,
+       which is a relabelling of the symbols; the pdf is invariant if the
+       swapped support is the same and the values agree up to 1.e-12
+       (relative). The test sorts the linear indices of the support.
+
+       Args:
+            codes, values: as returned by coded_pdf()
+
+            shape: tuple - (|T|,|X|,|Y|,|Z|)
+
+       Returns:
+            list - the pairs (i,j) of sources (1 = X, 2 = Y, 3 = Z) which are
+                   exchangeable
+    """
+    key   = np.ravel_multi_index(tuple(codes), shape)
+    order = np.argsort(key, kind='stable')
+    swaps = []
+    for i,j in ( (1,2), (1,3), (2,3) ):
+        if shape[i] != shape[j]: continue
+        swapped    = list(codes)
+        swapped[i], swapped[j] = codes[j], codes[i]
+        key_sw     = np.ravel_multi_index(tuple(swapped), shape)
+        order_sw   = np.argsort(key_sw, kind='stable')
+        if np.array_equal(key[order], key_sw[order_sw]) and np.allclose(values[order], values[order_sw], rtol=1.e-12, atol=0.):
+            swaps.append( (i,j) )
+        #^ if invariant
+    #^ for pairs
+    return swaps
+#^ exchangeable_sources()
+
+def twin_programs(swaps):
+    """Finds the programs min -H(T|U,V) which are relabellings of an earlier one
+
+       Swapping the sources i and j maps the program of the sources {u,v}
+       to the program of their images; e.g., if X and Y are exchangeable,
+       min -H(T|Y,Z) is min -H(T|X,Z) with X and Y relabelled.
+
+       Args:
+            swaps: list - as returned by exchangeable_sources()
+
+       Returns:
+            dictionary - keys: (u,v) of a program which need not be solved
+                         values: (u,v) of the program with the same optimum
+    """
+    twins  = dict()
+    solved = []
+    for key in ( (1,2), (1,3), (2,3) ):
+        for other in solved:
+            images = [ tuple(sorted( j if s == i else i if s == j else s for s in other )) for i,j in swaps ]
+            if key in images:
+                twins[key] = other
+                break
+            #^ if twin
+        else:
+            solved.append(key)
+        #^ for solved programs
+    #^ for programs
+    return twins
+#^ twin_programs()
+
+def support_of_marginals(marg_tx, marg_ty, marg_tz):
+    """Enumerates { (t,x,y,z) : P(t,x)>0, P(t,y)>0, P(t,z)>0 }
+
+       The supports of the three marginals are joined on t: for every t the
+       block X_t x Y_t x Z_t is generated by integer arithmetic on the
+       running index, so the work is proportional to the size of the
+       support (not to |T||X||Y||Z|).
+
+       Args:
+            marg_tx: numpy.array - P(T,X) of shape |T|x|X|
+
+            marg_ty: numpy.array - P(T,Y) of shape |T|x|Y|
+
+            marg_tz: numpy.array - P(T,Z) of shape |T|x|Z|
+
+       Returns:
+            (t, x, y, z): tuple of numpy.array - the codes of the support
+                          in lexicographic order
+    """
+    n_T = marg_tx.shape[0]
+    # Supports of the marginals, sorted by t
+    t_x, x_of = np.nonzero(marg_tx > 0)
+    t_y, y_of = np.nonzero(marg_ty > 0)
+    t_z, z_of = np.nonzero(marg_tz > 0)
+    cnt_x = np.bincount(t_x, minlength=n_T)
+    cnt_y = np.bincount(t_y, minlength=n_T)
+    cnt_z = np.bincount(t_z, minlength=n_T)
+    start_x = np.cumsum(cnt_x) - cnt_x
+    start_y = np.cumsum(cnt_y) - cnt_y
+    start_z = np.cumsum(cnt_z) - cnt_z
+
+    # Size of the block of t and the running index inside the block
+    cnt = cnt_x*cnt_y*cnt_z
+    t   = np.repeat( np.arange(n_T), cnt )
+    j   = np.arange(len(t)) - np.repeat( np.cumsum(cnt) - cnt, cnt )
+
+    cnt_yz = (cnt_y*cnt_z)[t]
+    x = x_of[ start_x[t] + j // cnt_yz ]
+    y = y_of[ start_y[t] + (j % cnt_yz) // cnt_z[t] ]
+    z = z_of[ start_z[t] + j % cnt_z[t] ]
+    return t, x, y, z
+#^ support_of_marginals()
+
+def condentropy_of_codes(codes, values, shape):
+    """Computes H(T|X,Y,Z) of a coded pdf
+
+       Args:
+            codes: list - [t, x, y, z] integer arrays (cf. coded_pdf())
+
+            values: numpy.array - P(t,x,y,z) of the entries
+
+            shape: tuple - (|T|,|X|,|Y|,|Z|)
+
+       Returns:
+            float - H(T|X,Y,Z)
+    """
+    xyz      = np.ravel_multi_index( codes[1:], shape[1:] )
+    xyz, inv = np.unique(xyz, return_inverse=True)
+    marg_xyz = np.bincount( inv.ravel(), weights=values )
+    return -plogp_ratio_sum( values, marg_xyz[inv.ravel()] )
+#^ condentropy_of_codes()
+
+def alphabet_of(symbols):
+    """Orders the symbols of a variable (sorted if they are comparable)
+
+       Args:
+            symbols: iterable - hashable symbols (repetitions allowed)
+
+       Returns:
+            list - the distinct symbols
+    """
+    symbols = list(dict.fromkeys(symbols))
+    try:
+        return sorted(symbols)
+    except TypeError:
+        return symbols
+#^ alphabet_of()
+
+def intern_marginals(marg_tx, marg_ty, marg_tz, marg_xy, marg_xz, marg_yz):
+    """Interns the symbols of the marginals into codes 0..n-1
+
+       Args:
+            marg_tx, marg_ty, marg_tz, marg_xy, marg_xz, marg_yz: dictionary - the marginals
+                 keys: symbol pairs, e.g., (t,x)
+                 values: P(t,x)
+
+       Returns:
+            alphabets: list - [T, X, Y, Z] lists of the symbols
+
+            marg_tx, marg_ty, marg_tz, marg_xy, marg_xz, marg_yz: numpy.array
+                 the dense marginals indexed by the codes, e.g., of shape |T|x|X|
+    """
+    T = alphabet_of( [ t for t,x in marg_tx.keys() ] + [ t for t,y in marg_ty.keys() ] + [ t for t,z in marg_tz.keys() ] )
+    X = alphabet_of( [ x for t,x in marg_tx.keys() ] )
+    Y = alphabet_of( [ y for t,y in marg_ty.keys() ] )
+    Z = alphabet_of( [ z for t,z in marg_tz.keys() ] )
+    code = [ { v: i for i,v in enumerate(V) } for V in (T,X,Y,Z) ]
+
+    def dense(marg, a, b):
+        arr = np.zeros( (len(code[a]), len(code[b])) )
+        for (u,v),r in marg.items():
+            arr[ code[a][u], code[b][v] ] += r
+        return arr
+    #^ dense()
+
+    return ( [T,X,Y,Z], dense(marg_tx,0,1), dense(marg_ty,0,2), dense(marg_tz,0,3),
+             dense(marg_xy,1,2), dense(marg_xz,1,3), dense(marg_yz,2,3) )
+#^ intern_marginals()
+
+def marginal_ranks(marg):
+    """Numbers the positive entries of a dense marginal in row-major order
+
+       Args:
+            marg: numpy.array - marginal distribution, e.g., P(T,X)
+
+       Returns:
+            numpy.array - rank[t,x] is the position of (t,x) among the
+                          positive entries (-1 if P(t,x) = 0)
+    """
+    pos = marg > 0
+    return np.where( pos, np.cumsum(pos, axis=None).reshape(marg.shape) - 1, -1 )
+#^ marginal_ranks()
+
+def plogp_ratio_sum(p, q):
+    """Computes sum_{p > 0} p*log( p/q ) for numpy arrays
+
+       Args:
+            p: numpy.array - nonnegative weights
+
+            q: numpy.array - denominators (broadcast against p)
+
+       Returns:
+            float - sum of p*log(p/q) over the positive entries of p
+    """
+    q   = np.broadcast_to(q, p.shape)
+    pos = p > 0
+    return float( np.sum( p[pos]*np.log2( p[pos]/q[pos] ) ) )
+#^ plogp_ratio_sum()
+
+def I_of_array(axes, p):
+    """Computes MI(T;V) of a tensor pdf where V are the sources on axes
+
+       Args:
+            axes: tuple - source axes of p (1: X, 2: Y, 3: Z)
+
+            p: numpy.array - distribution of (T,X,Y,Z) of shape |T|x|X|x|Y|x|Z|
+
+       Returns:
+            float - MI(T;V)
+    """
+    p_tv = p.sum(axis=tuple( i for i in (1,2,3) if i not in axes ), keepdims=True)
+    p_t  = p_tv.sum(axis=tuple(axes), keepdims=True)
+    p_v  = p_tv.sum(axis=0, keepdims=True)
+    return plogp_ratio_sum(p_tv, p_t*p_v)
+#^ I_of_array()
+
 
 # Compute Conditional Entopy of the form H(T|V)
 def condent_V(V, p, output = 0):
@@ -1119,6 +1799,7 @@ def condent_V(V, p, output = 0):
              pdf: dictionary - the input distribution of (T,X,Y,Z)
                     Keys: (t,x,y,z)
                     values: P(t,x,y,z)
+                    (or numpy.array of shape |T|x|X|x|Y|x|Z|)
 
              output: int - print different outputs based on (int) to console (default = 0)
 
@@ -1129,6 +1810,15 @@ def condent_V(V, p, output = 0):
     """
     
 
+    if type(p) is np.ndarray and V in (1,2,3):
+        itic = time.process_time()
+        p_tv = p.sum(axis=tuple( i for i in (1,2,3) if i != V ), keepdims=True)
+        mysum = -plogp_ratio_sum( p_tv, p_tv.sum(axis=0, keepdims=True) )
+        itoc = time.process_time()
+        if output == 2: print("MAXENT3D_PID.condent_V(): Time to compute H(T|V) for V =",V,":", itoc - itic, "secs")
+        return mysum
+    #^ if tensor
+
     # Initialization
     marg_V = defaultdict(lambda: 0.)
     mysum = 0.
@@ -1216,6 +1906,7 @@ def I_V(V,p):
              p: dictionary - the input distribution of (T,X,Y,Z)
                     Keys: (t,x,y,z)
                     values: P(t,x,y,z)
+                    (or numpy.array of shape |T|x|X|x|Y|x|Z|)
 
         Returns: 
             (if 1: V=X | if 2: V=Y | if 3: V=Z)
@@ -1223,6 +1914,8 @@ def I_V(V,p):
             mysum: float - MI(T;V)
     """
     
+    if type(p) is np.ndarray and V in (1,2,3): return I_of_array( (V,), p )
+
     # Initialization
     marg_V = defaultdict(lambda: 0.)
     marg_T = defaultdict(lambda: 0.)
@@ -1306,6 +1999,7 @@ def I_VW(V,p):
              pdf: dictionary - the input distribution of (T,X,Y,Z)
                     Keys: (t,x,y,z)
                     values: P(t,x,y,z)
+                    (or numpy.array of shape |T|x|X|x|Y|x|Z|)
 
              output: int - print different outputs based on (int) to console
                      (default = 0)
@@ -1316,6 +2010,8 @@ def I_VW(V,p):
             mysum: float - MI(T;V,W)
     """
     
+    if type(p) is np.ndarray and V in (12,13,23): return I_of_array( divmod(V,10), p )
+
     # Initialization
     marg_V = defaultdict(lambda: 0.)
     marg_VV = defaultdict(lambda: 0.)
@@ -1391,9 +2087,12 @@ def I_XYZ(p):
              pdf: dictionary - the original distribution of (T,X,Y,Z)
                     Keys: (t,x,y,z)
                     values: P(t,x,y,z)
+                    (or numpy.array of shape |T|x|X|x|Y|x|Z|)
         Returns: 
             mysum: float - MI(T;X,Y,Z)
     """
+    if type(p) is np.ndarray: return I_of_array( (1,2,3), p )
+
     # Initialization
     marg_V = defaultdict(lambda: 0.)
     marg_T = defaultdict(lambda: 0.)
@@ -1418,7 +2117,300 @@ def I_XYZ(p):
 #^ I_XYZ()
 
 
-def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
+def reset_peak_rss():
+    """Resets the peak resident set size of this process (Linux only)
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+       The high-water mark VmHWM is process-wide: a caller or profiler
+       relying on it loses the earlier peak. pid() only resets it with
+       measure_memory='on'.
+
+        Returns:
+            bool - True if it was reset; if not, peak_rss() is the peak
+                   since the start of the process
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except (IOError, OSError):
+        return False
+    #^ try
+#^ reset_peak_rss()
+
+def peak_rss():
+    """Peak resident set size of this process in MB
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+       Read from VmHWM in /proc/self/status; where there is no /proc, from
+       the ru_maxrss of getrusage() (kB on Linux, bytes on macOS).
+
+        Returns:
+            float - peak RSS in MB (None if neither is available)
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'): return int(line.split()[1])/1024.
+            #^ for lines
+        #^ with
+    except (IOError, OSError):
+        pass
+    #^ try
+    if resource is None: return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss/1024.**2 if sys.platform == 'darwin' else maxrss/1024.
+#^ peak_rss()
+
+
+# The PID_Context of the pid() call in a worker of the parallel pool
+worker_context = None
+
+def init_worker(context):
+    """Initializes a worker of the parallel pool of pid()
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+        Args:
+             context: PID_Context - the shared data of the pid() call
+    """
+    global worker_context
+    worker_context = context
+#^ init_worker()
+
+def solve_in_worker(which_sources, output, solver_args, syn_formulation='standard', decompose='off', presolve='off', cone_solver='ECOS', warm_start=None, measure_memory='off', model=None):
+    """Creates and solves one cone program in a worker of the parallel pool of pid()
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+        Args:
+             which_sources: list(int) - [1,2], [1,3], or [2,3] for min -H(T|U,V)
+                            (None for min -H(T|X,Y,Z))
+
+             output: int - print different outputs based on (int) to console
+
+             solver_args: dictionary - ECOS parameters
+
+             syn_formulation: string - cf. Opt_I.syn_formulation
+
+             decompose: string - as in pid()
+
+             presolve: string - as in pid()
+
+             cone_solver: string - as in pid()
+
+             warm_start: dictionary - cf. Solve_w_ECOS.warm_start
+
+             measure_memory: string - as in pid()
+
+             model: tuple - (c, G, h, dims, A, b) created by the parent
+                    (from model_cache, cf. pid(..., model_cache='on'))
+                    (default = None: created in the worker)
+
+        Returns:
+            b: numpy.array - L.H.S. of equalities
+
+            tuple - as returned by solve()
+
+            float - peak RSS of the worker in MB (cf. peak_rss())
+    """
+    if measure_memory == 'on': reset_peak_rss()
+    if which_sources is None:
+        subsolver = Opt_I(context=worker_context)
+        subsolver.syn_formulation = syn_formulation
+        if model is None: model = subsolver.create_model(output)
+    else:
+        subsolver = Opt_II(context=worker_context)
+        if model is None: model = subsolver.create_model(which_sources, output)
+    #^ if
+    c, G, h, dims, A, b = model
+    subsolver.ecos_kwargs = solver_args
+    subsolver.cone_solver = cone_solver
+    subsolver.warm_start  = warm_start
+    subsolver.decompose   = decompose == 'on'
+    subsolver.presolve    = presolve == 'on'
+    if output > 2: subsolver.verbose = True
+    if which_sources is None: result = subsolver.solve(c, G, h, dims, A, b, output)
+    else:                     result = subsolver.solve(c, G, h, dims, A, b, output, which_sources)
+    return b, result, peak_rss()
+#^ solve_in_worker()
+
+def needs_refinement(subsolver, which_sources, b, solution, accuracy, output):
+    """Checks whether a solution of the first phase of pid(accuracy=...) is accurate enough
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+        Args:
+             subsolver: Opt_I or Opt_II - the solver object of the program
+
+             which_sources: list(int) - [1,2], [1,3], or [2,3] for min -H(T|U,V)
+                            (None for min -H(T|X,Y,Z))
+
+             b: numpy.array - L.H.S. of equalities
+
+             solution: tuple - as returned by solve()
+
+             accuracy: float - the target in bits (cf. pid())
+
+             output: int - print different outputs based on (int) to console
+
+        Returns:
+            bool - True if the solver failed, or the primal or dual
+                   infeasibility exceeds accuracy, or the duality gap (the
+                   third entry of Num_err, in nats) exceeds accuracy*ln(2)
+    """
+    retval, sol_rpq, sol_slack, sol_lambda, sol_mu, sol_info = solution
+    if retval != "success": return True
+    if which_sources is None:
+        primal_infeas, dual_infeas = subsolver.check_feasibility(sol_rpq, sol_lambda, output)
+        condent = subsolver.condentropy(sol_rpq, output)
+    else:
+        primal_infeas, dual_infeas = subsolver.check_feasibility(which_sources, sol_rpq, sol_slack, sol_lambda, sol_mu, output)
+        marg_T, marg_X, marg_Y, marg_Z, marg_TX, marg_TY, marg_TZ, marg_XY, marg_XZ, marg_YZ, marg_TXY, marg_TXZ, marg_TYZ = subsolver.marginals(which_sources, sol_rpq, output)
+        condent = subsolver.condentropy_2vars(which_sources, sol_rpq, output, marg_XY, marg_XZ, marg_YZ, marg_TXY, marg_TXZ, marg_TYZ)
+    #^ if
+    gap = -condent*ln(2) - subsolver.dual_value(sol_lambda, b)
+    return primal_infeas > accuracy or dual_infeas > accuracy or gap > accuracy*ln(2)
+#^ needs_refinement()
+
+def normalized_pdf(pdf_dirty):
+    """Validates the input of pid() and removes its zero entries
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+       Float values must be probabilities summing up to 1; integer values
+       are counts, which are divided by their total. The values are checked
+       and normalized in one vectorized step. The keys of a dictionary and
+       the probabilities are checked by asserts (not with python -O), the
+       counts always (ValueError).
+
+        Args:
+             pdf_dirty: dictionary or numpy.array - as in pid()
+
+        Returns:
+            pdf: dictionary or numpy.array - the distribution with all values
+                 <= 1.e-300 removed (dictionary) or set to 0 (numpy.array)
+    """
+    if type(pdf_dirty) is np.ndarray:
+        assert pdf_dirty.ndim == 4, "MAXENT3D_PID.pid(pdf): pdf must be a tensor of shape |T|x|X|x|Y|x|Z|"
+        values = pdf_dirty
+    else:
+        if __debug__:
+            assert all( (type(k) is tuple or type(k) is list) and len(k)==4 for k in pdf_dirty ), "MAXENT3D_PID.pid(pdf): pdf's keys must be tuples/lists of length 4"
+        #^ if
+        values = np.array(list(pdf_dirty.values()), dtype=None if pdf_dirty else np.float64)
+    #^ if
+    # The counts are checked also with python -O (they are divided by their total)
+    counts = np.issubdtype(values.dtype, np.integer)
+    if not counts and not np.issubdtype(values.dtype, np.floating):
+        raise ValueError("MAXENT3D_PID.pid(pdf): pdf's values must be floats or integer counts")
+    if counts:
+        if values.size > 0 and values.min() < 0:
+            raise ValueError("MAXENT3D_PID.pid(pdf): pdf's counts must not be negative")
+        total = values.sum()
+        if total <= 0:
+            raise ValueError("MAXENT3D_PID.pid(pdf): pdf's counts must not all be 0")
+        values = values/total
+    elif __debug__:
+        assert np.all(np.isfinite(values)),           "MAXENT3D_PID.pid(pdf): pdf's values must be finite"
+        assert values.size == 0 or values.min() > -.1, "MAXENT3D_PID.pid(pdf): pdf's values must not be negative"
+        assert abs(values.sum() - 1)< 1.e-10,         "MAXENT3D_PID.pid(pdf): pdf's values must sum up to 1 (tolerance of precision is 1.e-10)"
+    #^ if counts
+
+    if type(pdf_dirty) is np.ndarray:
+        return np.where( values > 1.e-300, values, 0. ).astype(np.float64)
+    else:
+        return { k:float(v)  for k,v in zip(pdf_dirty.keys(), values) if v > 1.e-300 }
+#^ normalized_pdf()
+
+# Calibrated with ECOS (max_iters=100) on dense random pdfs of up to 20x8x8x8:
+# a program with nnz = nnz(A) + nnz(G) is solved in time_coef*nnz**time_exp
+# secs; the peak RSS of pid() is memory_base_MB plus memory_bytes_per_nnz per
+# nonzero of all four programs (sequential), a worker of the parallel pool
+# needs memory_base_MB plus memory_bytes_per_nnz_worker per nonzero of its program
+cost_model = dict( time_coef=1.95e-7, time_exp=1.345, memory_base_MB=60.,
+                   memory_bytes_per_nnz=62.5, memory_bytes_per_nnz_worker=210. )
+
+def estimate_cost(pdf_dirty=None, marginals=None, syn_formulation='standard', parallel='off', symmetry='on', model=None):
+    """Predicts the size, time, and memory of pid() without creating the cone programs
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+       The sizes are exact (cf. TRIVARIATE_SYN.model_size() and
+       TRIVARIATE_UNQ.model_size()); they are computed from the supports of
+       the marginals, so the support of (T,X,Y,Z) is never enumerated. Time
+       and memory come from the calibrated cost_model.
+
+        Args:
+             pdf_dirty: dictionary or numpy.array - as in pid()
+
+             marginals: tuple - (P(T,X), P(T,Y), P(T,Z), P(X,Y), P(X,Z), P(Y,Z))
+                        as numpy.arrays, used if pdf_dirty is None
+
+             syn_formulation, parallel, symmetry: as in pid() (the twin
+                        programs of exchangeable sources need a pdf)
+
+             model: dictionary - cost model (default = None: cost_model)
+
+        Returns:
+            return_data: dictionary - 'Size_I', 'Size_12', 'Size_13', 'Size_23'
+                         (as returned by model_size()), 'nnz' (of all four
+                         programs), 'Time_estimate' (secs), and
+                         'Memory_estimate' (MB, the peak RSS of the call;
+                         with parallel='on' summed over the workers)
+    """
+    if model is None: model = cost_model
+    twins = dict()
+    if pdf_dirty is not None:
+        pdf = normalized_pdf(pdf_dirty)
+        codes, values, alphabets = coded_pdf(pdf)
+        shape = tuple( len(V) for V in alphabets )
+        b_t, b_x, b_y, b_z, bx_tx, by_ty, bz_tz, b_xy, b_xz, b_yz = marginals_of_codes(codes, values, shape)
+        if symmetry == 'on': twins = twin_programs(exchangeable_sources(codes, values, shape))
+    else:
+        assert marginals is not None and len(marginals) == 6, "MAXENT3D_PID.estimate_cost(): give a pdf or the six marginals"
+        bx_tx, by_ty, bz_tz, b_xy, b_xz, b_yz = ( np.asarray(M) for M in marginals )
+    #^ if pdf
+    supp = ( bx_tx > 0, by_ty > 0, bz_tz > 0 )
+
+    return_data = dict()
+    return_data["Size_I"]  = TRIVARIATE_SYN.model_size(*supp, syn_formulation=syn_formulation)
+    return_data["Size_12"] = TRIVARIATE_UNQ.model_size(*supp, b_xy > 0, [1,2])
+    return_data["Size_13"] = TRIVARIATE_UNQ.model_size(*supp, b_xz > 0, [1,3])
+    return_data["Size_23"] = TRIVARIATE_UNQ.model_size(*supp, b_yz > 0, [2,3])
+
+    # The programs which are solved
+    nnz = [ return_data["Size_"+name]["nnz_A"] + return_data["Size_"+name]["nnz_G"] for name in ("I", "12", "13", "23") ]
+    solved = [ nnz[0] ] + [ nnz[1+i] for i,key in enumerate(( (1,2), (1,3), (2,3) )) if key not in twins ]
+    times  = [ model['time_coef']*k**model['time_exp'] for k in solved ]
+    return_data["nnz"] = sum(nnz)
+    if parallel == 'on':
+        return_data["Time_estimate"]   = max(times)
+        return_data["Memory_estimate"] = model['memory_base_MB'] + sum( model['memory_base_MB'] + model['memory_bytes_per_nnz_worker']*k/2.**20 for k in solved )
+    else:
+        return_data["Time_estimate"]   = sum(times)
+        return_data["Memory_estimate"] = model['memory_base_MB'] + model['memory_bytes_per_nnz']*sum(solved)/2.**20
+    #^ if parallel
+    return return_data
+#^ estimate_cost()
+
+def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', alphabets=None, syn_formulation='standard', decompose='off', presolve='off', symmetry='on', warm_start=None, accuracy=None, model_cache='off', measure_memory='off', **solver_args):
     """Computes the partial information decomposition of  (T,X,Y,Z)
 
        (c) Abdullah Makkeh, Dirk Oliver Theis
@@ -1430,10 +2422,20 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
                     Keys: (t,x,y,z)
                     values: P(t,x,y,z)
                     (dirty refers to the values = 0)
+                    or numpy.array of shape |T|x|X|x|Y|x|Z| - the joint
+                    tensor where pdf_dirty[t,x,y,z] = P(t,x,y,z)
+                    If the values are integers, they are taken as counts
+                    and normalized (cf. normalized_pdf()); this includes a
+                    dictionary whose values are all ints, which earlier
+                    versions rejected (mixed int and float values are
+                    probabilities). Invalid counts raise ValueError
              
-             cone_solver: string - name of the cone solver 
+             cone_solver: string - name of the cone solver, a backend of
+                          TRIVARIATE_BACKENDS ('ECOS', 'SCS', 'Clarabel',
+                          or one added by register_backend()), or 'NumPy'
+                          for the engine of TRIVARIATE_MAXENT (no cone
+                          solver; its results are certified as those of ECOS)
                           (Default = 'ECOS')
-                          (Currently only ECOS) 
 
              output: int - print different outputs based on (int) to console 
                      (default = 0)
@@ -1445,83 +2447,139 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
 
                        (default = 'off')
 
+             alphabets: list - [T, X, Y, Z] symbols of the axes of a tensor pdf,
+                        used by the solver objects to map distributions back
+                        (cf. Solve_w_ECOS.decode_pdf())
+                        (default = None: the indices)
+
+             syn_formulation: string - formulation of the cone program
+                              min -H(T|X,Y,Z) (cf. Opt_I.syn_formulation)
+                              (default = 'standard')
+
+             decompose: string - if 'on', each cone program is split into its
+                        independent blocks (connected components of the support
+                        graph), which are solved separately and put back together
+                        (cf. TRIVARIATE_PRESOLVE.solve_by_components())
+                        (default = 'off')
+
+             presolve: string - if 'on', the variables of each cone program
+                       pinned by the marginals are fixed and their cones are
+                       evaluated in closed form before ECOS; the number of
+                       eliminated variables is in the stats ('eliminated')
+                       (cf. TRIVARIATE_PRESOLVE.solve_presolved())
+                       (default = 'off')
+
+             symmetry: string - if 'on', the programs min -H(T|U,V) which
+                       are relabellings of another one (exchangeable sources,
+                       cf. exchangeable_sources()) are solved once and their
+                       entropies and numerical errors are reused
+                       (default = 'on')
+
+             warm_start: dictionary - the return_data of an earlier call with
+                         cone_solver='NumPy' on a similar pdf (e.g., the
+                         previous one of a bootstrap or of a sliding
+                         window): the engine starts from its optimal
+                         distributions and dual variables, mapped to this
+                         pdf by the symbols of the alphabets; a program for
+                         which this fails is solved from scratch
+                         (cf. TRIVARIATE_MAXENT.active_set_newton())
+                         (default = None)
+
+             accuracy: float - target in bits: if given, all programs are
+                       solved at relaxed tolerances first (feastol, abstol,
+                       and reltol not below accuracy*ln(2)/10), and only those
+                       whose infeasibilities exceed accuracy or whose
+                       duality gap (the third entry of Num_err, in nats)
+                       exceeds accuracy*ln(2) are solved again with
+                       solver_args; their names are in 'Refined'
+                       (default = None: one phase with solver_args)
+
+             model_cache: string - if 'on', the support and the model
+                          templates are reused from and stored in the cache
+                          of the process (cf. Model_Cache), so a later call
+                          with the same positive cells of the marginals only
+                          fills in b (with parallel='on', the models are
+                          created in this process and passed to the
+                          workers); the templates of up to 16 programs stay
+                          in memory after the call, until
+                          MAXENT3D_PID.model_cache.clear()
+                          (default = 'off': nothing outlives the call)
+
+             measure_memory: string - if 'on', the peak RSS of this process
+                             (and of the workers) is reset at the start
+                             (cf. reset_peak_rss()), so 'Peak_RSS' is the
+                             peak of this call; this changes the process-wide
+                             VmHWM seen by other tools
+                             (default = 'off': 'Peak_RSS' is the peak of the
+                             process so far, nothing is reset)
+
              **solver_args: pointer to dictionary - dictionary of ECOS parameters 
+                            (translated for the other cone solvers, cf.
+                            TRIVARIATE_BACKENDS)
                             (default = None)
 
         Returns: 
-                return_data: dictionary - estimated decomposition, solver used, numerical error
+                return_data: dictionary - estimated decomposition, solver used, numerical error,
+                             peak RSS in MB ('Peak_RSS'; with parallel='on' also
+                             the largest of the workers, 'Peak_RSS_workers'; cf.
+                             measure_memory),
+                             with cone_solver='NumPy' the data for the
+                             warm_start of a later call ('Warm_start'),
+                             with accuracy the programs solved again
+                             ('Refined': a list of "I", "12", "13", "23")
                          
     """
 
-    assert type(pdf_dirty) is dict, "MAXENT3D_PID.pid(pdf): pdf must be a dictionary"
+    assert type(pdf_dirty) is dict or type(pdf_dirty) is np.ndarray, "MAXENT3D_PID.pid(pdf): pdf must be a dictionary or a numpy.ndarray"
     assert type(cone_solver) is str, "MAXENT3D_PID.pid(pdf): `cone_solver' parameter must be string (e.g., 'ECOS')"
-    if __debug__:
-        sum_p = 0
-        for k,v in pdf_dirty.items():
-            assert type(k) is tuple or type(k) is list,           "MAXENT3D_PID.pid(pdf): pdf's keys must be tuples or lists"
-            assert len(k)==4,                                     "MAXENT3D_PID.pid(pdf): pdf's keys must be tuples/lists of length 4"
-            assert type(v) is float or ( type(v)==int and v==0 ), "MAXENT3D_PID.pid(pdf): pdf's values must be floats"
-            assert v > -.1,                                       "MAXENT3D_PID.pid(pdf): pdf's values must not be negative"
-            sum_p += v
-        #^ for
-        assert abs(sum_p - 1)< 1.e-10,                                       "MAXENT3D_PID.pid(pdf): pdf's values must sum up to 1 (tolerance of precision is 1.e-10)"
-    #^ if
     assert type(output) is int, "MAXENT3D_PID.pid(pdf,output): output must be an integer"
 
     # Check if the solver is implemented:
-    assert cone_solver=="ECOS", "MAXENT3D_PID.pid(pdf): We currently don't have an interface for the Cone Solver "+cone_solver+" (only ECOS)."
-
-    pdf = { k:v  for k,v in pdf_dirty.items() if v > 1.e-300 }
+    # (the NumPy engine is not a backend, it solves the programs itself, cf. TRIVARIATE_MAXENT)
+    assert cone_solver == 'NumPy' or cone_solver in TRIVARIATE_BACKENDS.available_backends(), "MAXENT3D_PID.pid(pdf): We currently don't have an interface for the Cone Solver "+cone_solver+" (available: "+", ".join(TRIVARIATE_BACKENDS.available_backends() + ['NumPy'])+")."
+    assert accuracy is None or accuracy > 0, "MAXENT3D_PID.pid(pdf): accuracy must be positive (in bits)"
+    if warm_start is not None:
+        assert cone_solver == 'NumPy', "MAXENT3D_PID.pid(pdf): warm_start needs cone_solver='NumPy'"
+        assert type(warm_start) is dict and "Warm_start" in warm_start.keys(), "MAXENT3D_PID.pid(pdf): warm_start must be the return_data of a pid() call with cone_solver='NumPy'"
+        warm_start = warm_start["Warm_start"]
+    #^ if warm start
+
+    if measure_memory == 'on': reset_peak_rss()
+    pdf = normalized_pdf(pdf_dirty)
 
     tic_marg = time.time()
-    bx_tx = marginal_tx(pdf)
-    by_ty = marginal_ty(pdf)
-    bz_tz = marginal_tz(pdf)
+    # Codebook and all marginals in one pass over the coded pdf
+    if alphabets is not None:
+        assert type(pdf) is np.ndarray and tuple( len(V) for V in alphabets ) == pdf.shape, "MAXENT3D_PID.pid(pdf): alphabets must be given for a tensor pdf and match its shape"
+        codes, values, _ = coded_pdf(pdf)
+        alphabets = [ list(V) for V in alphabets ]
+    else:
+        codes, values, alphabets = coded_pdf(pdf)
+    #^ if alphabets
+    shape = tuple( len(V) for V in alphabets )
+    b_t, b_x, b_y, b_z, bx_tx, by_ty, bz_tz, b_xy, b_xz, b_yz = marginals_of_codes(codes, values, shape)
+
+    # Compute H(T), H(T|X), H(T|Y), H(T|Z), and H(T|X,Y,Z) of the original pdf (not optimal pdf)
+    entropy_T     = -plogp_ratio_sum(b_t, 1.)
+    condent_1     = -plogp_ratio_sum(bx_tx, b_x[None,:])
+    condent_2     = -plogp_ratio_sum(by_ty, b_y[None,:])
+    condent_3     = -plogp_ratio_sum(bz_tz, b_z[None,:])
+    condent__orig = condentropy_of_codes(codes, values, shape)
 
-    b_xy = marginal_xy(pdf)
-    b_xz = marginal_xz(pdf)
-    b_yz = marginal_yz(pdf)
-    
     toc_marg = time.time()
     if output > 0: print("\nMAXENT3D_PID.pid(): Time to create marginals:", toc_marg - tic_marg, "secs\n")
-    # if cone_solver=="ECOS": .....
     if output > 0:  print("\nMAXENT3D_PID.pid(): Preparing Cone Program data",end="...\n")
 
-    solver = Solve_w_ECOS(bx_tx, by_ty, bz_tz, b_xy, b_xz, b_yz)
-    subsolver_I = Opt_I(bx_tx, by_ty, bz_tz, b_xy, b_xz, b_yz)
-    subsolver_II = Opt_II(bx_tx, by_ty, bz_tz, b_xy, b_xz, b_yz)
-
-    tic_mod = time.time()
-        
-    if parallel == 'on':
-        pool = Pool()
-        # call create_model() for min -H( T|XY ), min -H( T|XZ ), min -H( T|YZ )
-        cre_12 = pool.apply_async(subsolver_II.create_model, [ [1,2], output ])
-        cre_13 = pool.apply_async(subsolver_II.create_model, [ [1,3], output ])
-        cre_23 = pool.apply_async(subsolver_II.create_model, [ [2,3], output ])
-
-        # call create_model() for min -H( T|XYZ )
-        cre_I = pool.apply_async(subsolver_I.create_model, [ output ])
-
-        # Get the models
-        c_I, G_I, h_I, dims_I, A_I, b_I = cre_I.get()
-        c_12, G_12, h_12, dims_12, A_12, b_12 = cre_12.get()
-        c_13, G_13, h_13, dims_13, A_13, b_13 = cre_13.get()
-        c_23, G_23, h_23, dims_23, A_23, b_23 = cre_23.get()
-        pool.close()
-        pool.join()
-    else:
-        # create model min -H( T|XYZ )
-        c_I, G_I, h_I, dims_I, A_I, b_I = subsolver_I.create_model(output)
-
-        # create models min -H( T|XY ), min -H( T|XZ ), min -H( T|YZ )
-        c_12, G_12, h_12, dims_12, A_12, b_12 = subsolver_II.create_model([1,2], output)
-        c_13, G_13, h_13, dims_13, A_13, b_13 = subsolver_II.create_model([1,3], output)
-        c_23, G_23, h_23, dims_23, A_23, b_23 = subsolver_II.create_model([2,3], output)
-    #^ if parallel
-    
-    toc_mod = time.time()
-    if output > 0: print("\nMAXENT3D_PID.pid(): Time to create all models. ", toc_mod - tic_mod, "secs\n")
+    # The alphabets, marginals, and support are built once and shared by all subsolvers
+    context      = PID_Context(bx_tx, by_ty, bz_tz, b_xy, b_xz, b_yz, alphabets, use_cache=model_cache == 'on')
+    solver       = Solve_w_ECOS(context=context)
+    subsolver_I  = Opt_I(context=context)
+    subsolver_II = Opt_II(context=context)
+    subsolver_I.syn_formulation = syn_formulation
+    subsolver_I.decompose  = decompose == 'on'
+    subsolver_II.decompose = decompose == 'on'
+    subsolver_I.presolve   = presolve == 'on'
+    subsolver_II.presolve  = presolve == 'on'
 
     if output > 2:
         subsolver_I.verbose = True
@@ -1533,42 +2591,119 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         if solver_args['keep_solver_object']==True: ecos_keep_solver_obj = True
         del solver_args['keep_solver_object']
 
-    subsolver_I.ecos_kwargs = solver_args
-    subsolver_II.ecos_kwargs = solver_args
-    if output > 0: print("MAXENT3D_PID.pid(): Preparing Cone Program data is done.")
+    # With accuracy, the first phase solves all programs at relaxed tolerances
+    # (ECOS defaults: 1.e-8; a tenth of the target, as ECOS stops at the relative
+    # gap), the second phase those which need solver_args
+    phase_args = solver_args
+    if accuracy is not None:
+        phase_args = dict(solver_args)
+        for tol in ('feastol', 'abstol', 'reltol'):
+            phase_args[tol] = max(accuracy*ln(2)/10., solver_args.get(tol, 1.e-8))
+        #^ for tolerances
+    #^ if accuracy
+
+    subsolver_I.ecos_kwargs = phase_args
+    subsolver_II.ecos_kwargs = phase_args
+    subsolver_I.cone_solver  = cone_solver
+    subsolver_II.cone_solver = cone_solver
+    subsolver_I.warm_start   = warm_start
+    subsolver_II.warm_start  = warm_start
+    # The model matrices are kept on the subsolvers only if they are returned
+    subsolver_I.keep_model  = ecos_keep_solver_obj
+    subsolver_II.keep_model = ecos_keep_solver_obj
+
+    # The programs min -H( T|UV ) which are relabellings of an earlier one
+    # (exchangeable sources) are not solved, their numbers are reused
+    twins       = twin_programs(exchangeable_sources(codes, values, shape)) if symmetry == 'on' else dict()
+    programs_II = [ ws for ws in ([1,2], [1,3], [2,3]) if tuple(ws) not in twins ]
+    if output > 0 and twins: print("MAXENT3D_PID.pid(): Exchangeable sources, reusing the solutions of", twins)
 
-    if output == 1: print("MAXENT3D_PID.pid(): Starting solver",end="...")
-    if output > 2: print("MAXENT3D_PID.pid(): Starting solver.")
-
-    if parallel == "on":
-
-        # Find the optimal solution of: min H(T|XYZ), min H(T|XY), H(T|XZ) and H(T|YZ)
-        pool = Pool()
-        # Call solve()  
-        res_I = pool.apply_async(subsolver_I.solve, [ c_I, G_I, h_I, dims_I, A_I, b_I, output ]) 
-        res_12 = pool.apply_async(subsolver_II.solve,[c_12, G_12, h_12, dims_12, A_12, b_12, output])
-        res_13 = pool.apply_async(subsolver_II.solve,[c_13, G_13, h_13, dims_13, A_13, b_13, output])
-        res_23 = pool.apply_async(subsolver_II.solve,[c_23, G_23, h_23, dims_23, A_23, b_23, output])
-
-        # Get the optimal solutions 
-        retval_I, sol_rpq_I, sol_slack_I, sol_lambda_I, sol_mu_I, sol_info_I = res_I.get()
-        retval_12, sol_rpq_12, sol_slack_12, sol_lambda_12, sol_mu_12, sol_info_12 = res_12.get()
-        retval_13, sol_rpq_13, sol_slack_13, sol_lambda_13, sol_mu_13, sol_info_13 = res_13.get()
-        retval_23, sol_rpq_23, sol_slack_23, sol_lambda_23, sol_mu_23, sol_info_23 = res_23.get()
+    tic_mod = time.time()
+        
+    if parallel == 'on':
+        # One pool for the call: the context is shipped to each worker once,
+        # and each worker creates and solves one of the cone programs
+        # min -H( T|XYZ ), min -H( T|XY ), min -H( T|XZ ), min -H( T|YZ )
+        # With model_cache='on', the models are taken from (or put into) the
+        # cache of this process and passed to the workers
+        model_I, models_II = None, [ None for ws in programs_II ]
+        if model_cache == 'on':
+            model_I   = subsolver_I.create_model(output)
+            models_II = [ subsolver_II.create_model(ws, output) for ws in programs_II ]
+        #^ if cache
+        pool = Pool(processes=4, initializer=init_worker, initargs=(context,))
+        res_I  = pool.apply_async(solve_in_worker, [ None,  output, phase_args, syn_formulation, decompose, presolve, cone_solver, warm_start, measure_memory, model_I ])
+        res_II = [ pool.apply_async(solve_in_worker, [ ws, output, phase_args, syn_formulation, decompose, presolve, cone_solver, warm_start, measure_memory, model ]) for ws, model in zip(programs_II, models_II) ]
+
+        # Get the right-hand sides and the optimal solutions
+        b_I,  (retval_I, sol_rpq_I, sol_slack_I, sol_lambda_I, sol_mu_I, sol_info_I), rss_I = res_I.get()
+        b_II, solution_II, rss_workers = dict(), dict(), [ rss_I ]
+        for ws, res in zip(programs_II, res_II):
+            b_II[tuple(ws)], solution_II[tuple(ws)], rss = res.get()
+            rss_workers.append(rss)
+        #^ for programs
         pool.close()
         pool.join()
+
+        toc_mod = time.time()
+        if output > 0: print("\nMAXENT3D_PID.pid(): Time to create and solve all models. ", toc_mod - tic_mod, "secs\n")
     else:
+        # create model min -H( T|XYZ )
+        c_I, G_I, h_I, dims_I, A_I, b_I = subsolver_I.create_model(output)
+
+        # create models min -H( T|XY ), min -H( T|XZ ), min -H( T|YZ )
+        models_II = [ subsolver_II.create_model(ws, output) for ws in programs_II ]
+    
+        toc_mod = time.time()
+        if output > 0: print("\nMAXENT3D_PID.pid(): Time to create all models. ", toc_mod - tic_mod, "secs\n")
+
+        if output > 0: print("MAXENT3D_PID.pid(): Preparing Cone Program data is done.")
+
+        if output == 1: print("MAXENT3D_PID.pid(): Starting solver",end="...")
+        if output > 2: print("MAXENT3D_PID.pid(): Starting solver.")
+
         # Solve the optimization: min -H( T|XYZ )
         retval_I, sol_rpq_I, sol_slack_I, sol_lambda_I, sol_mu_I, sol_info_I = subsolver_I.solve(c_I, G_I, h_I, dims_I, A_I, b_I, output)
 
         # Solve the optimizations: min -H( T|XY ), min -H( T|XZ ), min -H( T|YZ )
-        retval_12, sol_rpq_12, sol_slack_12, sol_lambda_12, sol_mu_12, sol_info_12 = subsolver_II.solve(c_12, G_12, h_12, dims_12, A_12, b_12, output)
-        retval_13, sol_rpq_13, sol_slack_13, sol_lambda_13, sol_mu_13, sol_info_13 = subsolver_II.solve(c_13, G_13, h_13, dims_13, A_13, b_13, output)
-        retval_23, sol_rpq_23, sol_slack_23, sol_lambda_23, sol_mu_23, sol_info_23 = subsolver_II.solve(c_23, G_23, h_23, dims_23, A_23, b_23, output)
+        b_II, solution_II = dict(), dict()
+        for ws, (c, G, h, dims, A, b) in zip(programs_II, models_II):
+            b_II[tuple(ws)]        = b
+            solution_II[tuple(ws)] = subsolver_II.solve(c, G, h, dims, A, b, output, ws)
+        #^ for programs
     #^ if parallel
 
+    refined = []
+    if accuracy is not None:
+        # Second phase: solve again with solver_args the programs which are not accurate enough
+        # (the NumPy engine starts at the solution of the first phase)
+        tic_ref = time.time()
+        subsolver_I.ecos_kwargs  = solver_args
+        subsolver_II.ecos_kwargs = solver_args
+        if needs_refinement(subsolver_I, None, b_I, (retval_I, sol_rpq_I, sol_slack_I, sol_lambda_I, sol_mu_I, sol_info_I), accuracy, output):
+            if parallel == 'on': c_I, G_I, h_I, dims_I, A_I, b_I = subsolver_I.create_model(output)
+            if cone_solver == 'NumPy' and retval_I == "success":
+                subsolver_I.warm_start = { 'alphabets': context.alphabets, 'I': TRIVARIATE_MAXENT.warm_start_syn(subsolver_I, sol_rpq_I, sol_lambda_I) }
+            retval_I, sol_rpq_I, sol_slack_I, sol_lambda_I, sol_mu_I, sol_info_I = subsolver_I.solve(c_I, G_I, h_I, dims_I, A_I, b_I, output)
+            refined.append("I")
+        #^ if refine
+        for k, ws in enumerate(programs_II):
+            key = tuple(ws)
+            if needs_refinement(subsolver_II, ws, b_II[key], solution_II[key], accuracy, output):
+                if parallel == 'on': c, G, h, dims, A, b = subsolver_II.create_model(ws, output)
+                else:                c, G, h, dims, A, b = models_II[k]
+                if cone_solver == 'NumPy' and solution_II[key][0] == "success":
+                    subsolver_II.warm_start = { 'alphabets': context.alphabets, key: TRIVARIATE_MAXENT.warm_start_unq(subsolver_II, ws, solution_II[key][1], solution_II[key][3]) }
+                solution_II[key] = subsolver_II.solve(c, G, h, dims, A, b, output, ws)
+                refined.append(str(ws[0])+str(ws[1]))
+            #^ if refine
+        #^ for programs
+        toc_ref = time.time()
+        if output > 0: print("\nMAXENT3D_PID.pid(): Time to solve again", refined, "at solver_args:", toc_ref - tic_ref, "secs\n")
+    #^ if accuracy
+
     # Print warning when  a solution is not returned for any of the optimization
-    if retval_I != "success" and retval_12 != "success" and retval_13 != "success" and retval_23 != "success":
+    if retval_I != "success" and all( solution[0] != "success" for solution in solution_II.values() ):
         print("\nCone Programming solver failed to find (near) optimal solution.\nPlease report the input probability density function to abdullah.makkeh@gmail.com\n")
         if ecos_keep_solver_obj:
             return solver
@@ -1580,119 +2715,42 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
     if output > 0:  print("\nMAXENT3D_PID.pid(): Solving is done.\n")
 
     tic_stats = time.time()
+    names_II = { (1,2): "X,Y", (1,3): "X,Z", (2,3): "Y,Z" }
     if output > 0:
         print("\nMAXENT3D_PID.pid(): Stats for optimizing H(T|X,Y,Z):\n", sol_info_I)
-        print("\nMAXENT3D_PID.pid(): Stats for optimizing H(T|X,Y):\n", sol_info_12)
-        print("\nMAXENT3D_PID.pid(): Stats for optimizing H(T|X,Z):\n", sol_info_13)
-        print("\nMAXENT3D_PID.pid(): Stats for optimizing H(T|Y,Z):\n", sol_info_23)
-    if parallel == 'on':
-
-        # Compute the value of the dual objective function for each optimization:
-        # min -H( T|XYZ ) min -H( T|XY ), min -H( T|XZ ) and  min -H( T|YZ ) ) 
-        pool = Pool()
-
-        # Call dual_value() to compute the 
-        dual_I        = pool.apply_async(subsolver_I.dual_value,[sol_lambda_I, b_I])
-        dual_12       = pool.apply_async(subsolver_II.dual_value,[sol_lambda_12, b_12])
-        dual_13       = pool.apply_async(subsolver_II.dual_value,[sol_lambda_13, b_13])
-        dual_23       = pool.apply_async(subsolver_II.dual_value,[sol_lambda_23, b_23])
-
-        # Get the dual value
-        dual_val_I    = dual_I.get()
-        dual_val_12   = dual_12.get()
-        dual_val_13   = dual_13.get()
-        dual_val_23   = dual_23.get()
-        pool.close()
-        pool.join()
-
-        # Compute the marginals of the optimal pdf (part of the optimal solution is a pdf) 
-        pool = Pool()
-
-        # Call marginals() 
-        marg_12 = pool.apply_async(subsolver_II.marginals,[[1,2], sol_rpq_12, output])
-        marg_13 = pool.apply_async(subsolver_II.marginals,[[1,3], sol_rpq_13, output])
-        marg_23 = pool.apply_async(subsolver_II.marginals,[[2,3], sol_rpq_23, output])
-
-        # Get the marginals
-        marg_12_T, marg_12_X, marg_12_Y, marg_12_Z, marg_12_TX, marg_12_TY, marg_12_TZ, marg_12_XY, marg_12_XZ, marg_12_YZ, marg_12_TXY, marg_12_TXZ, marg_12_TYZ = marg_12.get()
-        marg_13_T, marg_13_X, marg_13_Y, marg_13_Z, marg_13_TX, marg_13_TY, marg_13_TZ, marg_13_XY, marg_13_XZ, marg_13_YZ, marg_13_TXY, marg_13_TXZ, marg_13_TYZ = marg_13.get()
-        marg_23_T, marg_23_X, marg_23_Y, marg_23_Z, marg_23_TX, marg_23_TY, marg_23_TZ, marg_23_XY, marg_23_XZ, marg_23_YZ, marg_23_TXY, marg_23_TXZ, marg_23_TYZ = marg_23.get()
-        pool.close()
-        pool.join()
-
-
-        # Compute H(T|X,Y,Z), H(T|X,Y), H(T|X,Z), H(T|Y,Z) (using the optimal pdf) 
-        pool = Pool()
-
-        # Call condentropy() and condentropy_2vars() 
-        con_I = pool.apply_async(subsolver_I.condentropy,[sol_rpq_I, output])
-        con_12 = pool.apply_async(subsolver_II.condentropy_2vars,[ [1,2], sol_rpq_12, output, marg_12_XY, marg_12_XZ, marg_12_YZ,marg_12_TXY, marg_12_TXZ, marg_12_TYZ])
-        con_13        = pool.apply_async(subsolver_II.condentropy_2vars,[[1,3], sol_rpq_13, output, marg_13_XY, marg_13_XZ, marg_13_YZ, marg_13_TXY, marg_13_TXZ, marg_13_TYZ])
-        con_23        = pool.apply_async(subsolver_II.condentropy_2vars,[[2,3], sol_rpq_23, output, marg_23_XY, marg_23_XZ, marg_23_YZ, marg_23_TXY, marg_23_TXZ, marg_23_TYZ])
-
-        # Get H(T|X,Y,Z), H(T|X,Y), H(T|X,Z) and H(T|Y,Z)
-        condent_I     = con_I.get()
-        condent_12    = con_12.get()
-        condent_13    = con_13.get()
-        condent_23    = con_23.get()
-
-        pool.close()
-        pool.join()
-
-        # Compute H(T), H(T|X), H(T|Y) and H(T|Z) 
-        pool = Pool()
-
-        # Call entropy_V() and condent_V()
-        ent_T = pool.apply_async(solver.entropy_V, [1, pdf, output])
-        con_1 = pool.apply_async(condent_V, [1, pdf, output])
-        con_2 = pool.apply_async(condent_V, [2, pdf, output])
-        con_3 = pool.apply_async(condent_V, [3, pdf, output])
-
-        # Get H(T), H(T|X), H(T|Y) and H(T|Z) 
-        entropy_T     = ent_T.get()
-
-        condent_1     = con_1.get()
-        condent_2     = con_2.get()
-        condent_3     = con_3.get()
-        pool.close()
-        pool.join()
-
-        # Compute H(T|X,Y,Z) of the original pdf (not optimal pdf)
-        condent__orig = solver.condentropy__orig(pdf, output)
-    else:
-
-        # Compute the value of the dual objective function for each optimization:
-        # min -H( T|XYZ ) min -H( T|XY ), min -H( T|XZ ) and  min -H( T|YZ )
-        dual_val_I    = subsolver_I.dual_value(sol_lambda_I, b_I)
-        dual_val_12   = subsolver_II.dual_value(sol_lambda_12, b_12)
-        dual_val_13   = subsolver_II.dual_value(sol_lambda_13, b_13)
-        dual_val_23   = subsolver_II.dual_value(sol_lambda_23, b_23)
+        for key in names_II.keys():
+            if key in twins: print("\nMAXENT3D_PID.pid(): Stats for optimizing H(T|"+names_II[key]+"): as for H(T|"+names_II[twins[key]]+")")
+            else:            print("\nMAXENT3D_PID.pid(): Stats for optimizing H(T|"+names_II[key]+"):\n", solution_II[key][5])
+        #^ for programs
+    #^ if output
+
+    # The results are evaluated with the shared context (also for parallel='on')
+    # Compute the value of the dual objective function for each optimization:
+    # min -H( T|XYZ ) min -H( T|XY ), min -H( T|XZ ) and  min -H( T|YZ )
+    dual_val_I    = subsolver_I.dual_value(sol_lambda_I, b_I)
+    dual_val_II   = dict()
+    condent_II    = dict()
+    for key, (retval, sol_rpq, sol_slack, sol_lambda, sol_mu, sol_info) in solution_II.items():
+        dual_val_II[key] = subsolver_II.dual_value(sol_lambda, b_II[key])
 
         # Compute the marginals of the optimal pdf (part of the optimal solution is a pdf) 
-        marg_12_T, marg_12_X, marg_12_Y, marg_12_Z, marg_12_TX, marg_12_TY, marg_12_TZ, marg_12_XY, marg_12_XZ, marg_12_YZ, marg_12_TXY, marg_12_TXZ, marg_12_TYZ = subsolver_II.marginals([1,2], sol_rpq_12, output)
-        
-        marg_13_T, marg_13_X, marg_13_Y, marg_13_Z, marg_13_TX, marg_13_TY, marg_13_TZ, marg_13_XY, marg_13_XZ, marg_13_YZ, marg_13_TXY, marg_13_TXZ, marg_13_TYZ = subsolver_II.marginals([1,3], sol_rpq_13, output)
-
-        marg_23_T, marg_23_X, marg_23_Y, marg_23_Z, marg_23_TX, marg_23_TY, marg_23_TZ, marg_23_XY, marg_23_XZ, marg_23_YZ, marg_23_TXY, marg_23_TXZ, marg_23_TYZ = subsolver_II.marginals([2,3], sol_rpq_23, output)
+        marg_T, marg_X, marg_Y, marg_Z, marg_TX, marg_TY, marg_TZ, marg_XY, marg_XZ, marg_YZ, marg_TXY, marg_TXZ, marg_TYZ = subsolver_II.marginals(list(key), sol_rpq, output)
 
+        # Compute H(T|X,Y), H(T|X,Z), H(T|Y,Z) (using the optimal pdf) 
+        condent_II[key] = subsolver_II.condentropy_2vars(list(key), sol_rpq, output, marg_XY, marg_XZ, marg_YZ, marg_TXY, marg_TXZ, marg_TYZ)
+    #^ for programs
 
-        # Compute H(T|X,Y,Z), H(T|X,Y), H(T|X,Z), H(T|Y,Z) (using the optimal pdf) 
-        condent_I     = subsolver_I.condentropy(sol_rpq_I, output)
-        condent_12    = subsolver_II.condentropy_2vars([1,2], sol_rpq_12, output, marg_12_XY, marg_12_XZ, marg_12_YZ,marg_12_TXY, marg_12_TXZ, marg_12_TYZ)
-        condent_13    = subsolver_II.condentropy_2vars([1,3],sol_rpq_13, output, marg_13_XY, marg_13_XZ, marg_13_YZ,marg_13_TXY, marg_13_TXZ, marg_13_TYZ)
-        condent_23    = subsolver_II.condentropy_2vars([2,3], sol_rpq_23, output, marg_23_XY, marg_23_XZ, marg_23_YZ,marg_23_TXY, marg_23_TXZ, marg_23_TYZ)
+    # Compute H(T|X,Y,Z) (using the optimal pdf) 
+    condent_I     = subsolver_I.condentropy(sol_rpq_I, output)
 
-        # Compute H(T), H(T|X), H(T|Y) and H(T|Z) 
-        entropy_T     = solver.entropy_V(1, pdf, output)
-        condent_1     = condent_V(1, pdf, output)
-        condent_2     = condent_V(2, pdf, output)
-        condent_3     = condent_V(3, pdf, output)
+    # The twins: min -H( T|UV ) has the optimum of its relabelled program
+    for key, twin in twins.items():
+        dual_val_II[key] = dual_val_II[twin]
+        condent_II[key]  = condent_II[twin]
+    #^ for twins
+    dual_val_12, dual_val_13, dual_val_23 = dual_val_II[(1,2)], dual_val_II[(1,3)], dual_val_II[(2,3)]
+    condent_12,  condent_13,  condent_23  = condent_II[(1,2)],  condent_II[(1,3)],  condent_II[(2,3)]
 
-        # Compute H(T|X,Y,Z) of the original pdf (not optimal pdf) 
-        condent__orig = solver.condentropy__orig(pdf, output)
-    # elsif cone_solver=="SCS":
-    # .....
-    # #^endif
     toc_stats = time.time()
     if output > 0: print("\nMAXENT3D_PID.pid(): Time for retrieving results:", toc_stats - tic_stats, "secs\n")
 
@@ -1711,43 +2769,21 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
     return_data["SI"]    = entropy_T  - condent__orig - return_data["CI"] - return_data["UIX"]  - return_data["UIY"]  - return_data["UIZ"] - return_data["UIXY"] - return_data["UIXZ"] - return_data["UIYZ"]
 
     tic_o = time.time()    
-    if parallel == "on":
-
-        # Compute the feasibility violations of the optimization problems:
-        # min -H( T|XYZ ) min -H( T|XY ), min -H( T|XZ ) and  min -H( T|YZ ) ) 
-        pool = Pool()
-
-        # Call check_Feasibility()
-        feas_I = pool.apply_async(subsolver_I.check_feasibility, [ sol_rpq_I,sol_lambda_I,output ])
-
-        feas_12 = pool.apply_async(subsolver_II.check_feasibility, [ [1,2], sol_rpq_12, sol_slack_12, sol_lambda_12, sol_mu_12,output ])
-
-        feas_13 = pool.apply_async(subsolver_II.check_feasibility, [ [1,3], sol_rpq_13, sol_slack_13, sol_lambda_13, sol_mu_13,output ])
-
-        feas_23 = pool.apply_async(subsolver_II.check_feasibility, [ [2,3], sol_rpq_23, sol_slack_23, sol_lambda_23, sol_mu_23,output ])
-
-        # Get feasibility violations
-        primal_infeas_I,dual_infeas_I = feas_I.get()
-        primal_infeas_12,dual_infeas_12 = feas_12.get()
-        primal_infeas_13,dual_infeas_13 = feas_13.get()
-        primal_infeas_23,dual_infeas_23 = feas_23.get()
-        pool.close()
-        pool.join()
-    else:
-        # Compute the feasibility violations of the optimization problems:
-        # min -H( T|XYZ ) min -H( T|XY ), min -H( T|XZ ) and  min -H( T|YZ ) ) 
-
-        primal_infeas_I,dual_infeas_I = subsolver_I.check_feasibility(sol_rpq_I,sol_lambda_I,output)
-        
-
-        primal_infeas_12,dual_infeas_12 = subsolver_II.check_feasibility([1,2], sol_rpq_12, sol_slack_12, sol_lambda_12, sol_mu_12,output)
-        
-
-        primal_infeas_13,dual_infeas_13 = subsolver_II.check_feasibility([1,3], sol_rpq_13, sol_slack_13, sol_lambda_13, sol_mu_13,output)
-        
-
-        primal_infeas_23,dual_infeas_23 = subsolver_II.check_feasibility([2,3], sol_rpq_23, sol_slack_23, sol_lambda_23, sol_mu_23,output)
-    #^if parallel
+    # Compute the feasibility violations of the optimization problems:
+    # min -H( T|XYZ ) min -H( T|XY ), min -H( T|XZ ) and  min -H( T|YZ ) ) 
+
+    primal_infeas_I,dual_infeas_I = subsolver_I.check_feasibility(sol_rpq_I,sol_lambda_I,output)
+
+    infeas_II = dict()
+    for key, (retval, sol_rpq, sol_slack, sol_lambda, sol_mu, sol_info) in solution_II.items():
+        infeas_II[key] = subsolver_II.check_feasibility(list(key), sol_rpq, sol_slack, sol_lambda, sol_mu, output)
+    #^ for programs
+    for key, twin in twins.items():
+        infeas_II[key] = infeas_II[twin]
+    #^ for twins
+    primal_infeas_12,dual_infeas_12 = infeas_II[(1,2)]
+    primal_infeas_13,dual_infeas_13 = infeas_II[(1,3)]
+    primal_infeas_23,dual_infeas_23 = infeas_II[(2,3)]
 
     toc_o = time.time()
     if output > 0: print("\nMAXENT3D_PID.pid(): Time for computing Numerical Errors:", toc_o - tic_o, "secs\n")
@@ -1759,7 +2795,22 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
     return_data["Num_err_12"] = (primal_infeas_12,dual_infeas_12, max(-condent_12*ln(2) - dual_val_12, 0.0))
     return_data["Num_err_13"] = (primal_infeas_13,dual_infeas_13, max(-condent_13*ln(2) - dual_val_13, 0.0))
     return_data["Num_err_23"] = (primal_infeas_23,dual_infeas_23, max(-condent_23*ln(2) - dual_val_23, 0.0))
-    return_data["Solver"] = "ECOS http://www.embotech.com/ECOS"
+    if cone_solver == 'NumPy': return_data["Solver"] = "NumPy (TRIVARIATE_MAXENT)"
+    else:                      return_data["Solver"] = TRIVARIATE_BACKENDS.backends[cone_solver][1]
+    if accuracy is not None: return_data["Refined"] = refined
+    if cone_solver == 'NumPy':
+        # The optima in the symbols of the alphabets, for the warm_start of a later call
+        return_data["Warm_start"] = { 'alphabets': context.alphabets, 'I': TRIVARIATE_MAXENT.warm_start_syn(subsolver_I, sol_rpq_I, sol_lambda_I) }
+        for key, solution in solution_II.items():
+            return_data["Warm_start"][key] = TRIVARIATE_MAXENT.warm_start_unq(subsolver_II, list(key), solution[1], solution[3])
+        #^ for programs
+    #^ if NumPy
+    return_data["Peak_RSS"] = peak_rss()
+    if parallel == 'on':
+        rss_workers = [ rss for rss in rss_workers if rss is not None ]
+        return_data["Peak_RSS_workers"] = max(rss_workers) if rss_workers else None
+    #^ if parallel
+    if output > 0: print("MAXENT3D_PID.pid(): Peak RSS:", return_data["Peak_RSS"], "MB")
 
     # Store the model and the problem if asked to 
     if ecos_keep_solver_obj:
@@ -1822,9 +2873,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-gap_I )
 
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -1852,9 +2903,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-gap_12 )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -1878,9 +2929,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-gap_13 )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -1904,9 +2955,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 0.        )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -1931,9 +2982,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-gap   )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
 
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
@@ -1963,9 +3014,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-gap   )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -1994,9 +3045,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-gap_I )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -2025,9 +3076,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-gap    )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -2054,9 +3105,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-gap_12 )
 
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
 
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -2083,9 +3134,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-gap_13 )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -2112,9 +3163,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-gap              )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -2143,9 +3194,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-(gap_I + gap_12) )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -2174,9 +3225,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-(gap_I + gap_13) )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -2205,9 +3256,9 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
         UIYZ = ( return_data["UIYZ"], 1.-(gap_12 + gap_13) )
         
         MI  = entropy_T  - condent__orig
-        MIX = I_V(1,pdf)
-        MIY = I_V(2,pdf)
-        MIZ = I_V(3,pdf)
+        MIX = (entropy_T - condent_1)
+        MIY = (entropy_T - condent_2)
+        MIZ = (entropy_T - condent_3)
         
         recover_solver = QP(CI,SI,UIX,UIY,UIZ,UIXY,UIXZ,UIYZ,MI,MIX,MIY,MIZ)
         if output > 2: recover_solver.verbose = True
@@ -2236,19 +3287,19 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
     assert vio_T_XYZ < tol,                                 "MAXENT3D_PID.pid(): PID quantities must  sum up to mutual information, the violation is "+str(vio_T_XYZ)+", and the precision is set to "+str(tol)
 
     # Check: MI(T; X) = SI + UIX + UIXY + UIXZ
-    vio_T_X = abs( I_V(1,pdf)
+    vio_T_X = abs( (entropy_T - condent_1)
                 - return_data['SI'] - return_data['UIX'] - return_data['UIXY'] - return_data['UIXZ'] )
     assert vio_T_X < tol, "MAXENT3D_PID.pid(): Unique and shared of X must sum up to MI(T; X), the violation is"+str(vio_T_X)+" and the precision is set to "+str(tol)
 
     # Check: MI(T; Y) = SI + UIY + UIXY + UIYZ
-    vio_T_Y = abs( I_V(2,pdf)
+    vio_T_Y = abs( (entropy_T - condent_2)
                 - return_data['SI'] - return_data['UIY'] - return_data['UIXY'] - return_data['UIYZ'] )
     
     assert vio_T_Y < tol, "MAXENT3D_PID.pid(): Unique and shared of Y must sum up to MI(T; Y), and the violation is"+str(vio_T_Y)+", and the precision is set to"+str(tol)
 
 
     # Check: MI(T; Z) = SI + UIZ + UIXZ + UIYZ
-    vio_T_Z = abs( I_V(3,pdf)
+    vio_T_Z = abs( (entropy_T - condent_3)
                 - return_data['SI'] - return_data['UIZ'] - return_data['UIXZ'] - return_data['UIYZ'])
     
     assert vio_T_Z < tol, "MAXENT3D_PID.pid(): Unique and shared of Z must sum up to MI(S; Z), the violation is"+str(vio_T_Z)+", and the precision is set to"+str(tol)
@@ -2256,4 +3307,321 @@ def pid(pdf_dirty, cone_solver='ECOS', output=0, parallel='off', **solver_args):
     return return_data
 #^ pid()
 
+def sample_weights(weights, n):
+    """Validates per-sample weights
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+       Raises ValueError unless there are n finite nonnegative weights with
+       a positive sum (also with python -O).
+
+        Args:
+             weights: numpy.array or None - weights of n samples
+
+             n: int - number of samples
+
+        Returns:
+            numpy.array of float64 or None (if weights is None)
+    """
+    if weights is None: return None
+    weights = np.asarray(weights, dtype=np.float64).ravel()
+    if len(weights) != n:                    raise ValueError("MAXENT3D_PID.sample_weights(): there must be one weight per sample")
+    if not np.all(np.isfinite(weights)):     raise ValueError("MAXENT3D_PID.sample_weights(): weights must be finite")
+    if n > 0 and weights.min() < 0:          raise ValueError("MAXENT3D_PID.sample_weights(): weights must not be negative")
+    if n > 0 and not weights.sum() > 0:      raise ValueError("MAXENT3D_PID.sample_weights(): weights must not all be 0")
+    return weights
+#^ sample_weights()
+
+def pdf_from_samples(t, x, y, z, weights=None):
+    """Computes the empirical distribution of (T,X,Y,Z) from samples
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+       The symbols of each variable are mapped to 0..n-1 (in sorted order)
+       and the joint histogram is counted in a single bincount pass.
+
+        Args:
+             t: numpy.array - observations of T (integer or categorical)
+
+             x: numpy.array - observations of X (same length as t)
+
+             y: numpy.array - observations of Y (same length as t)
+
+             z: numpy.array - observations of Z (same length as t)
+
+             weights: numpy.array - nonnegative weight of each sample
+                      (default = None: all samples have weight 1)
+
+        Returns:
+            pdf: numpy.array - empirical distribution of shape |T|x|X|x|Y|x|Z|
+
+            alphabets: list - [T, X, Y, Z] where pdf[i,j,k,l] is the
+                       probability of (T[i], X[j], Y[k], Z[l])
+    """
+    samples = [ np.asarray(v).ravel() for v in (t, x, y, z) ]
+    n = len(samples[0])
+    assert n > 0,                                    "MAXENT3D_PID.pdf_from_samples(t,x,y,z): there must be at least one sample"
+    assert all( len(v) == n for v in samples ),      "MAXENT3D_PID.pdf_from_samples(t,x,y,z): t, x, y, and z must have the same length"
+
+    alphabets = []
+    codes     = []
+    for v in samples:
+        symbols, code = np.unique(v, return_inverse=True)
+        alphabets.append( symbols )
+        codes.append( code.ravel() )
+    #^ for
+    shape  = tuple( len(symbols) for symbols in alphabets )
+    counts = np.bincount( np.ravel_multi_index(codes, shape), weights=sample_weights(weights, n), minlength=int(np.prod(shape)) )
+    return counts.reshape(shape)/counts.sum(), alphabets
+#^ pdf_from_samples()
+
+def pid_from_samples(t, x, y, z, weights=None, cone_solver='ECOS', output=0, parallel='off', **solver_args):
+    """Computes the partial information decomposition of (T,X,Y,Z) from samples
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+        Args:
+             t, x, y, z: numpy.array - equal-length observations of T, X, Y, and Z
+                         (integer or categorical)
+
+             weights: numpy.array - as in pdf_from_samples()
+
+             cone_solver, output, parallel, **solver_args: as in pid()
+
+        Returns:
+                return_data: dictionary - as in pid()
+    """
+    pdf,alphabets = pdf_from_samples(t, x, y, z, weights)
+    return pid(pdf, cone_solver=cone_solver, output=output, parallel=parallel, alphabets=alphabets, **solver_args)
+#^ pid_from_samples()
+
+def pdf_from_dataframe(df, t, x, y, z, weights=None):
+    """Computes the empirical distribution of four columns of a DataFrame
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+       Each column is converted to a categorical, and the joint histogram of
+       the category codes is counted in a single bincount pass. Rows with a
+       missing value in one of the columns are ignored.
+
+        Args:
+             df: pandas.DataFrame - the observations
+
+             t, x, y, z: column labels of T, X, Y, and Z in df
+
+             weights: column label of the (nonnegative) row weights in df;
+                      the weights of the ignored rows are not used
+                      (default = None: all rows have weight 1)
+
+        Returns:
+            pdf: numpy.array - empirical distribution of shape |T|x|X|x|Y|x|Z|
+
+            alphabets: list - [T, X, Y, Z] the category labels of the axes of pdf
+    """
+    codes     = []
+    alphabets = []
+    for name in (t, x, y, z):
+        column = df[name].astype('category').cat
+        codes.append( np.asarray(column.codes, dtype=np.int64) )
+        alphabets.append( list(column.categories) )
+    #^ for
+    observed = np.all( [ c >= 0 for c in codes ], axis=0 )
+    assert observed.any(), "MAXENT3D_PID.pdf_from_dataframe(): there must be at least one complete row"
+
+    if weights is not None:
+        # Only the weights of the complete rows are validated (they must not all be 0)
+        weights = sample_weights(df[weights].to_numpy()[observed], int(observed.sum()))
+    #^ if
+    shape  = tuple( len(V) for V in alphabets )
+    counts = np.bincount( np.ravel_multi_index([ c[observed] for c in codes ], shape), weights=weights, minlength=int(np.prod(shape)) )
+    return counts.reshape(shape)/counts.sum(), alphabets
+#^ pdf_from_dataframe()
+
+def pid_from_dataframe(df, t, x, y, z, weights=None, cone_solver='ECOS', output=0, parallel='off', **solver_args):
+    """Computes the partial information decomposition of four columns of a DataFrame
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+        Args:
+             df: pandas.DataFrame - the observations
+
+             t, x, y, z: column labels of T, X, Y, and Z in df
+
+             weights: column label - as in pdf_from_dataframe()
+
+             cone_solver, output, parallel, **solver_args: as in pid()
+
+        Returns:
+                return_data: dictionary - as in pid()
+    """
+    pdf,alphabets = pdf_from_dataframe(df, t, x, y, z, weights)
+    return pid(pdf, cone_solver=cone_solver, output=output, parallel=parallel, alphabets=alphabets, **solver_args)
+#^ pid_from_dataframe()
+
+class Histogram_Accumulator():
+
+    """Streaming joint histogram of (T,X,Y,Z) samples
+
+    (c) Abdullah Makkeh, Dirk Oliver Theis
+
+    Permission to use and modify under Apache License version 2.0
+
+    Accumulates chunks of integer coded samples into a count tensor of
+    shape |T|x|X|x|Y|x|Z| in place, so the raw samples need not be kept.
+    Once weighted samples are added, the counts are float weight sums.
+
+    Methods:
+      add(t,x,y,z,weights=None)
+          Adds a chunk of samples to the counts
+      pdf()
+          Returns the empirical distribution of the samples added so far
+      pid(**kwargs)
+          Computes the partial information decomposition of pdf()
+    """
+    def __init__(self, n_T, n_X, n_Y, n_Z):
+        """
+        Args:
+            n_T, n_X, n_Y, n_Z: int - alphabet sizes, the samples of T are
+                                coded by 0..n_T-1, etc.
+        """
+        self.shape     = (int(n_T), int(n_X), int(n_Y), int(n_Z))
+        self.counts    = np.zeros(self.shape, dtype=np.int64)
+        self.n_samples = 0
+    #^ init()
+
+    def add(self, t, x, y, z, weights=None):
+        """Adds a chunk of samples to the counts
+
+        Args:
+            t, x, y, z: numpy.array - equal-length integer codes of the samples
+                        of T, X, Y, and Z
+
+            weights: numpy.array - nonnegative weight of each sample
+                     (default = None: all samples have weight 1)
+        """
+        codes = [ np.asarray(v).ravel() for v in (t, x, y, z) ]
+        assert all( len(v) == len(codes[0]) for v in codes ),          "MAXENT3D_PID.Histogram_Accumulator.add(t,x,y,z): t, x, y, and z must have the same length"
+        assert all( np.issubdtype(v.dtype, np.integer) for v in codes ), "MAXENT3D_PID.Histogram_Accumulator.add(t,x,y,z): samples must be integer codes"
+        weights = sample_weights(weights, len(codes[0]))
+        if len(codes[0]) == 0: return
+        if weights is not None and self.counts.dtype != np.float64:
+            self.counts = self.counts.astype(np.float64)
+        #^ if
+
+        # raises ValueError if a code is out of range
+        idx  = np.ravel_multi_index(codes, self.shape)
+        flat = self.counts.reshape(-1)
+        if len(idx) >= flat.size//8:
+            flat += np.bincount(idx, weights=weights, minlength=flat.size).astype(flat.dtype, copy=False)
+        elif weights is None:
+            # small chunk: do not allocate a full tensor
+            cells,cnt = np.unique(idx, return_counts=True)
+            flat[cells] += cnt
+        else:
+            np.add.at(flat, idx, weights)
+        #^ if
+        self.n_samples += len(idx)
+    #^ add()
+
+    def pdf(self):
+        """Returns the empirical distribution of the samples added so far
+
+        Returns:
+            numpy.array - distribution of shape |T|x|X|x|Y|x|Z|
+        """
+        assert self.counts.sum() > 0, "MAXENT3D_PID.Histogram_Accumulator.pdf(): no samples (of positive weight) were added"
+        return self.counts/self.counts.sum()
+    #^ pdf()
+
+    def pid(self, cone_solver='ECOS', output=0, parallel='off', **solver_args):
+        """Computes the partial information decomposition of pdf()
+
+        Args:
+            cone_solver, output, parallel, **solver_args: as in pid()
+
+        Returns:
+            return_data: dictionary - as in pid()
+        """
+        # integer counts are normalized by pid() itself
+        counts = self.counts if self.counts.dtype == np.int64 else self.pdf()
+        return pid(counts, cone_solver=cone_solver, output=output, parallel=parallel, **solver_args)
+    #^ pid()
+#^ class Histogram_Accumulator
+
+def pdf_from_memmap(t, x, y, z, dtype=None, alphabet_sizes=None, block_size=1048576):
+    """Computes the empirical distribution of (T,X,Y,Z) from samples on disk
+
+       (c) Abdullah Makkeh, Dirk Oliver Theis
+
+       Permission to use and modify under Apache License version 2.0
+
+       The samples are streamed block by block into a Histogram_Accumulator,
+       so only one block of each variable is in memory at a time.
+
+        Args:
+             t, x, y, z: numpy.array or string - integer codes of the samples
+                         of T, X, Y, and Z, either memory-mapped arrays (e.g.,
+                         numpy.load(file, mmap_mode='r')) or file names of .npy
+                         files or raw binary files
+
+             dtype: numpy.dtype - element type of raw binary files
+                    (default = None, only needed for raw binary files)
+
+             alphabet_sizes: tuple - (|T|,|X|,|Y|,|Z|)
+                             (default = None: determined by a first pass over
+                              the samples as the largest code + 1)
+
+             block_size: int - number of samples per block
+                         (default = 1048576)
+
+        Returns:
+            pdf: numpy.array - empirical distribution of shape |T|x|X|x|Y|x|Z|
+    """
+    samples = []
+    for v in (t, x, y, z):
+        if type(v) is str and v.endswith('.npy'):
+            v = np.load(v, mmap_mode='r')
+        elif type(v) is str:
+            assert dtype is not None, "MAXENT3D_PID.pdf_from_memmap(): dtype is needed to read raw binary files"
+            v = np.memmap(v, dtype=dtype, mode='r')
+        #^ if file
+        samples.append( v.reshape(-1) )
+    #^ for
+    n = len(samples[0])
+    assert all( len(v) == n for v in samples ), "MAXENT3D_PID.pdf_from_memmap(): t, x, y, and z must have the same length"
+
+    def blocks():
+        for i in range(0, n, block_size):
+            yield [ np.asarray(v[i:i+block_size]) for v in samples ]
+        #^ for
+    #^ blocks()
+
+    if alphabet_sizes is None:
+        # First pass: the largest code of each variable
+        alphabet_sizes = [0, 0, 0, 0]
+        for block in blocks():
+            for i,v in enumerate(block):
+                assert v.min() >= 0, "MAXENT3D_PID.pdf_from_memmap(): samples must be nonnegative integer codes"
+                alphabet_sizes[i] = max( alphabet_sizes[i], int(v.max()) + 1 )
+            #^ for
+        #^ for blocks
+    #^ if
+
+    acc = Histogram_Accumulator(*alphabet_sizes)
+    for block in blocks():
+        acc.add(*block)
+    #^ for blocks
+    return acc.pdf()
+#^ pdf_from_memmap()
+
 #EOF
@@ -0,0 +1,245 @@
+"""TRIVARIATE_BACKENDS.py -- Python Module
+
+Cone solvers for the programs of TRIVARIATE_SYN, TRIVARIATE_UNQ, and TRIVARIATE_QP
+
+The programs are built in the layout of ECOS:
+
+min c^T x  s.t.  A x = b,  h - G x in K
+
+where K is a product of a nonnegative cone, second-order cones, and
+exponential cones (in this order, cf. dims). A backend takes the program
+(c, G, h, dims, A, b) and returns the dictionary ecos.solve() would return:
+'x', 's', 'y', 'z' with c + A^T y + G^T z = 0, and an 'info' with
+'exitFlag' (0 optimal, 10 inaccurate, 1 primal and 2 dual infeasible,
+-1 iteration limit, -2 numerical problems), 'infostring', 'pcost',
+'dcost', 'pres', 'dres', 'gap', 'iter', and 'timing'.
+
+The backends ECOS, SCS, and Clarabel ship with the module; SCS and
+Clarabel are used only if they are installed. Further solvers are added by
+register_backend(). NumPy is not a backend: pid(cone_solver='NumPy')
+solves the maximum-entropy programs of TRIVARIATE_SYN and TRIVARIATE_UNQ
+by TRIVARIATE_MAXENT instead, other programs cannot be given to it.
+
+(c) Abdullah Makkeh, Dirk Oliver Theis
+
+Permission to use and modify under Apache License version 2.0
+"""
+import ecos
+from scipy import sparse
+import numpy as np
+import time
+try:
+    import scs
+except ImportError:
+    scs = None
+try:
+    import clarabel
+except ImportError:
+    clarabel = None
+
+# name -> (solve function, description for pid()'s return_data["Solver"], installed)
+backends = dict()
+
+# The parameters of pid() are named as for ECOS; the backends translate them
+ecos_only_args = ( 'feastol_inacc', 'abstol_inacc', 'reltol_inacc', 'max_iters', 'feastol', 'abstol', 'reltol', 'verbose' )
+
+def register_backend(name, solve_function, description=None, installed=True):
+    """Makes a cone solver available to pid(cone_solver=name)
+
+        Args:
+             name: string - name of the backend
+
+             solve_function: function - solve_function(c, G, h, dims, A, b, **solver_args)
+                             returns a dictionary as ecos.solve() does
+
+             description: string - as reported in return_data["Solver"] of pid()
+                          (default = None: the name)
+
+             installed: bool - False if the solver cannot be imported
+                        (default = True)
+    """
+    backends[name] = ( solve_function, description if description is not None else name, installed )
+#^ register_backend()
+
+def available_backends():
+    """Returns the names of the registered backends whose solver is installed"""
+    return [ name for name, backend in backends.items() if backend[2] ]
+#^ available_backends()
+
+def solve(cone_solver, c, G, h, dims, A=None, b=None, **solver_args):
+    """Solves a cone program in the layout of ECOS by the backend cone_solver
+
+        Args:
+             cone_solver: string - name of a registered backend
+
+             c, G, h, dims, A, b: the cone program (as for ecos.solve();
+                                  A and b may be omitted)
+
+             **solver_args: parameters of the solver (the ECOS names are
+                            translated by the backends)
+
+        Returns:
+            dictionary - as returned by ecos.solve()
+    """
+    assert cone_solver in available_backends(), "TRIVARIATE_BACKENDS.solve(): The cone solver "+str(cone_solver)+" is not available (available: "+", ".join(available_backends())+")"
+    return backends[cone_solver][0](c, G, h, dims, A, b, **solver_args)
+#^ solve()
+
+def solve_ecos(c, G, h, dims, A=None, b=None, **solver_args):
+    """Solves a cone program by ECOS (cf. solve())"""
+    if A is None or A.shape[0] == 0:
+        return ecos.solve(c, G, h, dims, **solver_args)
+    return ecos.solve(c, G, h, dims, A, b, **solver_args)
+#^ solve_ecos()
+
+def exp_cone_swap(dims, n_rows):
+    """Permutation of the rows of G which swaps the last two entries of each exponential cone
+
+        ECOS has the exponential cone { (x,y,z) | z exp(x/z) <= y }, SCS and
+        Clarabel have { (x,y,z) | y exp(x/y) <= z }. The permutation is its
+        own inverse; it is orthogonal, so it maps the dual cones likewise.
+
+        Args:
+             dims: dictionary - cones of the program (as for ecos.solve())
+
+             n_rows: int - number of rows of G
+
+        Returns:
+            numpy.array - the permutation
+    """
+    perm = np.arange(n_rows)
+    first = dims.get('l', 0) + sum(dims.get('q', []))
+    perm[first+1::3] = np.arange(first+2, n_rows, 3)
+    perm[first+2::3] = np.arange(first+1, n_rows, 3)
+    return perm
+#^ exp_cone_swap()
+
+def stacked(c, G, h, dims, A, b):
+    """Stacks the equations and the cone inequalities into one system (A;G) x + s = (b;h)
+
+        Args:
+             c, G, h, dims, A, b: the cone program (as for ecos.solve())
+
+        Returns:
+            M: scipy.sparse.csc_matrix - (A;G) with the exponential cones swapped
+
+            rhs: numpy.array - (b;h) with the exponential cones swapped
+
+            n_eq: int - number of equations
+
+            perm: numpy.array - cf. exp_cone_swap()
+    """
+    perm = exp_cone_swap(dims, G.shape[0])
+    if A is None:
+        A = sparse.csc_matrix((0, len(c)))
+        b = np.zeros(0)
+    #^ if no equations
+    M   = sparse.vstack([ A, G.tocsr()[perm] ]).tocsc()
+    rhs = np.concatenate(( b, h[perm] ))
+    return M, rhs, A.shape[0], perm
+#^ stacked()
+
+def normalized_solution(c, G, h, A, b, x, y, z, s, exitFlag, infostring, n_iter, runtime):
+    """Puts a solution into the form of ecos.solve()
+
+        Args:
+             c, G, h, A, b: the cone program (as for ecos.solve())
+
+             x, y, z, s: numpy.array - primal solution, duals of the
+                         equations and of the cones, slacks (ECOS layout)
+
+             exitFlag: int - cf. the module docstring
+
+             infostring: string - status reported by the solver
+
+             n_iter: int - number of iterations
+
+             runtime: float - solver time in secs
+
+        Returns:
+            dictionary - as returned by ecos.solve()
+    """
+    if A is None:
+        A = sparse.csc_matrix((0, len(c)))
+        b = np.zeros(0)
+    #^ if no equations
+    info = dict( exitFlag=exitFlag, infostring=infostring, iter=n_iter, timing={ 'runtime': runtime } )
+    info['pcost'] = np.dot(c, x)
+    info['dcost'] = -np.dot(b, y) - np.dot(h, z)
+    info['pres']  = max( np.max(np.abs(A.dot(x) - b), initial=0.), np.max(np.abs(G.dot(x) + s - h), initial=0.) )
+    info['dres']  = np.max(np.abs(c + A.T.dot(y) + G.T.dot(z)), initial=0.)
+    info['gap']   = np.dot(s, z)
+    return { 'x': x, 'y': y, 'z': z, 's': s, 'info': info }
+#^ normalized_solution()
+
+def solve_scs(c, G, h, dims, A=None, b=None, **solver_args):
+    """Solves a cone program by SCS (cf. solve())
+
+        The ECOS parameters feastol/abstol, reltol, and verbose are
+        translated, the other ECOS parameters are dropped (max_iters counts
+        interior-point iterations; the iteration limit of SCS is given by
+        scs_max_iters), the rest is passed to SCS.
+    """
+    settings = { k: v for k,v in solver_args.items() if k not in ecos_only_args and k != 'scs_max_iters' }
+    if 'scs_max_iters' in solver_args.keys(): settings['max_iters'] = solver_args['scs_max_iters']
+    if 'verbose' in solver_args.keys():   settings['verbose']   = bool(solver_args['verbose'])
+    if 'abstol' in solver_args.keys() or 'feastol' in solver_args.keys():
+        settings['eps_abs'] = min( solver_args.get('abstol', np.inf), solver_args.get('feastol', np.inf) )
+    if 'reltol' in solver_args.keys():    settings['eps_rel']   = solver_args['reltol']
+    settings.setdefault('verbose', False)
+
+    M, rhs, n_eq, perm = stacked(c, G, h, dims, A, b)
+    cone = { 'z': n_eq, 'l': dims.get('l', 0), 'q': list(dims.get('q', [])), 'ep': dims.get('e', 0) }
+    tic = time.process_time()
+    result = scs.SCS({ 'A': M, 'b': rhs, 'c': c }, cone, **settings).solve()
+    toc = time.process_time()
+    status = result['info']['status_val']
+    exitFlag = { 1: 0, 2: 10, -2: 1, -7: 1, -1: 2, -6: 2 }.get(status, -1 if result['info']['iter'] >= settings.get('max_iters', 100000) else -2)
+    y = result['y'][:n_eq]
+    z = result['y'][n_eq:][perm]
+    s = result['s'][n_eq:][perm]
+    return normalized_solution(c, G, h, A, b, result['x'], y, z, s, exitFlag, result['info']['status'], result['info']['iter'], toc - tic)
+#^ solve_scs()
+
+def solve_clarabel(c, G, h, dims, A=None, b=None, **solver_args):
+    """Solves a cone program by Clarabel (cf. solve())
+
+        The ECOS parameters max_iters, feastol, abstol, reltol, and verbose
+        are translated, the other ECOS parameters are dropped, the rest is
+        set on clarabel.DefaultSettings().
+    """
+    settings = clarabel.DefaultSettings()
+    settings.verbose = False
+    translate = { 'max_iters': 'max_iter', 'feastol': 'tol_feas', 'abstol': 'tol_gap_abs', 'reltol': 'tol_gap_rel', 'verbose': 'verbose' }
+    for k,v in solver_args.items():
+        if k in translate.keys():
+            setattr(settings, translate[k], bool(v) if k == 'verbose' else v)
+        elif k not in ecos_only_args and hasattr(settings, k):
+            setattr(settings, k, v)
+        #^ if
+    #^ for solver_args
+
+    M, rhs, n_eq, perm = stacked(c, G, h, dims, A, b)
+    cones = []
+    if n_eq > 0:            cones.append(clarabel.ZeroConeT(n_eq))
+    if dims.get('l', 0) > 0: cones.append(clarabel.NonnegativeConeT(dims['l']))
+    cones += [ clarabel.SecondOrderConeT(k) for k in dims.get('q', []) ]
+    cones += [ clarabel.ExponentialConeT() for i in range(dims.get('e', 0)) ]
+    P = sparse.csc_matrix((len(c), len(c)))
+    tic = time.process_time()
+    result = clarabel.DefaultSolver(P, c, M, rhs, cones, settings).solve()
+    toc = time.process_time()
+    status = str(result.status).split('.')[-1]
+    exitFlag = { 'Solved': 0, 'AlmostSolved': 10, 'PrimalInfeasible': 1, 'AlmostPrimalInfeasible': 1, 'DualInfeasible': 2, 'AlmostDualInfeasible': 2, 'MaxIterations': -1, 'MaxTime': -1 }.get(status, -2)
+    x = np.array(result.x)
+    y = np.array(result.z[:n_eq])
+    z = np.array(result.z[n_eq:])[perm]
+    s = np.array(result.s[n_eq:])[perm]
+    return normalized_solution(c, G, h, A, b, x, y, z, s, exitFlag, status, result.iterations, toc - tic)
+#^ solve_clarabel()
+
+register_backend('ECOS', solve_ecos, "ECOS http://www.embotech.com/ECOS")
+register_backend('SCS', solve_scs, "SCS https://github.com/cvxgrp/scs", installed=scs is not None)
+register_backend('Clarabel', solve_clarabel, "Clarabel https://github.com/oxfordcontrol/Clarabel.rs", installed=clarabel is not None)
+
+#EOF
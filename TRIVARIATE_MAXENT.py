@@ -0,0 +1,688 @@
+"""TRIVARIATE_MAXENT.py -- Python Module
+
+NumPy engine for the maximum-entropy programs of TRIVARIATE_SYN and TRIVARIATE_UNQ
+
+The programs
+
+min -H(S|XYZ), min -H(S|XY), min -H(S|XZ) and min -H(S|YZ)
+
+are of the form: min sum_b sum_{i in b} q_i ln(q_i/q_b) over the cells i
+(the quadruples (s,x,y,z), resp. the triplets (s,u,v)) subject to the
+marginal equations, where q_b is the mass of the block b of cell i (its
+(x,y,z), resp. (u,v)). The dual program
+
+max sum_k P_k theta_k  s.t.  g_b(theta) = ln sum_{i in b} exp(phi_i) <= 0 for all blocks b
+
+with phi_i = sum_k theta_k[cell i] has one variable per marginal cell (s,x),
+(s,y), (s,z), so it is small, and smooth. It is solved by a few iterative
+scaling sweeps (which give a starting point) followed by Newton steps on the
+log-barrier of the dual (the systems are of the size of the marginals, not
+of the support). The optimal distribution is q_i = s_b exp(phi_i)/Z_b where
+s_b = mu/(-g_b) is the block mass.
+
+The result is put into the layout of the cone programs of create_model()
+(primal and dual vectors as returned by ecos.solve()), so that
+check_feasibility() and dual_value() certify it as for ECOS. The dual
+vector is feasible by construction; the duality gap and the violation of
+the marginal equations are the numerical errors.
+
+(c) Abdullah Makkeh, Dirk Oliver Theis
+
+Permission to use and modify under Apache License version 2.0
+"""
+from scipy import sparse
+from scipy import linalg as sla
+import numpy as np
+import warnings
+import time
+
+def incidence(families, sizes):
+    """Matrix of the marginal equations of the cells
+
+        Args:
+             families: list(numpy.array) - for each marginal, the position of the
+                       marginal cell of each cell
+
+             sizes: list(int) - number of marginal cells of each marginal
+
+        Returns:
+            scipy.sparse.csr_matrix - M with M[i,j] = 1 iff marginal cell j
+                                      (numbered through the marginals) is the
+                                      one of cell i
+    """
+    n    = len(families[0])
+    offs = np.concatenate(( [0], np.cumsum(sizes) ))
+    cols = np.stack([ f + offs[k] for k,f in enumerate(families) ], axis=1).ravel()
+    return sparse.csr_matrix( (np.ones(len(cols)), cols, np.arange(0, len(cols)+1, len(families))), shape=(n, int(offs[-1])) )
+#^ incidence()
+
+def gauge_columns(t_of, sizes):
+    """Columns of the dual variables kept in the Newton systems
+
+        phi only depends on theta up to shifting theta_k[s,.] by c_s and
+        theta_l[s,.] by -c_s; the first marginal cell of each s of the
+        marginals k >= 1 is fixed to remove these directions.
+
+        Args:
+             t_of: list(numpy.array) - for each marginal, the s of its cells
+
+             sizes: list(int) - number of marginal cells of each marginal
+
+        Returns:
+            numpy.array - bool mask of the kept columns
+    """
+    keep = np.ones(int(np.sum(sizes)), dtype=bool)
+    off  = sizes[0]
+    for k in range(1, len(sizes)):
+        first = np.unique(t_of[k], return_index=True)[1]
+        keep[off + first] = False
+        off += sizes[k]
+    #^ for marginals
+    return keep
+#^ gauge_columns()
+
+def scaling(block, n_blocks, families, P, sweeps):
+    """Iterative scaling for min sum_b sum_{i in b} q_i ln(q_i/q_b) over the marginal equations
+
+        Alternates between fitting the marginals (one sweep of iterative
+        proportional fitting of q_i = s_b exp(phi_i)) and setting s_b to the
+        block mass. Converges slowly where blocks lose their mass, but is a
+        cheap starting point for the Newton steps.
+
+        Args:
+             block: numpy.array - the block of each cell
+
+             n_blocks: int - number of blocks
+
+             families, P: list(numpy.array) - the position of the marginal
+                          cell of each cell, and the marginals (one per marginal)
+
+             sweeps: int - number of sweeps
+
+        Returns:
+            list(numpy.array) - the scaling factors theta (logarithms)
+    """
+    theta = [ np.zeros(len(p)) for p in P ]
+    ls    = np.full(n_blocks, -np.log(n_blocks))
+    lP    = [ np.log(p) for p in P ]
+    for sweep in range(sweeps):
+        for k,f in enumerate(families):
+            e = ls[block] + sum( theta[l][families[l]] for l in range(len(families)) if l != k )
+            theta[k] += lP[k] - np.log(np.bincount(f, weights=np.exp(e + theta[k][f]), minlength=len(P[k])))
+        #^ for marginals
+        phi = sum( theta[k][f] for k,f in enumerate(families) )
+        ls += np.log(np.bincount(block, weights=np.exp(phi), minlength=n_blocks))
+    #^ for sweeps
+    return theta
+#^ scaling()
+
+def barrier_newton(block, n_blocks, families, P, t_of, gap_tol, feas_tol, max_iters, sweeps, output=0):
+    """Newton steps on the log-barrier of the dual, started by iterative scaling
+
+        Args: as for solve_dual()
+
+        Returns:
+            theta: numpy.array - the dual variables (all marginals), strictly feasible
+
+            q: numpy.array - the distribution on the cells (of the last barrier parameter)
+
+            it: int - number of Newton steps
+
+            exitFlag, infostring: cf. solve_dual()
+    """
+    sizes = [ len(p) for p in P ]
+    M     = incidence(families, sizes)
+    MT    = M.T.tocsr()
+    S     = sparse.csr_matrix( (np.ones(len(block)), block, np.arange(len(block)+1)), shape=(len(block), n_blocks) ).T.tocsr()
+    keep  = gauge_columns(t_of, sizes)
+    Pall  = np.concatenate(P)
+
+    def state(theta_all):
+        phi = M.dot(theta_all)
+        ephi = np.exp(phi)
+        Z   = np.bincount(block, weights=ephi, minlength=n_blocks)
+        return phi, ephi, Z
+    #^ state()
+
+    # Starting point: iterative scaling, shifted into the interior
+    theta = np.concatenate(scaling(block, n_blocks, families, P, sweeps))
+    phi, ephi, Z = state(theta)
+    theta[:sizes[0]] -= np.log(Z.max()) + 1.e-3
+    phi, ephi, Z = state(theta)
+    g   = np.log(Z)
+    pi  = ephi/Z[block]
+    # Barrier parameter such that the block masses mu/(-g_b) sum up to 1
+    mu  = 1./np.sum(1./(-g))
+
+    exitFlag, infostring = -1, "Maximum number of iterations reached"
+    for it in range(max_iters):
+        s    = mu/(-g)
+        q    = s[block]*pi
+        grad = MT.dot(q) - Pall                        # of mu*sum -ln(-g_b) - P'theta
+        pres = np.abs(grad).max()
+        if mu*n_blocks <= gap_tol and pres <= feas_tol:
+            exitFlag, infostring = 0, "Optimal solution found"
+            break
+        #^ if converged
+
+        # Hessian M' diag(q) M + V' diag(s^2/mu - s) V with V = S diag(pi) M
+        V = S.dot(M.multiply(pi[:,None]).tocsr())
+        H = MT.dot(M.multiply(q[:,None])) + V.T.dot(V.multiply(((s*s)/mu - s)[:,None]))
+        H = H.toarray()[np.ix_(keep,keep)]
+        try:
+            d = sla.solve(H + 1.e-14*np.abs(np.diag(H)).max()*np.eye(len(H)), -grad[keep], assume_a='pos')
+        except (sla.LinAlgError, ValueError):
+            exitFlag, infostring = -2, "Newton system singular"
+            break
+        #^ try
+        step = np.zeros(len(theta))
+        step[keep] = d
+        decrement = -np.dot(grad[keep], d)
+
+        # Backtracking: stay in the interior, decrease the barrier function; where
+        # the decrease is below the rounding errors of F, decrease the residual instead
+        F0 = -np.dot(Pall, theta) - mu*np.sum(np.log(-g))
+        by_residual = decrement <= 1.e-11*max(1., abs(F0))
+        alpha = 1.
+        while alpha > 1.e-12:
+            phi_a, ephi_a, Z_a = state(theta + alpha*step)
+            if np.all(Z_a < 1.):
+                g_a = np.log(Z_a)
+                if by_residual:
+                    q_a = (mu/(-g_a))[block]*ephi_a/Z_a[block]
+                    if np.abs(MT.dot(q_a) - Pall).max() <= (1. - 0.1*alpha)*pres: break
+                elif -np.dot(Pall, theta + alpha*step) - mu*np.sum(np.log(-g_a)) <= F0 - 0.25*alpha*decrement: break
+            #^ if interior
+            alpha /= 2.
+        #^ while
+        if alpha <= 1.e-12:
+            if not by_residual:
+                exitFlag, infostring = -2, "Line search failed"
+                break
+            #^ if not at the rounding errors
+        else:
+            theta += alpha*step
+            phi, ephi, Z = phi_a, ephi_a, Z_a
+            g  = np.log(Z)
+            pi = ephi/Z[block]
+        #^ if step
+        if by_residual and alpha < 1.e-3 and mu*n_blocks <= gap_tol:
+            exitFlag, infostring = 10, "Stalled at the rounding errors"
+            break
+        #^ if nothing left to gain
+        if output == 2: print("TRIVARIATE_MAXENT.solve_dual(): iteration", it, "mu", mu, "residual", pres, "decrement", decrement, "step", alpha)
+
+        # Centred enough (Newton decrement of the barrier function over mu): decrease the barrier parameter
+        if decrement < 0.5*mu or alpha <= 1.e-12:
+            mu = max( mu/30., 0.1*gap_tol/n_blocks )
+        #^ if centred
+    #^ for Newton steps
+
+    return theta, (mu/(-g))[block]*pi, it, exitFlag, infostring
+#^ barrier_newton()
+
+def active_set_newton(block, n_blocks, families, P, t_of, theta, s, feas_tol, max_iters, output=0):
+    """Newton steps on the optimality conditions, started at a nearby optimum (warm start)
+
+        The optimality conditions are M'q = P with q_i = s_b pi_i, and
+        min(s_b, -g_b(theta)) = 0 for all blocks. Each step guesses the
+        blocks with mass (s_b > -g_b), and is the Newton step of M'q = P,
+        g_b = 0 for these blocks and s_b = 0 for the others (semismooth
+        Newton, i.e., a primal-dual active set method), with backtracking
+        on the residual.
+
+        Args:
+             block, n_blocks, families, P, t_of, feas_tol, max_iters, output: as for solve_dual()
+
+             theta: numpy.array - dual variables of the start (all marginals)
+
+             s: numpy.array - block masses of the start
+
+        Returns:
+            (theta, q, it) as for barrier_newton() (theta feasible), or None
+            if the residual does not vanish
+    """
+    sizes = [ len(p) for p in P ]
+    M     = incidence(families, sizes)
+    MT    = M.T.tocsr()
+    S     = sparse.csr_matrix( (np.ones(len(block)), block, np.arange(len(block)+1)), shape=(len(block), n_blocks) ).T.tocsr()
+    keep  = gauge_columns(t_of, sizes)
+    Pall  = np.concatenate(P)
+
+    def residual(theta, s):
+        ephi = np.exp(M.dot(theta))
+        Z    = np.bincount(block, weights=ephi, minlength=n_blocks)
+        g    = np.log(Z)
+        pi   = ephi/Z[block]
+        q    = s[block]*pi
+        return np.concatenate(( (MT.dot(q) - Pall)[keep], np.minimum(s, -g) )), g, pi, q
+    #^ residual()
+
+    theta = np.array(theta, dtype=np.double)
+    s     = np.array(s, dtype=np.double)
+    if not np.all(np.isfinite(theta)) or not np.all(np.isfinite(s)): return None
+    r, g, pi, q = residual(theta, s)
+    res = np.abs(r).max()
+    it  = 0
+    while res > 1.e-3*feas_tol:
+        if it >= max_iters: return None
+        active = s > -g
+        # Jacobian [ M'diag(q)M - V'diag(s)V, V_a' ; V_a, 0 ] with V = S diag(pi) M; s_b = 0 off the active blocks
+        V   = S.dot(M.multiply(pi[:,None]).tocsr())
+        J11 = (MT.dot(M.multiply(q[:,None])) - V.T.dot(V.multiply(s[:,None]))).toarray()[np.ix_(keep,keep)]
+        J12 = V[np.nonzero(active)[0]].toarray()[:,keep].T
+        J   = np.block([ [ J11, J12 ], [ J12.T, np.zeros((J12.shape[1], J12.shape[1])) ] ])
+        rhs = np.concatenate(( -r[:len(J11)] + V.T.dot(np.where(active, 0., s))[keep], -g[active] ))
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error', sla.LinAlgWarning)
+                directions = [ sla.solve(J, rhs, assume_a='sym') ]
+            #^ with
+        except (sla.LinAlgError, sla.LinAlgWarning, ValueError):
+            directions = []
+        #^ try
+
+        # Backtracking on the residual; where the guess leaves the Jacobian (nearly)
+        # singular, along the least squares direction of its well-conditioned part
+        for k in range(2):
+            if k == len(directions): directions.append( sla.lstsq(J, rhs, cond=1.e-10)[0] )
+            step_theta = np.zeros(len(theta))
+            step_theta[keep] = directions[k][:len(J11)]
+            step_s = -s.copy()
+            step_s[active] = directions[k][len(J11):]
+            alpha = 1.
+            while alpha > 1.e-4:
+                r_a, g_a, pi_a, q_a = residual(theta + alpha*step_theta, s + alpha*step_s)
+                if np.abs(r_a).max() <= (1. - 0.1*alpha)*res: break
+                alpha /= 2.
+            #^ while
+            if alpha > 1.e-4: break
+        #^ for directions
+        if alpha <= 1.e-4: return None
+        theta += alpha*step_theta
+        s     += alpha*step_s
+        r, g, pi, q = r_a, g_a, pi_a, q_a
+        res = np.abs(r).max()
+        it += 1
+        if output == 2: print("TRIVARIATE_MAXENT.active_set_newton(): iteration", it, "residual", res, "step", alpha, "blocks with mass", int(active.sum()))
+    #^ while not solved
+
+    # Strictly feasible dual, nonnegative masses
+    theta[:sizes[0]] -= max( g.max(), 0. )
+    return theta, np.maximum(s, 0.)[block]*pi, it
+#^ active_set_newton()
+
+def solve_dual(block, n_blocks, families, P, t_of, gap_tol=1.e-8, feas_tol=1.e-8, max_iters=100, sweeps=10, polish=5, warm=None, output=0):
+    """Solves the dual of min sum_b sum_{i in b} q_i ln(q_i/q_b) over the marginal equations
+
+        Args:
+             block: numpy.array - the block of each cell
+
+             n_blocks: int - number of blocks
+
+             families: list(numpy.array) - for each marginal, the position of
+                       the marginal cell of each cell
+
+             P: list(numpy.array) - the marginals (positive)
+
+             t_of: list(numpy.array) - for each marginal, the s of its cells
+
+             gap_tol: float - duality gap (in nats) at which the barrier is small enough
+                      (default = 1.e-8)
+
+             feas_tol: float - violation of the marginal equations at which the
+                       Newton steps stop (default = 1.e-8)
+
+             max_iters: int - maximal number of Newton steps (default = 100)
+
+             sweeps: int - number of iterative scaling sweeps before (default = 10)
+
+             polish: int - number of iterative proportional fitting sweeps on
+                     the distribution after (default = 5)
+
+             warm: tuple - (theta, s) the dual variables (all marginals) and
+                   the block masses of a nearby optimum, or None (default):
+                   if given, active_set_newton() is tried first
+
+             output: int - print different outputs based on (int) to console
+
+        Returns:
+            theta: list(numpy.array) - optimal dual variables, one per marginal
+                   cell (strictly feasible: g_b < 0 for all blocks)
+
+            q: numpy.array - the distribution on the cells
+
+            info: dictionary - 'exitFlag' (0 optimal, 10 inaccurate, -1
+                  iteration limit, -2 numerical problems), 'infostring',
+                  'iter', 'pcost', 'dcost', 'gap', 'pres', 'warm_start' (True
+                  if the warm start was successful)
+    """
+    sizes = [ len(p) for p in P ]
+    MT    = incidence(families, sizes).T.tocsr()
+    Pall  = np.concatenate(P)
+    result = None
+    if warm is not None:
+        result = active_set_newton(block, n_blocks, families, P, t_of, warm[0], warm[1], feas_tol, max_iters, output)
+        if result is None and output > 0: print("TRIVARIATE_MAXENT.solve_dual(): The warm start failed, solving from scratch")
+    #^ if warm start
+    if result is not None:
+        theta, q, it = result
+        exitFlag, infostring = 0, "Optimal solution found"
+    else:
+        theta, q, it, exitFlag, infostring = barrier_newton(block, n_blocks, families, P, t_of, gap_tol, feas_tol, max_iters, sweeps, output)
+    #^ if warm started
+
+    # Polish: fit the marginals of q by iterative proportional fitting (changes the objective by the order of the residual)
+    for sweep in range(polish):
+        for k,f in enumerate(families):
+            q *= (P[k]/np.bincount(f, weights=q, minlength=len(P[k])))[f]
+        #^ for marginals
+    #^ for sweeps
+    q_b   = np.bincount(block, weights=q, minlength=n_blocks)
+    pos   = q > 0
+    pcost = np.sum( q[pos]*np.log(q[pos]/q_b[block[pos]]) )
+    dcost = np.dot(Pall, theta)
+    info  = dict( iter=it, pcost=pcost, dcost=dcost, gap=pcost - dcost, pres=np.abs(MT.dot(q) - Pall).max() )
+    if info['pres'] <= feas_tol and info['gap'] <= gap_tol:
+        exitFlag, infostring = 0, "Optimal solution found"
+    elif exitFlag == 0 or exitFlag == 10:
+        exitFlag, infostring = 10, "Close to optimal solution found"
+    #^ if certified
+    info['exitFlag'], info['infostring'] = exitFlag, infostring
+    info['warm_start'] = result is not None
+    theta = np.split(theta, np.cumsum(sizes)[:-1])
+    return theta, q, info
+#^ solve_dual()
+
+def recoded(values, old, new):
+    """Moves an array over the codes of some alphabets to the codes of others
+
+        Args:
+             values: numpy.array - indexed by the codes of the alphabets old
+                     (one axis per alphabet)
+
+             old, new: list(list) - the symbols of the codes, one list per axis
+
+        Returns:
+            numpy.array - indexed by the codes of the alphabets new; NaN
+                          where a symbol is not in old
+    """
+    index = []
+    for o, n in zip(old, new):
+        position = { symbol: i for i, symbol in enumerate(o) }
+        index.append( np.array([ position.get(symbol, -1) for symbol in n ], dtype=np.int64) )
+    #^ for axes
+    out = np.asarray(values, dtype=np.double)[np.ix_(*[ np.maximum(i, 0) for i in index ])]
+    missing = np.zeros(out.shape, dtype=bool)
+    for k, i in enumerate(index):
+        missing |= (i < 0).reshape([ -1 if l == k else 1 for l in range(len(index)) ])
+    #^ for axes
+    out[missing] = np.nan
+    return out
+#^ recoded()
+
+def warm_start_syn(self, sol_rpq, sol_lambda):
+    """The data of an optimal solution of min -H(S|X,Y,Z) for a warm start
+
+        Args:
+             sol_rpq, sol_lambda: numpy.array - primal and equality dual
+                                  optimal solution (layout of
+                                  TRIVARIATE_SYN.create_model())
+
+        Returns:
+            dictionary - 'theta': the dual variables of the marginal equations
+                         of (S,X), (S,Y), (S,Z) as arrays of the shapes of the
+                         marginals (NaN where P = 0), 'mass': the
+                         (X,Y,Z)-marginal of the optimal distribution
+    """
+    n     = len(self.support)
+    margs = ( self.P_tx, self.P_ty, self.P_tz )
+    offs  = n + np.cumsum([ 0 ] + [ int(np.count_nonzero(marg)) for marg in margs ])
+    theta = []
+    for k, marg in enumerate(margs):
+        th = np.full(marg.shape, np.nan)
+        th[marg > 0] = -sol_lambda[offs[k]:offs[k+1]]
+        theta.append(th)
+    #^ for marginals
+    xyz, block = self.support.project((1,2,3))
+    mass = np.zeros(self.support.shape[1:])
+    mass[tuple(xyz.columns)] = np.bincount(block, weights=sol_rpq[2::3], minlength=len(xyz))
+    return dict( theta=theta, mass=mass )
+#^ warm_start_syn()
+
+def warm_start_unq(self, which_sources, sol_rpq, sol_lambda):
+    """The data of an optimal solution of min -H(S|U,V) for a warm start
+
+        The dual variables of the marginal equations of (S,W) (W the third
+        source) do not depend on w at an optimum; they are moved to those
+        of (S,U).
+
+        Args:
+             which_sources: list(int) - [1,2], [1,3], or [2,3]
+
+             sol_rpq, sol_lambda: numpy.array - primal and equality dual
+                                  optimal solution (layout of
+                                  TRIVARIATE_UNQ.create_model())
+
+        Returns:
+            dictionary - 'theta': the dual variables of the marginal equations
+                         of (S,U), (S,V) as arrays of the shapes of the
+                         marginals (NaN where P = 0), 'mass': the
+                         (U,V)-marginal of the optimal distribution
+    """
+    trips,trip_of_quad = self.initialization(which_sources)
+    n     = len(trips)
+    margs = ( self.P_tx, self.P_ty, self.P_tz )
+    offs  = 2*n + np.cumsum([ 0 ] + [ int(np.count_nonzero(marg)) for marg in margs ])
+    lam   = [ sol_lambda[offs[k]:offs[k+1]] for k in range(3) ]
+    i_u, i_v = which_sources[0] - 1, which_sources[1] - 1
+    i_w   = 3 - i_u - i_v
+    t_w   = np.nonzero(margs[i_w] > 0)[0]
+    lam_w = np.bincount(t_w, weights=lam[i_w], minlength=margs[i_w].shape[0])/np.maximum(np.bincount(t_w, minlength=margs[i_w].shape[0]), 1)
+    theta = []
+    for k, shift in ( (i_u, lam_w), (i_v, 0.) ):
+        th = np.full(margs[k].shape, np.nan)
+        th[margs[k] > 0] = -lam[k] - (shift[np.nonzero(margs[k] > 0)[0]] if k == i_u else 0.)
+        theta.append(th)
+    #^ for sources
+    uv, block = trips.project((1,2))
+    mass = np.zeros(( self.support.shape[which_sources[0]], self.support.shape[which_sources[1]] ))
+    mass[tuple(uv.columns)] = np.bincount(block, weights=sol_rpq[2:3*n:3], minlength=len(uv))
+    return dict( theta=theta, mass=mass )
+#^ warm_start_unq()
+
+def warm_point(self, previous, data, margs, axes, blocks):
+    """The start of active_set_newton() from the data of an earlier pid() call
+
+        The data are moved to the codes of this pdf by the symbols; a
+        marginal cell which is new gets the smallest dual variable of its
+        marginal, a block which is new has no mass.
+
+        Args:
+             previous: dictionary - return_data["Warm_start"] of the earlier call
+
+             data: dictionary - its entry of the program (cf. warm_start_syn())
+
+             margs: list(numpy.array) - the marginals of the program (this pdf)
+
+             axes: list(int) - the source (1, 2, or 3) of each marginal
+
+             blocks: tuple(numpy.array) - the codes of the blocks, one array
+                     per source of axes
+
+        Returns:
+            tuple - (theta, s) as for active_set_newton(), or None
+    """
+    old, new = previous['alphabets'], self.alphabets
+    theta = []
+    for marg, k, th in zip(margs, axes, data['theta']):
+        v = recoded(th, [ old[0], old[k] ], [ new[0], new[k] ])[marg > 0]
+        if np.all(np.isnan(v)): return None
+        v[np.isnan(v)] = np.nanmin(v)
+        theta.append(v)
+    #^ for marginals
+    mass = recoded(data['mass'], [ old[k] for k in axes ], [ new[k] for k in axes ])[blocks]
+    mass[np.isnan(mass)] = 0.
+    return np.concatenate(theta), mass
+#^ warm_point()
+
+def engine_parameters(solver_args):
+    """Translates the parameters of pid() (named as for ECOS) into those of solve_dual()
+
+        abstol is the duality gap, feastol the violation of the marginal
+        equations, max_iters the number of Newton steps; sweeps and polish
+        are passed on, verbose prints the Newton steps, the rest is dropped.
+
+        Args:
+             solver_args: dictionary - parameters of pid()
+
+        Returns:
+            dictionary - keyword arguments of solve_dual()
+    """
+    translate = { 'abstol': 'gap_tol', 'feastol': 'feas_tol', 'max_iters': 'max_iters', 'sweeps': 'sweeps', 'polish': 'polish' }
+    parameters = { translate[k]: v for k,v in solver_args.items() if k in translate.keys() }
+    if solver_args.get('verbose', False): parameters['output'] = 2
+    return parameters
+#^ engine_parameters()
+
+def solve_syn(self, output=0, **solver_args):
+    """Solves min -H(S|X,Y,Z) (cf. TRIVARIATE_SYN.create_model()) by solve_dual()
+
+        The cells are the quadruples, the blocks their (x,y,z). With
+        pi_i = exp(phi_i)/Z_b, the dual vector is y = (-pi, -theta): the
+        dual inequality of quad i in check_feasibility() is
+        phi_i - ln pi_i = ln Z_b <= 0.
+
+        Args:
+             output: int - print different outputs based on (int) to console
+
+             **solver_args: parameters of pid() (cf. engine_parameters())
+
+        Returns:
+            dictionary - as ecos.solve() returns for the program of
+                         TRIVARIATE_SYN.create_model() (standard layout)
+    """
+    n = len(self.support)
+    t,x,y,z = ( np.asarray(v, dtype=np.int64) for v in self.support.columns )
+    xyz, block = self.support.project((1,2,3))
+    families = [ self.rank_tx[t,x], self.rank_ty[t,y], self.rank_tz[t,z] ]
+    P    = [ marg[marg > 0] for marg in (self.P_tx, self.P_ty, self.P_tz) ]
+    t_of = [ np.nonzero(marg > 0)[0] for marg in (self.P_tx, self.P_ty, self.P_tz) ]
+
+    tic = time.process_time()
+    warm = None
+    if self.warm_start is not None and 'I' in self.warm_start.keys():
+        warm = warm_point(self, self.warm_start, self.warm_start['I'], (self.P_tx, self.P_ty, self.P_tz), (1,2,3), tuple(xyz.columns))
+    #^ if warm start
+    theta, q, info = solve_dual(block, len(xyz), families, P, t_of, warm=warm, **engine_parameters(solver_args))
+    phi   = sum( theta[k][f] for k,f in enumerate(families) )
+    ln_pi = phi - np.log(np.bincount(block, weights=np.exp(phi), minlength=len(xyz)))[block]
+    q_b   = np.bincount(block, weights=q, minlength=len(xyz))[block]
+
+    # Primal: (r_i, p_i, q_i) with r_i = q_i ln(p_i/q_i), p_i = q_{*xyz}; the slack of G = -I is x
+    sol = np.empty(3*n)
+    pos = q > 0
+    sol[0::3] = 0.
+    sol[0::3][pos] = -q[pos]*np.log(q[pos]/q_b[pos])
+    sol[1::3] = q_b
+    sol[2::3] = q
+
+    # Dual: z = c + A'y = (-1, pi_i, -1 - phi_i) per cone
+    lam = np.concatenate(( -np.exp(ln_pi), -np.concatenate(theta) ))
+    mu  = np.empty(3*n)
+    mu[0::3] = -1.
+    mu[1::3] = np.exp(ln_pi)
+    mu[2::3] = -1. - phi
+    toc = time.process_time()
+
+    info['dres']   = 0.
+    info['timing'] = { 'runtime': toc - tic }
+    if output == 2: print("TRIVARIATE_MAXENT.solve_syn(): Time to solve [min - H(S|X,Y,Z)]:", toc - tic, "secs", info['infostring'])
+    return { 'x': sol, 's': sol.copy(), 'y': lam, 'z': mu, 'info': info }
+#^ solve_syn()
+
+def solve_unq(self, which_sources, output=0, **solver_args):
+    """Solves min -H(S|U,V) (cf. TRIVARIATE_UNQ.create_model()) by solve_dual()
+
+        The objective only depends on the triplets (s,u,v), and the third
+        source W only enters the marginal equations of (S,W), so the
+        optimal distribution is q_{suvw} = q_{suv} P(w|s): the cells are the
+        triplets whose (u,v) has P(u,v) > 0 (the others are 0), the blocks
+        their (u,v), and the marginals those of (S,U) and (S,V).
+
+        Args:
+             which_sources: list(int) - [1,2], [1,3], or [2,3]
+
+             output: int - print different outputs based on (int) to console
+
+             **solver_args: parameters of pid() (cf. engine_parameters())
+
+        Returns:
+            dictionary - as ecos.solve() returns for the program of
+                         TRIVARIATE_UNQ.create_model()
+    """
+    trips,trip_of_quad = self.initialization(which_sources)
+    n       = len(trips)
+    n_quads = len(self.support)
+    tt,uu,vv = ( np.asarray(v, dtype=np.int64) for v in trips.columns )
+    margs = ( self.P_tx, self.P_ty, self.P_tz )
+    ranks = ( self.rank_tx, self.rank_ty, self.rank_tz )
+    i_u, i_v = which_sources[0] - 1, which_sources[1] - 1
+    i_w = 3 - i_u - i_v
+    if which_sources == [1,2]:   b_uv = self.P_xy
+    elif which_sources == [1,3]: b_uv = self.P_xz
+    else:                        b_uv = self.P_yz
+    uv, block = trips.project((1,2))
+    allowed  = b_uv[uv.columns[0], uv.columns[1]] > 0
+    cell     = allowed[block]
+    renumber = np.cumsum(allowed) - 1
+    families = [ ranks[i_u][tt,uu], ranks[i_v][tt,vv] ]
+
+    tic = time.process_time()
+    warm = None
+    if self.warm_start is not None and tuple(which_sources) in self.warm_start.keys():
+        warm = warm_point(self, self.warm_start, self.warm_start[tuple(which_sources)], (margs[i_u], margs[i_v]), tuple(which_sources), tuple( c[allowed] for c in uv.columns ))
+    #^ if warm start
+    theta, q_cell, info = solve_dual(renumber[block[cell]], int(allowed.sum()), [ f[cell] for f in families ],
+                                     [ margs[i][margs[i] > 0] for i in (i_u, i_v) ], [ np.nonzero(margs[i] > 0)[0] for i in (i_u, i_v) ],
+                                     warm=warm, **engine_parameters(solver_args))
+    q = np.zeros(n)
+    q[cell] = q_cell
+    phi   = theta[0][families[0]] + theta[1][families[1]]
+    ln_Z  = np.log(np.bincount(block, weights=np.exp(phi), minlength=len(uv)))
+    ln_pi = phi - ln_Z[block]
+    q_b   = np.bincount(block, weights=q, minlength=len(uv))[block]
+
+    # Primal: (r_j, p_j, w_j) = (q_suv ln(q_uv/q_suv), q_uv, q_suv), and q_suvw = q_suv P(s,w)/P(s)
+    t_q = np.asarray(self.support.columns[0], dtype=np.int64)
+    w_q = np.asarray(self.support.columns[i_w + 1], dtype=np.int64)
+    P_w = margs[i_w]
+    sol = np.zeros(3*n + n_quads)
+    pos = q > 0
+    sol[0:3*n:3][pos] = -q[pos]*np.log(q[pos]/q_b[pos])
+    sol[1:3*n:3] = q_b
+    sol[2:3*n:3] = q
+    sol[3*n:]    = q[trip_of_quad]*P_w[t_q,w_q]/P_w.sum(axis=1)[t_q]
+
+    # Dual: on the blocks with P(u,v) > 0, nu_j = 1 + ln pi_j and mu_j = -pi_j, so that the
+    # dual of q_suvw is -ln Z_b >= 0; on the others nu_j = phi_j + a and mu_j = -exp(phi_j + a - 1)
+    # with a in [0,1] as large as possible such that a >= Z_b exp(a - 1)
+    a   = np.clip(1. - ln_Z, 0., 1.)[block]
+    nu  = np.where(cell, 1. + ln_pi, phi + a)
+    mu  = np.where(cell, -np.exp(ln_pi), -np.exp(phi + a - 1.))
+    lam = [ np.zeros(len(marg[marg > 0])) for marg in margs ]
+    lam[i_u], lam[i_v] = -theta[0], -theta[1]
+    z_q = np.where(cell, -ln_Z[block], a)[trip_of_quad]
+    z_cone = np.empty(3*n)
+    z_cone[0::3] = -1.
+    z_cone[1::3] = -mu
+    z_cone[2::3] = -nu
+    toc = time.process_time()
+
+    info['dres']   = 0.
+    info['timing'] = { 'runtime': toc - tic }
+    if output == 2: print("TRIVARIATE_MAXENT.solve_unq(): Time to solve [min -H(S|"+"XYZ"[i_u]+","+"XYZ"[i_v]+")]:", toc - tic, "secs", info['infostring'])
+    return { 'x': sol, 's': np.concatenate(( sol[3*n:], sol[:3*n] )), 'y': np.concatenate([ nu, mu ] + lam), 'z': np.concatenate(( z_q, z_cone )), 'info': info }
+#^ solve_unq()
+
+#EOF
@@ -0,0 +1,351 @@
+"""TRIVARIATE_PRESOLVE.py -- Python Module
+
+Presolve for the exponential Cone Programs of TRIVARIATE_SYN and TRIVARIATE_UNQ
+
+The programs:
+
+min -H(S|XYZ), min -H(S|XY), min -H(S|XZ) and min -H(S|YZ)
+
+fall apart into independent programs when the support graph (quadruples
+linked by shared marginal cells, coupling equations, and cones) is not
+connected. The components are solved separately and their solutions are
+put back into the layout of the whole program.
+
+Before that, the variables pinned by the equations are fixed: a marginal
+cell with a single quadruple of the support (e.g., a (t,x) with exactly one
+compatible (y,z)) fixes that q, a coupling equation whose q are all fixed
+fixes its p (or w), and a cone whose p and q are fixed is evaluated in
+closed form. Fixed variables and their cones never reach ECOS.
+
+(c) Abdullah Makkeh, Dirk Oliver Theis
+
+Permission to use and modify under Apache License version 2.0
+"""
+import TRIVARIATE_BACKENDS
+from scipy import sparse
+from scipy.sparse import csgraph
+import numpy as np
+import time
+
+def components(G, dims, A):
+    """Finds the independent blocks of a cone program
+
+        The variables are linked by the rows of A, by the rows of G of the
+        nonnegative cone, and by the three rows of G of each exponential cone.
+
+        Args:
+             G: scipy.sparse.csc_matrix - matrix of nonnegative and exponential inequalities
+
+             dims: dictionary - cones (keys 'l' and 'e')
+
+             A: scipy.sparse.csc_matrix - matrix of equations
+
+        Returns:
+            n_comp: int - number of components
+
+            var_comp: numpy.array - the component of each variable
+
+            row_comp: numpy.array - the component of each row of A
+
+            ieq_comp: numpy.array - the component of each row of G
+    """
+    n_vars = A.shape[1]
+    n_l    = dims.get('l', 0)
+    n_e    = dims.get('e', 0)
+
+    # The constraints: the rows of A, the nonnegative rows of G, and the cones
+    cone_of_ieq = np.concatenate(( np.arange(n_l), n_l + np.repeat(np.arange(n_e), 3) )).astype(np.int64)
+    n_cons      = A.shape[0] + n_l + n_e
+    A_coo = A.tocoo()
+    G_coo = G.tocoo()
+    cons  = np.concatenate(( A_coo.row, A.shape[0] + cone_of_ieq[G_coo.row] ))
+    var   = np.concatenate(( A_coo.col, G_coo.col ))
+
+    # Bipartite graph variables -- constraints
+    B = sparse.csr_matrix( (np.ones(len(cons)), (var, n_vars + cons)), shape=(n_vars + n_cons, n_vars + n_cons) )
+    n_comp, labels = csgraph.connected_components(B, directed=False)
+
+    # Number the components by their first variable
+    first = np.full(n_comp, n_vars + n_cons, dtype=np.int64)
+    np.minimum.at(first, labels, np.arange(n_vars + n_cons))
+    order = np.empty(n_comp, dtype=np.int64)
+    order[np.argsort(first, kind='stable')] = np.arange(n_comp)
+    labels = order[labels]
+
+    var_comp = labels[:n_vars]
+    row_comp = labels[n_vars:n_vars + A.shape[0]]
+    ieq_comp = labels[n_vars + A.shape[0]:][cone_of_ieq]
+    return n_comp, var_comp, row_comp, ieq_comp
+#^ components()
+
+def solve_by_components(c, G, h, dims, A, b, pool=None, cone_solver='ECOS', **ecos_kwargs):
+    """Solves a cone program of TRIVARIATE_SYN or TRIVARIATE_UNQ block by block
+
+        Each component is solved by the cone solver with its right-hand sides normalized
+        (the programs are homogeneous: scaling b and h scales the primal
+        solution; without presolve h = 0 and b consists of three marginal
+        blocks of equal mass).
+        The primal solution and the slacks are scaled back, the duals are
+        invariant under the scaling.
+
+        Args:
+             c, G, h, dims, A, b: the cone program (as for ecos.solve())
+
+             pool: multiprocessing.Pool - if given, the components are solved
+                   by its workers
+                   (default = None: sequentially)
+
+             cone_solver: string - backend of TRIVARIATE_BACKENDS
+                          (default = 'ECOS')
+
+             **ecos_kwargs: ECOS parameters
+
+        Returns:
+            dictionary - as returned by ecos.solve(); its 'info' aggregates
+                         the components ('exitFlag', 'infostring' of the
+                         worst component, 'iter' and residuals maxima, costs
+                         summed up) and has the number of 'components'
+    """
+    tic = time.process_time()
+    n_comp, var_comp, row_comp, ieq_comp = components(G, dims, A)
+    if n_comp <= 1:
+        solution = TRIVARIATE_BACKENDS.solve(cone_solver, c, G, h, dims, A, b, **ecos_kwargs)
+        solution['info']['components'] = 1
+        return solution
+    #^ if nothing to split
+
+    n_l = dims.get('l', 0)
+    var_of  = np.argsort(var_comp, kind='stable')
+    row_of  = np.argsort(row_comp, kind='stable')
+    ieq_of  = np.argsort(ieq_comp, kind='stable')
+    var_ptr = np.concatenate(( [0], np.cumsum(np.bincount(var_comp, minlength=n_comp)) ))
+    row_ptr = np.concatenate(( [0], np.cumsum(np.bincount(row_comp, minlength=n_comp)) ))
+    ieq_ptr = np.concatenate(( [0], np.cumsum(np.bincount(ieq_comp, minlength=n_comp)) ))
+    G_csr   = G.tocsr()
+    A_csr   = A.tocsr()
+
+    blocks = []
+    for k in range(n_comp):
+        V = var_of[var_ptr[k]:var_ptr[k+1]]
+        R = row_of[row_ptr[k]:row_ptr[k+1]]
+        I = ieq_of[ieq_ptr[k]:ieq_ptr[k+1]]          # nonnegative rows first, then the cones (as in G)
+        mass  = np.abs(b[R]).sum()/3.
+        scale = mass if mass > 0 else 1.
+        dims_k = { 'l': int(np.sum(I < n_l)), 'e': int(np.sum(I >= n_l))//3 }
+        blocks.append( (V, R, I, scale, (c[V], sparse.csc_matrix(G_csr[I][:,V]), h[I]/scale, dims_k, sparse.csc_matrix(A_csr[R][:,V]), b[R]/scale)) )
+    #^ for components
+
+    if pool is not None:
+        results = [ pool.apply_async(TRIVARIATE_BACKENDS.solve, (cone_solver,) + block[4], ecos_kwargs) for block in blocks ]
+        results = [ res.get() for res in results ]
+    else:
+        results = [ TRIVARIATE_BACKENDS.solve(cone_solver, *block[4], **ecos_kwargs) for block in blocks ]
+    #^ if pool
+
+    # Stitch the solutions together
+    solution = { 'x': np.zeros(A.shape[1]), 's': np.zeros(G.shape[0]), 'y': np.zeros(A.shape[0]), 'z': np.zeros(G.shape[0]) }
+    info     = dict( exitFlag=0, infostring=None, pcost=0., dcost=0., pres=0., dres=0., gap=0., iter=0, components=n_comp )
+    for (V, R, I, scale, model), res in zip(blocks, results):
+        if 'x' not in res.keys(): return res
+        solution['x'][V] = scale*res['x']
+        solution['s'][I] = scale*res['s']
+        solution['y'][R] = res['y']
+        solution['z'][I] = res['z']
+        res_info = res['info']
+        if info['infostring'] is None or ( info['exitFlag'] == 0 and res_info['exitFlag'] != 0 ):
+            info['exitFlag']   = res_info['exitFlag']
+            info['infostring'] = res_info['infostring']
+        #^ if worst
+        info['pcost'] += scale*res_info['pcost']
+        info['dcost'] += scale*res_info['dcost']
+        info['gap']   += scale*res_info['gap']
+        info['pres']   = max( info['pres'], res_info['pres'] )
+        info['dres']   = max( info['dres'], res_info['dres'] )
+        info['iter']   = max( info['iter'], res_info['iter'] )
+    #^ for components
+    info['timing'] = { 'runtime': time.process_time() - tic }
+    solution['info'] = info
+    return solution
+#^ solve_by_components()
+
+def fix_forced(c, G, h, dims, A, b):
+    """Fixes the variables of a cone program which are pinned by its equations
+
+        An equation with a single variable which is not fixed yet fixes it,
+        and the fixed value is subtracted from the right-hand sides of the
+        other equations of the variable (which may leave them with a single
+        variable in turn); this is done in rounds, all such equations at
+        once. Values <= 1.e-12*max|b| are left to ECOS (they sit on the
+        boundary of the cones). An exponential cone with fixed p- and q-slot
+        is dropped: its r-variable (which occurs nowhere else) is
+        r = q*ln(p/q). The nonnegative rows of fixed variables are dropped.
+
+        Args:
+             c, G, h, dims, A, b: the cone program (as for ecos.solve())
+
+        Returns:
+            fixed: dictionary - the presolve data needed by postsolve()
+                   keys: 'x' (the fixed values), 'var' (bool: fixed variable),
+                         'rounds' (list of the fixing equations and their
+                         variables per round), 'row', 'ieq' (bool: kept rows
+                         of A and G), 'cones' (the dropped cones)
+
+            tuple - the reduced program (c, G, h, dims, A, b)
+    """
+    n_vars = A.shape[1]
+    n_l    = dims.get('l', 0)
+    n_e    = dims.get('e', 0)
+    A_csr  = sparse.csr_matrix(A)
+    A_csc  = sparse.csc_matrix(A)
+    G_csr  = sparse.csr_matrix(G)
+    nz_csr = abs(A_csr).sign()
+    tol    = 1.e-12*np.abs(b).max() if len(b) > 0 else 0.
+
+    x      = np.zeros(n_vars)
+    var    = np.zeros(n_vars, dtype=bool)
+    b_res  = np.array(b, dtype=np.float64)
+    count  = np.diff(A_csr.indptr)
+    rounds = []
+
+    # Equations with a single variable
+    row_of = np.repeat(np.arange(A.shape[0]), np.diff(A_csr.indptr))
+    while True:
+        single = (count == 1)[row_of] & ~var[A_csr.indices]
+        rows, cols, vals = row_of[single], A_csr.indices[single], A_csr.data[single]
+        value  = b_res[rows]/vals
+        ok     = value > tol
+        cols, first = np.unique(cols[ok], return_index=True)      # one equation per variable
+        rows, value = rows[ok][first], value[ok][first]
+        if len(cols) == 0: break
+        x[cols], var[cols] = value, True
+        rounds.append( (rows, cols) )
+        x_round = np.zeros(n_vars)
+        x_round[cols] = value
+        b_res -= A_csc.dot(x_round)
+        count  = nz_csr.dot((~var).astype(np.float64)).round().astype(np.int64)
+    #^ while
+
+    # Slacks of the inequalities at the fixed values
+    s_fixed  = h - G_csr.dot(x)
+    free_ieq = abs(G_csr).dot((~var).astype(np.float64)) > 0
+    ieq = np.ones(G.shape[0], dtype=bool)
+    ieq[:n_l] = free_ieq[:n_l]
+
+    # Cones with fixed p- and q-slot: r is the only variable of the r-slot
+    # and occurs nowhere else
+    r_row = n_l + 3*np.flatnonzero( ~free_ieq[n_l+1::3] & ~free_ieq[n_l+2::3] )
+    r_row = r_row[ np.diff(G_csr.indptr)[r_row] == 1 ]
+    j     = G_csr.indices[G_csr.indptr[r_row]]
+    g     = G_csr.data[G_csr.indptr[r_row]]
+    p, q  = s_fixed[r_row+1], s_fixed[r_row+2]
+    nnz_col = np.diff(sparse.csc_matrix(G).indptr) + np.diff(A_csc.indptr)
+    close = ~var[j] & (nnz_col[j] == 1) & (p > 0) & (q > 0) & (c[j]/g > 0)
+    r_row, j, g, p, q = r_row[close], j[close], g[close], p[close], q[close]
+    x[j], var[j] = (h[r_row] - q*np.log(p/q))/g, True
+    for k in range(3): ieq[r_row+k] = False
+    cones = (r_row - n_l)//3
+    row = count > 0
+
+    fixed = dict( x=x, var=var, rounds=rounds, row=row, ieq=ieq, cones=cones )
+    free  = ~var
+    dims_red = { 'l': int(np.sum(ieq[:n_l])), 'e': n_e - len(cones) }
+    reduced  = ( c[free], sparse.csc_matrix(G_csr[ieq][:,free]), s_fixed[ieq], dims_red,
+                 sparse.csc_matrix(A_csr[row][:,free]), b_res[row] )
+    return fixed, reduced
+#^ fix_forced()
+
+def postsolve(c, G, h, dims, A, b, fixed, solution):
+    """Puts the solution of the reduced program back into the layout of the whole program
+
+        The duals of the dropped cones are the ones at r = q*ln(p/q):
+        z = -z_r*( -1, q/p, ln(p/q)-1 ) with z_r from the r-column of the
+        KKT conditions c + A'y + G'z = 0; the duals of the fixing equations
+        follow from the columns of their variables (in the reverse order of
+        the rounds), and the other dropped equations and inequalities get 0.
+
+        Args:
+             c, G, h, dims, A, b: the whole cone program
+
+             fixed: dictionary - as returned by fix_forced()
+
+             solution: dictionary - as returned by ecos.solve() for the reduced program
+
+        Returns:
+            dictionary - as returned by ecos.solve() for the whole program
+    """
+    n_l   = dims.get('l', 0)
+    free  = ~fixed['var']
+    G_csr = sparse.csr_matrix(G)
+    x = fixed['x'].copy()
+    x[free] = solution['x']
+    s = h - G_csr.dot(x)
+    s[fixed['ieq']] = solution['s']
+    y = np.zeros(A.shape[0])
+    y[fixed['row']] = solution['y']
+    z = np.zeros(G.shape[0])
+    z[fixed['ieq']] = solution['z']
+
+    # Duals of the dropped cones
+    r_row = n_l + 3*fixed['cones']
+    p, q  = s[r_row+1], s[r_row+2]
+    z_r   = -c[G_csr.indices[G_csr.indptr[r_row]]]/G_csr.data[G_csr.indptr[r_row]]
+    z[r_row]   = z_r
+    z[r_row+1] = -z_r*q/p
+    z[r_row+2] = -z_r*(np.log(p/q) - 1.)
+
+    # Duals of the fixing equations: the other equations of a variable were
+    # kept, or are fixing equations of later rounds
+    A_csc = sparse.csc_matrix(A)
+    grad  = c + G_csr.T.dot(z)
+    for rows, cols in fixed['rounds'][::-1]:
+        A_round = A_csc[:,cols]
+        pivots  = np.asarray(A_round[rows, np.arange(len(cols))]).ravel()
+        y[rows] = -( grad[cols] + A_round.T.dot(y) )/pivots
+    #^ for rounds
+
+    info = dict(solution['info'])
+    info['pcost'] = np.dot(c, x)
+    info['dcost'] = -np.dot(b, y) - np.dot(h, z)
+    info['eliminated'] = int(np.sum(fixed['var']))
+    return { 'x': x, 's': s, 'y': y, 'z': z, 'info': info }
+#^ postsolve()
+
+def solve_presolved(c, G, h, dims, A, b, decompose=False, pool=None, cone_solver='ECOS', **ecos_kwargs):
+    """Solves a cone program of TRIVARIATE_SYN or TRIVARIATE_UNQ after fixing its forced variables
+
+        Args:
+             c, G, h, dims, A, b: the cone program (as for ecos.solve())
+
+             decompose: bool - if True, the reduced program is solved by
+                        solve_by_components()
+                        (default = False)
+
+             pool: multiprocessing.Pool - as in solve_by_components()
+
+             cone_solver: string - as in solve_by_components()
+
+             **ecos_kwargs: ECOS parameters
+
+        Returns:
+            dictionary - as returned by ecos.solve(); its 'info' has the
+                         number of 'eliminated' variables
+    """
+    tic = time.process_time()
+    fixed, reduced = fix_forced(c, G, h, dims, A, b)
+    if np.all(fixed['var']):
+        # Nothing left for ECOS
+        empty = np.zeros(0)
+        solution = { 'x': empty, 's': empty, 'y': empty, 'z': empty,
+                     'info': dict( exitFlag=0, infostring='Solved by presolve', pres=0., dres=0., gap=0., iter=0 ) }
+    elif decompose and reduced[4].shape[0] > 0:
+        solution = solve_by_components(*reduced, pool=pool, cone_solver=cone_solver, **ecos_kwargs)
+    else:
+        solution = TRIVARIATE_BACKENDS.solve(cone_solver, *reduced, **ecos_kwargs)
+    #^ if
+    if 'x' not in solution.keys(): return solution
+    solution = postsolve(c, G, h, dims, A, b, fixed, solution)
+    solution['info']['timing'] = { 'runtime': time.process_time() - tic }
+    return solution
+#^ solve_presolved()
+
+#EOF
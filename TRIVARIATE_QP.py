@@ -12,7 +12,7 @@ bails w/ duality gap > 10^-6
 
 Permission to use and modify under Apache License version 2.0
 """
-import ecos
+import TRIVARIATE_BACKENDS
 from scipy import sparse
 import numpy as np
 from numpy import linalg as LA
@@ -798,7 +798,7 @@ def solve(self, c, G, h, dims, A, b, output):
         self.ecos_kwargs["verbose"] = self.verbose
     #^ if
     
-    solution = ecos.solve(c, G, h, dims, A, b, **self.ecos_kwargs)
+    solution = TRIVARIATE_BACKENDS.solve(self.cone_solver, c, G, h, dims, A, b, **self.ecos_kwargs)
 
     if 'x' in solution.keys():
         self.sol_tx     = solution['x']
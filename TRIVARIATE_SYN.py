@@ -10,11 +10,12 @@ min -H(S|XYZ)
 
 Permission to use and modify under Apache License version 2.0
 """
-import ecos
+import TRIVARIATE_BACKENDS
+import TRIVARIATE_MAXENT
+import TRIVARIATE_PRESOLVE
 from scipy import sparse
 import numpy as np
 from numpy import linalg as LA
-from collections import defaultdict
 import math
 import time 
 
@@ -66,215 +67,272 @@ def create_model(self, output = 0):
     """
     
     tic_all = time.process_time()
-    n = len(self.quad_of_idx)
-    m = len(self.b_tx) + len(self.b_ty) + len(self.b_tz)
+    n = len(self.support)
+    t,x,y,z = ( np.asarray(v, dtype=np.int64) for v in self.support.columns )
+    m_tx, m_ty, m_tz = len(self.b_tx), len(self.b_ty), len(self.b_tz)
+    m = m_tx + m_ty + m_tz
     n_vars = 3*n
     n_cons = n+m
     
     # Create the equations: Ax = b
-    self.b = np.zeros((n_cons,),dtype=np.double)
-    
-    Eqn   = []
-    Var   = []
-    Coeff = []
-    
+    # A is assembled column by column in CSC form: the column of r_i is
+    # empty, the column of p_i has the entry -1 in row i, and the column of
+    # q_i has +1 in the q-p coupling row of every quad sharing its (x,y,z)
+    # and in its three marginal rows.
+
     # The q-p coupling equations: q_{*xyz} - p_{sxyz} = 0
-    # ( Expensive step )
     itic_p = time.process_time()
-    
-    Eqn_dict = defaultdict(lambda: 0.)
-    Eqn_dict_num = defaultdict(int)
-    Eqn_dict_acc = defaultdict(list)
-    Var_dict = defaultdict(list)
-    Coeff_dict = defaultdict(list)
-
-    for i,uxyz in enumerate(self.quad_of_idx):
-        u,x,y,z = uxyz
-        q_var = q_vidx(self.idx_of_quad[ (u,x,y,z) ])
-        Var_dict[x,y,z].append( q_var )
-        Coeff_dict[x,y,z].append( +1. )
-        Eqn_dict[u,x,y,z] = i
-        Eqn_dict_num[x,y,z] += 1
-    #^ for uxyz exists
-
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        temp = [ Eqn_dict[s,x,y,z] ] * Eqn_dict_num[x,y,z]
-        Eqn_dict_acc[s,x,y,z] += temp
-    #^ for sxyz exits
-    
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        p_var   = p_vidx(i)
-        Eqn.append( Eqn_dict[s,x,y,z] )
-        Var.append( p_var )
-        Coeff.append( -1. )
-        Eqn += Eqn_dict_acc[s,x,y,z]
-        Var += Var_dict[x,y,z]
-        Coeff += Coeff_dict[x,y,z]
-    #^ for sxyz exists
-    
+    xyz, group = self.support.project((1,2,3))
+    k_g     = np.bincount(group, minlength=len(xyz))
+    members = np.argsort(group, kind='stable')          # quads grouped by (x,y,z), ascending within a group
+    start_g = np.concatenate(( [0], np.cumsum(k_g)[:-1] ))
+    k       = k_g[group]                                # number of quads sharing (x,y,z) with quad i
+
+    # Offsets of the entries of p_i and q_i
+    size    = 1 + k + 3
+    off     = np.concatenate(( [0], np.cumsum(size) ))
+    nnz     = int(off[-1])
+    idx     = self.index_dtype(max(nnz, n_cons, n_vars))
+    indices = np.empty(nnz, dtype=idx)
+    data    = np.ones(nnz, dtype=np.double)
+
+    indices[off[:-1]] = np.arange(n)
+    data[off[:-1]]    = -1.
+
+    seg_start = np.repeat(off[:-1] + 1, k)
+    within    = np.arange(len(seg_start)) - np.repeat(np.cumsum(k) - k, k)
+    indices[seg_start + within] = members[ np.repeat(start_g[group], k) + within ]
     itoc_p = time.process_time()
     if output == 2: print("TRIVARIATE_SYN.create_model(): Time to create q-p coupling equations [min - H(S|X,Y,V)]:", itoc_p - itic_p, "secs")
 
-    # running number
-    eqn = -1 + len(self.quad_of_idx) 
-
-    # The marginal constraints 
-    itic_m = time.process_time()   
-
-    # The sx marginals q_{sx**} = b^x_{sx}
-    Eqn_marg = defaultdict(lambda: 0.)
-    Eqn_marg_num = defaultdict(int)
-    Eqn_marg_acc = defaultdict(list)
-    Var_marg = defaultdict(list)
-    Coeff_marg = defaultdict(list)
-    for sx,i in self.b_tx.items():
-        (s,x) = sx
-        eqn += 1
-        Eqn_marg[s,x] = eqn
-    #^ for sx exists
-        
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        if (s,x) in self.b_tx.keys():
-            q_var = q_vidx(self.idx_of_quad[ (s,x,y,z) ])
-            Var_marg[s,x].append(q_var)
-            Coeff_marg[s,x].append(+1.)
-            Eqn_marg_num[s,x] += 1
-        #^ if sx exits
-    # for sxyz
-    
-    for sx,i in self.b_tx.items():
-        (s,x) = sx
-        temp = [ Eqn_marg[s,x] ]*Eqn_marg_num[s,x]
-        Eqn_marg_acc[s,x] += temp
-    #^ for  sx exists    
-    for sx,i in self.b_tx.items():
-        (s,x) = sx
-        Eqn += Eqn_marg_acc[s,x]
-        Var += Var_marg[s,x]
-        Coeff += Coeff_marg[s,x]
-        self.b[ Eqn_marg[s,x] ] = self.b_tx[(s,x)]
-    #^ for sx exists
-    
-    # The sy marginals q_{s*y*} = b^y_{sy}
-    Eqn_marg = defaultdict(lambda: 0.)
-    Eqn_marg_num = defaultdict(int)
-    Eqn_marg_acc = defaultdict(list)
-    Var_marg = defaultdict(list)
-    Coeff_marg = defaultdict(list)
-    for sy,i in self.b_ty.items():
-        (s,y) = sy
-        eqn += 1
-        Eqn_marg[s,y] = eqn
-    #^ for sy exists
-        
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        if (s,y) in self.b_ty.keys():
-            q_var = q_vidx(self.idx_of_quad[ (s,x,y,z) ])
-            Var_marg[s,y].append(q_var)
-            Coeff_marg[s,y].append(+1.)
-            Eqn_marg_num[s,y] += 1
-        #^ if sy exits
-    # for sxyz
-    
-    for sy,i in self.b_ty.items():
-        (s,y) = sy
-        temp = [ Eqn_marg[s,y] ]*Eqn_marg_num[s,y]
-        Eqn_marg_acc[s,y] += temp
-    #^ for  sy exists   
-        
-    for sy,i in self.b_ty.items():
-        (s,y) = sy
-        Eqn += Eqn_marg_acc[s,y]
-        Var += Var_marg[s,y]
-        Coeff += Coeff_marg[s,y]
-        self.b[ Eqn_marg[s,y] ] = self.b_ty[(s,y)]
-    #^ for sy exists
-
-    # The sz marginals q_{s**z} = b^z_{sz}
-    Eqn_marg = defaultdict(lambda: 0.)
-    Eqn_marg_num = defaultdict(int)
-    Eqn_marg_acc = defaultdict(list)
-    Var_marg = defaultdict(list)
-    Coeff_marg = defaultdict(list)
-
-    for sz,i in self.b_tz.items():
-        (s,z) = sz
-        eqn += 1
-        Eqn_marg[s,z] = eqn
-    #^ for sz exists
-    
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        if (s,z) in self.b_tz.keys():
-            q_var = q_vidx(self.idx_of_quad[ (s,x,y,z) ])
-            Var_marg[s,z].append(q_var)
-            Coeff_marg[s,z].append(+1.)
-            Eqn_marg_num[s,z] += 1
-        #^ if sz exits
-    # for sxyz
-    
-    for sz,i in self.b_tz.items():
-        (s,z) = sz
-        temp = [ Eqn_marg[s,z] ]*Eqn_marg_num[s,z]
-        Eqn_marg_acc[s,z] += temp
-    #^ for  sz exists    
-        
-    for sz,i in self.b_tz.items():
-        (s,z) = sz
-        Eqn += Eqn_marg_acc[s,z]
-        Var += Var_marg[s,z]
-        Coeff += Coeff_marg[s,z]
-        self.b[ Eqn_marg[s,z] ] = self.b_tz[(s,z)]
-    #^ for sz exists
+    # The marginal constraints: q_{sx**} = b^x_{sx}, q_{s*y*} = b^y_{sy}, q_{s**z} = b^z_{sz}
+    itic_m = time.process_time()
+    last = off[1:] - 3
+    indices[last]     = n + self.rank_tx[t,x]
+    indices[last + 1] = n + m_tx + self.rank_ty[t,y]
+    indices[last + 2] = n + m_tx + m_ty + self.rank_tz[t,z]
 
+    b = self.marginal_rhs(n)
     itoc_m = time.process_time()
     if output == 2: print("TRIVARIATE_SYN.create_model(): Time to create marginal equations [min - H(S|X,Y,Z)]:", itoc_m - itic_m, "secs")
 
-    # Store A 
-    self.A = sparse.csc_matrix( (Coeff, (Eqn,Var)), shape=(n_cons,n_vars), dtype=np.double)
+    # Store A: the columns of r_i, p_i, q_i start at off_i, off_i, off_i + 1
+    indptr = np.empty(n_vars + 1, dtype=idx)
+    indptr[0:n_vars:3] = off[:-1]
+    indptr[1:n_vars:3] = off[:-1]
+    indptr[2:n_vars:3] = off[:-1] + 1
+    indptr[n_vars]     = nnz
+    A = sparse.csc_matrix( (data, indices, indptr), shape=(n_cons,n_vars) )
     
     # Generalized ieqs: gen.nneg of the variable quadruple (r_i,q_i,p_i), i=0,dots,n-1:
-    Ieq   = []
-    Var   = []
-    Coeff = []
-    for i,sxyz in enumerate(self.quad_of_idx):
-        r_var = r_vidx(i)
-        q_var = q_vidx(i)
-        p_var = p_vidx(i)
-        
-        Ieq.append( len(Ieq) )
-        Var.append( r_var )
-        Coeff.append( -1. )
-        
-        Ieq.append( len(Ieq) )
-        Var.append( p_var )
-        Coeff.append( -1. )
-        
-        Ieq.append( len(Ieq) )
-        Var.append( q_var )
-        Coeff.append( -1. )
-    #^ for sxyz
-
-    self.G         = sparse.csc_matrix( (Coeff, (Ieq,Var)), shape=(n_vars,n_vars), dtype=np.double)
-    self.h         = np.zeros( (n_vars,),dtype=np.double )
-    self.dims = dict()
-    self.dims['e'] = n
+    G         = sparse.csc_matrix( (-np.ones(n_vars), np.arange(n_vars, dtype=idx), np.arange(n_vars + 1, dtype=idx)), shape=(n_vars,n_vars) )
+    h         = np.zeros( (n_vars,),dtype=np.double )
+    dims = dict()
+    dims['e'] = n
     
     # Objective function:
-    self.c = np.zeros( (n_vars,),dtype=np.double )
-    for i,sxyz in enumerate(self.quad_of_idx):
-        self.c[ r_vidx(i) ] = -1.
-    #^ for xyz
+    c = np.zeros( (n_vars,),dtype=np.double )
+    c[ r_vidx(np.arange(n)) ] = -1.
     toc_all = time.process_time()
     if output > 0: print("TRIVARIATE_SYN.create_model(): Time to create model [min - H(S|X,Y,Z)]:", toc_all - tic_all, "secs") 
-    return self.c, self.G, self.h, self.dims, self.A, self.b
+    return self.model(c, G, h, dims, A, b)
 #^ create_model()
 
+def create_model_reduced(self, output = 0):
+    """Creates the reduced exponential Cone Program min_{q in Delta_d}H(T|X,Y,Z)
+
+           The variables are x = (r,q) with r_i at 2i and q_i at 2i+1. The
+           p-slot of the i-th exponential cone is the affine expression
+           q_{*xyz} = sum_s q_{sxyz} (rows of G), so neither the variables p
+           nor the q-p coupling equations are needed: A only holds the
+           marginal equations. The cones (r,p,q) are the same as in
+           create_model(), and solve() maps the solution back to its layout.
+
+        Args:
+             output: int - print different outputs based on (int) to console
+        
+        Returns: 
+            c, G, h, dims, A, b - as in create_model()
+    """
+    
+    tic_all = time.process_time()
+    n = len(self.support)
+    t,x,y,z = ( np.asarray(v, dtype=np.int64) for v in self.support.columns )
+    m_tx, m_ty, m_tz = len(self.b_tx), len(self.b_ty), len(self.b_tz)
+    m = m_tx + m_ty + m_tz
+    n_vars = 2*n
+
+    # The marginal equations: the column of q_i has +1 in its three marginal rows
+    idx     = self.index_dtype(max(4*n, m))
+    indices = np.empty(3*n, dtype=idx)
+    indices[0::3] = self.rank_tx[t,x]
+    indices[1::3] = m_tx + self.rank_ty[t,y]
+    indices[2::3] = m_tx + m_ty + self.rank_tz[t,z]
+    indptr = np.empty(n_vars + 1, dtype=idx)
+    indptr[0:n_vars:2] = 3*np.arange(n)
+    indptr[1:n_vars:2] = 3*np.arange(n)
+    indptr[n_vars]     = 3*n
+    A = sparse.csc_matrix( (np.ones(3*n), indices, indptr), shape=(m,n_vars) )
+    b = self.marginal_rhs(0)
+
+    # Generalized ieqs: the cone i is (r_i, q_{*xyz}, q_i) in the rows 3i, 3i+1, 3i+2;
+    # the column of q_j has -1 in the p-rows of all quads sharing its (x,y,z),
+    # and in its own q-row (right after its own p-row)
+    xyz, group = self.support.project((1,2,3))
+    k_g     = np.bincount(group, minlength=len(xyz))
+    members = np.argsort(group, kind='stable')
+    start_g = np.concatenate(( [0], np.cumsum(k_g)[:-1] )).astype(np.int64)
+    k       = k_g[group]
+    pos     = np.empty(n, dtype=np.int64)
+    pos[members] = np.arange(n) - start_g[group[members]]   # position of quad j in its group
+
+    size = 1 + k + 1                                        # r-column, q-column
+    off  = np.concatenate(( [0], np.cumsum(size) )).astype(np.int64)
+    nnz  = int(off[-1])
+    idx       = self.index_dtype(max(nnz, 3*n))
+    G_indices = np.empty(nnz, dtype=idx)
+    G_indices[off[:-1]] = 3*np.arange(n)
+
+    within    = np.arange(int(k.sum())) - np.repeat(np.cumsum(k) - k, k)
+    shift     = ( within > np.repeat(pos, k) ).astype(np.int64)    # entries after the own q-row
+    G_indices[np.repeat(off[:-1] + 1, k) + within + shift] = 3*members[ np.repeat(start_g[group], k) + within ] + 1
+    G_indices[off[:-1] + 2 + pos] = 3*np.arange(n) + 2
+
+    G_indptr = np.empty(n_vars + 1, dtype=idx)
+    G_indptr[0:n_vars:2] = off[:-1]
+    G_indptr[1:n_vars:2] = off[:-1] + 1
+    G_indptr[n_vars]     = nnz
+    G         = sparse.csc_matrix( (-np.ones(nnz), G_indices, G_indptr), shape=(3*n,n_vars) )
+    h         = np.zeros( (3*n,),dtype=np.double )
+    dims = dict()
+    dims['e'] = n
+
+    # Objective function:
+    c = np.zeros( (n_vars,),dtype=np.double )
+    c[0::2] = -1.
+    toc_all = time.process_time()
+    if output > 0: print("TRIVARIATE_SYN.create_model_reduced(): Time to create model [min - H(S|X,Y,Z)]:", toc_all - tic_all, "secs") 
+    return self.model(c, G, h, dims, A, b)
+#^ create_model_reduced()
+
+def create_model_auxiliary(self, output = 0):
+    """Creates the exponential Cone Program min_{q in Delta_d}H(T|X,Y,Z) with auxiliary marginal variables
+
+           The variables are x = (r,q,m) with r_i at 2i, q_i at 2i+1, and
+           one variable m_{xyz} at 2n+g for each (x,y,z) of the support
+           (like the w variables of TRIVARIATE_UNQ). The coupling equations
+           m_{xyz} - sum_s q_{sxyz} = 0 come first, then the marginal
+           equations; the cone i is (r_i, m_{xyz}, q_i). Every q enters
+           4 equations, so A and G have O(n) nonzeros. The (redundant)
+           inequalities m_{xyz} >= 0 precede the cones; without them ECOS
+           runs into numerical problems on larger alphabets. The cones are the
+           same as in create_model(), and solve() maps the solution back to
+           its layout.
+
+        Args:
+             output: int - print different outputs based on (int) to console
+        
+        Returns: 
+            c, G, h, dims, A, b - as in create_model()
+    """
+    
+    tic_all = time.process_time()
+    n = len(self.support)
+    t,x,y,z = ( np.asarray(v, dtype=np.int64) for v in self.support.columns )
+    m_tx, m_ty, m_tz = len(self.b_tx), len(self.b_ty), len(self.b_tz)
+    m = m_tx + m_ty + m_tz
+    xyz, group = self.support.project((1,2,3))
+    n_xyz  = len(xyz)
+    n_vars = 2*n + n_xyz
+    n_cons = n_xyz + m
+
+    # Create the equations: Ax = b
+    # The column of q_i has -1 in the coupling row of its (x,y,z) and +1 in
+    # its three marginal rows, the column of m_g has +1 in its coupling row
+    idx     = self.index_dtype(max(4*n + n_xyz, n_cons, n_vars))
+    indices = np.empty(4*n + n_xyz, dtype=idx)
+    data    = np.ones(4*n + n_xyz, dtype=np.double)
+    indices[0:4*n:4] = group
+    data[0:4*n:4]    = -1.
+    indices[1:4*n:4] = n_xyz + self.rank_tx[t,x]
+    indices[2:4*n:4] = n_xyz + m_tx + self.rank_ty[t,y]
+    indices[3:4*n:4] = n_xyz + m_tx + m_ty + self.rank_tz[t,z]
+    indices[4*n:]    = np.arange(n_xyz)
+    indptr = np.empty(n_vars + 1, dtype=idx)
+    indptr[0:2*n:2] = 4*np.arange(n)
+    indptr[1:2*n:2] = 4*np.arange(n)
+    indptr[2*n:]    = 4*n + np.arange(n_xyz + 1)
+    A = sparse.csc_matrix( (data, indices, indptr), shape=(n_cons,n_vars) )
+    b = self.marginal_rhs(n_xyz)
+
+    # Generalized ieqs: m_g >= 0 in the rows 0,...,n_xyz-1, and the cone i
+    # is (r_i, m_{xyz}, q_i) in the rows n_xyz + 3i, 3i+1, 3i+2
+    k_g     = np.bincount(group, minlength=n_xyz)
+    members = np.argsort(group, kind='stable')
+    start_g = np.concatenate(( [0], np.cumsum(k_g)[:-1] )).astype(np.int64)
+    G_indices = np.empty(3*n + n_xyz, dtype=idx)
+    G_indices[0:2*n:2] = n_xyz + 3*np.arange(n)
+    G_indices[1:2*n:2] = n_xyz + 3*np.arange(n) + 2
+    col_m = 2*n + start_g + np.arange(n_xyz)                 # first entry of the column of m_g
+    m_entries = np.ones(3*n + n_xyz - 2*n, dtype=bool)
+    m_entries[col_m - 2*n] = False
+    G_indices[col_m]            = np.arange(n_xyz)
+    G_indices[2*n:][m_entries]  = n_xyz + 3*members + 1
+    G_indptr = np.concatenate(( np.arange(2*n), 2*n + np.concatenate(( [0], np.cumsum(k_g + 1) )) )).astype(idx)
+    G         = sparse.csc_matrix( (-np.ones(3*n + n_xyz), G_indices, G_indptr), shape=(n_xyz + 3*n,n_vars) )
+    h         = np.zeros( (n_xyz + 3*n,),dtype=np.double )
+    dims = dict()
+    dims['l'] = n_xyz
+    dims['e'] = n
+
+    # Objective function:
+    c = np.zeros( (n_vars,),dtype=np.double )
+    c[0:2*n:2] = -1.
+    toc_all = time.process_time()
+    if output > 0: print("TRIVARIATE_SYN.create_model_auxiliary(): Time to create model [min - H(S|X,Y,Z)]:", toc_all - tic_all, "secs") 
+    return self.model(c, G, h, dims, A, b)
+#^ create_model_auxiliary()
+
+
+
+
+
+def model_size(supp_tx, supp_ty, supp_tz, syn_formulation = 'standard'):
+    """Counts the size of the exponential Cone Program min_{q in Delta_d}H(T|X,Y,Z) without creating it
 
+        With K(x,y,z) = #{ t : P(t,x), P(t,y), P(t,z) > 0 } the program has
+        n = sum_t |X_t||Y_t||Z_t| quadruples, and the q-p coupling entries
+        sum_{xyz} K(x,y,z)^2 = sum_{t,t'} |X_t ^ X_t'||Y_t ^ Y_t'||Z_t ^ Z_t'|
+        are counted from the products of the marginal supports; the support
+        itself is not enumerated.
+
+        Args:
+             supp_tx, supp_ty, supp_tz: numpy.array - bool, P(T,X) > 0 etc.
+
+             syn_formulation: string - cf. MAXENT3D_PID.Opt_I.syn_formulation
+
+        Returns:
+            dictionary - keys: 'variables', 'equations', 'cones' (exponential),
+                         'nonnegative' (rows of G), 'nnz_A', 'nnz_G'
+    """
+    B_x, B_y, B_z = ( np.asarray(B, dtype=np.int64) for B in (supp_tx, supp_ty, supp_tz) )
+    n      = int(np.sum( B_x.sum(axis=1)*B_y.sum(axis=1)*B_z.sum(axis=1) ))
+    m      = int( B_x.sum() + B_y.sum() + B_z.sum() )
+    sum_k2 = int(np.sum( B_x.dot(B_x.T)*B_y.dot(B_y.T)*B_z.dot(B_z.T) ))
+    if syn_formulation == 'reduced':
+        return dict( variables=2*n, equations=m, cones=n, nonnegative=0, nnz_A=3*n, nnz_G=2*n + sum_k2 )
+    elif syn_formulation == 'auxiliary':
+        # The (x,y,z) with K(x,y,z) > 0, one x at a time
+        n_xyz = 0
+        for x in range(B_x.shape[1]):
+            T_x = B_x[:,x] > 0
+            if T_x.any(): n_xyz += int(np.count_nonzero( B_y[T_x].T.dot(B_z[T_x]) ))
+        #^ for x
+        return dict( variables=2*n + n_xyz, equations=n_xyz + m, cones=n, nonnegative=n_xyz, nnz_A=4*n + n_xyz, nnz_G=3*n + n_xyz )
+    else:
+        return dict( variables=3*n, equations=n + m, cones=n, nonnegative=0, nnz_A=4*n + sum_k2, nnz_G=3*n )
+    #^ if formulation
+#^ model_size()
 
 def solve(self, c, G, h, dims, A, b, output):
     """Solves the exponential Cone Program min_{Delta_p}H(T|X,Y,Z)
@@ -306,7 +364,7 @@ def solve(self, c, G, h, dims, A, b, output):
 
             sol_mu:     numpy.array - inequalities dual  optimal solution   
 
-            sol_info:   dictionary - Brief stats of the optimization from ECOS
+            sol_info:   dictionary - Brief stats of the optimization from the cone solver
     """
 
     itic = time.process_time()
@@ -315,9 +373,42 @@ def solve(self, c, G, h, dims, A, b, output):
     if self.verbose != None:
         self.ecos_kwargs["verbose"] = self.verbose
     #^ if    
-    solution = ecos.solve(c, G, h, dims,  A, b, **self.ecos_kwargs)
-
-    if 'x' in solution.keys():
+    if self.cone_solver == 'NumPy':
+        # The NumPy engine solves the program itself (in the layout of create_model())
+        solution = TRIVARIATE_MAXENT.solve_syn(self, output, **self.ecos_kwargs)
+    elif self.presolve:
+        # Fix the forced variables, solve the rest (block by block if decompose)
+        solution = TRIVARIATE_PRESOLVE.solve_presolved(c, G, h, dims, A, b, decompose=self.decompose, cone_solver=self.cone_solver, **self.ecos_kwargs)
+        if output == 2 and 'info' in solution.keys(): print("TRIVARIATE_SYN.solve(): Number of variables eliminated by presolve:", solution['info']['eliminated'])
+    elif self.decompose:
+        # Solve the independent blocks of the program separately
+        solution = TRIVARIATE_PRESOLVE.solve_by_components(c, G, h, dims, A, b, cone_solver=self.cone_solver, **self.ecos_kwargs)
+        if output == 2 and 'info' in solution.keys(): print("TRIVARIATE_SYN.solve(): Number of independent blocks:", solution['info']['components'])
+    else:
+        solution = TRIVARIATE_BACKENDS.solve(self.cone_solver, c, G, h, dims, A, b, **self.ecos_kwargs)
+    #^ if decompose
+
+    if 'x' in solution.keys() and self.syn_formulation != 'standard' and self.cone_solver != 'NumPy':
+        # Back to the layout of create_model(): the cones are the same, so
+        # p is the p-slot of the cones, and the dual of the q-p coupling
+        # equation of quad i is -(dual of the p-slot of cone i); the
+        # marginal equations come last; slack and dual of the cones (after
+        # the linear inequalities) as in create_model()
+        n = dims['e']
+        l = dims.get('l', 0)
+        m = len(self.b_tx) + len(self.b_ty) + len(self.b_tz)
+        self.sol_rpq    = np.empty(3*n)
+        self.sol_rpq[0::3] = solution['x'][0:2*n:2]
+        self.sol_rpq[1::3] = solution['s'][l+1::3]
+        self.sol_rpq[2::3] = solution['x'][1:2*n:2]
+        self.sol_slack  = solution['s'][l:]
+        self.sol_lambda = np.concatenate(( -solution['z'][l+1::3], solution['y'][len(solution['y'])-m:] ))
+        self.sol_mu     = solution['z'][l:]
+        self.sol_info   = solution['info']
+        itoc = time.process_time()
+        if output == 2: print("TRIVARIATE_SYN.solve():Time to solve the "+self.syn_formulation+" Exponential Program of H(S|X,Y,Z):", itoc - itic, "secs") 
+        return "success", self.sol_rpq, self.sol_slack, self.sol_lambda, self.sol_mu, self.sol_info
+    elif 'x' in solution.keys():
         self.sol_rpq    = solution['x']
         self.sol_slack  = solution['s']
         self.sol_lambda = solution['y']
@@ -348,20 +439,11 @@ def condentropy(self, sol_rpq, output = 0):
     # compute cond entropy of the distribution in self.sol_rpq
     
     itic = time.process_time()
-    marg_s = defaultdict(lambda: 0.)
-    mysum = 0.
-    for sxyz,i in self.idx_of_quad.items():
-        s,x,y,z = sxyz
-        marg_s[(x,y,z)] += sol_rpq[q_vidx(i)]
-    #^ for 
-
-    for sxyz,i in self.idx_of_quad.items():
-        s,x,y,z = sxyz
-        q_sxyz = sol_rpq[q_vidx(i)]
-        if marg_s[(x,y,z)] > 0 and q_sxyz > 0:
-            mysum -= q_sxyz*log(q_sxyz/marg_s[(x,y,z)])
-        #^ if
-    #^ for
+    xyz, group = self.support.project((1,2,3))
+    q      = sol_rpq[q_vidx(np.arange(len(self.support)))]
+    marg_s = np.bincount(group, weights=q, minlength=len(xyz))[group]
+    pos    = (marg_s > 0) & (q > 0)
+    mysum  = -np.sum( q[pos]*np.log2(q[pos]/marg_s[pos]) )
     itoc = time.process_time()
     # print("H(T|XYZ)", mysum)
 
@@ -389,57 +471,30 @@ def check_feasibility(self, sol_rpq, sol_lambda, output = 0):
     """
     
     # returns pair (p,d) of primal/dual infeasibility (maxima)
+    n = len(self.support)
+    t,x,y,z = self.support.columns
+    q = sol_rpq[q_vidx(np.arange(n))]
 
     # Primal infeasiblility
     
     # non-negative ineqaulity
     itic_neg = time.process_time()
-    max_q_negativity = 0.
-    for i in range(len(self.quad_of_idx)):
-        max_q_negativity = max(max_q_negativity, -sol_rpq[q_vidx(i)])
-    #^ for
+    max_q_negativity = max(0., -q.min()) if n > 0 else 0.
     itoc_neg = time.process_time()
     if output == 2: print("TRIVARIATE_SYN.check_feasibility(): Time to compute primal negative violations [min - H(S|X,Y,Z)]: ", itoc_neg - itic_neg, "secs")  
 
 
     # Marginal equations
-    # ( Expensive Step )
     max_violation_of_eqn = 0.
-    itic_marg = time.process_time()    
-    # sx** - marginals:
-    sol_b_sx = defaultdict(lambda: 0.)
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        sol_b_sx[s,x] += max(0., sol_rpq[q_vidx(i)])
-    #^ for sxyz exists 
-    for sx,i in self.b_tx.items():
-        s,x  = sx
-        mysum = i - sol_b_sx[s,x]
-        max_violation_of_eqn = max( max_violation_of_eqn, abs(mysum) )
-    #^ for sx exists
-    
-    # s*y* - marginals:
-    sol_b_sy = defaultdict(lambda: 0.)
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        sol_b_sy[s,y] += max(0., sol_rpq[q_vidx(i)])
-    #^ for sxyz exists 
-    for sy,i in self.b_ty.items():
-        s,y  = sy
-        mysum = i - sol_b_sy[s,y]
-        max_violation_of_eqn = max( max_violation_of_eqn, abs(mysum) )
-    
-    # s**z - marginals:
-    sol_b_sz = defaultdict(lambda: 0.)
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        sol_b_sz[s,z] += max(0., sol_rpq[q_vidx(i)])
-    #^ for sxyz exists 
-    for sz,i in self.b_tz.items():
-        s,z  = sz
-        mysum = i - sol_b_sz[s,z]
-        max_violation_of_eqn = max( max_violation_of_eqn, abs(mysum) )
-    #^ for sz exists
+    itic_marg = time.process_time()
+    q_pos = np.maximum(q, 0.)
+    for marg,v in ( (self.P_tx,x), (self.P_ty,y), (self.P_tz,z) ):
+        # sx** - marginals, s*y* - marginals, s**z - marginals:
+        sol_b = np.zeros(marg.shape)
+        np.add.at(sol_b, (t,v), q_pos)
+        exists = marg > 0
+        if exists.any(): max_violation_of_eqn = max( max_violation_of_eqn, np.abs(marg - sol_b)[exists].max() )
+    #^ for marginals
 
     primal_infeasability = max(max_violation_of_eqn,max_q_negativity)
 
@@ -448,69 +503,28 @@ def check_feasibility(self, sol_rpq, sol_lambda, output = 0):
 
     # Dual infeasiblility
 
-    # Finding dual indices 
-    idx_of_sx = dict()
-    i = 0
-    for s in self.T:
-        for x in self.X:
-            if (s,x) in self.b_tx.keys():
-                idx_of_sx[(s,x)] = i
-                i += 1
-            #^ if sx exists
-        #^ for x
-    #^ for s
-
-    idx_of_sy = dict()
-    i = 0
-    for s in self.T:
-        for y in self.Y:
-            if (s,y) in self.b_ty.keys():
-                idx_of_sy[(s,y)] = i
-                i += 1
-            #^ if sy exists
-        #^ for y
-    #^ for s
-
-    idx_of_sz = dict()
-    i = 0
-    for s in self.T:
-        for z in self.Z:
-            if (s,z) in self.b_tz.keys():
-                idx_of_sz[(s,z)] = i
-                i += 1
-            #^ if sz exists
-        #^ for z
-    #^ for s
-
     dual_infeasability = 0.
 
     itic_negD = time.process_time()
 
+    # Get indices of dual variables of the marginal constriants
+    sx_idx = n + self.rank_tx[t,x]
+    sy_idx = n + len(self.b_tx) + self.rank_ty[t,y]
+    sz_idx = n + len(self.b_tx) + len(self.b_ty) + self.rank_tz[t,z]
+
     # Compute mu_*xyz
-    mu_xyz = defaultdict(lambda: 0.)
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        mu_xyz[(x,y,z)] += sol_lambda[i]
-    #^ for mu_xyz
-
-    # Dual inequalities
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-
-        # Get indices of dual variables of the marginal constriants
-        sx_idx = len(self.quad_of_idx) + idx_of_sx[(s,x)]
-        sy_idx = len(self.quad_of_idx) + len(self.b_tx) + idx_of_sy[(s,y)]
-        sz_idx = len(self.quad_of_idx) + len(self.b_tx) + len(self.b_ty) + idx_of_sz[(s,z)]
-        
-        # Find the most violated dual ieq
-        dual_infeasability = max( dual_infeasability, - sol_lambda[sx_idx]
-                                  - sol_lambda[sy_idx]
-                                  - sol_lambda[sz_idx]
-                                  - mu_xyz[(x,y,z)]
-                                  -ln(-sol_lambda[i])
-                                  - 1
-        )
-    #^ for
+    xyz, group = self.support.project((1,2,3))
+    mu_xyz = np.bincount(group, weights=sol_lambda[:n], minlength=len(xyz))
+
+    # Dual inequalities: find the most violated dual ieq
+    if n > 0:
+        dual_infeasability = max( dual_infeasability, np.max( - sol_lambda[sx_idx]
+                                                             - sol_lambda[sy_idx]
+                                                             - sol_lambda[sz_idx]
+                                                             - mu_xyz[group]
+                                                             - np.log(-sol_lambda[:n])
+                                                             - 1 ) )
+    #^ if
     itoc_negD = time.process_time()
     if output == 2: print("TRIVARIATE_SYN.check_feasibility(): Time to compute dual negative violations [min - H(S|X,Y,Z)]:", itoc_negD - itic_negD, "secs")
     return primal_infeasability, dual_infeasability
@@ -529,7 +543,9 @@ def dual_value(self, sol_lambda, b):
             float 
     """
 
-    return -np.dot(sol_lambda, b)
+    # The marginal equations come last, the coupling equations have b = 0
+    # (also in create_model_reduced() and create_model_auxiliary())
+    return -np.dot(sol_lambda[len(sol_lambda)-len(b):], b)
 #^ dual_value()
 
 
@@ -10,38 +10,17 @@ min -H(S|XY), min -H(S|XZ) and min -H(S|YZ)
 
 Permission to use and modify under Apache License version 2.0
 """
-import ecos
+import TRIVARIATE_BACKENDS
+import TRIVARIATE_MAXENT
+import TRIVARIATE_PRESOLVE
 from scipy import sparse
 import numpy as np
 from numpy import linalg as LA
-from collections import defaultdict
 import math
 import time
-from collections import defaultdict
 ln  = math.log
 log = math.log2
 
-def core_initialization(_S, X_1, X_2, b_sx1, b_sx2, idx_of, of_idx):
-    # (c) Abdullah Makkeh, Dirk Oliver Theis
-    # Permission to use and modify under Apache License version 2.0
-
-    for s in _S:
-        for x1 in X_1:
-            if (s,x1) in b_sx1.keys():
-                for x2 in X_2:
-                    if (s,x2) in b_sx2.keys():
-                        idx_of[ (s,x1,x2) ] = len(of_idx)
-                        of_idx.append( (s,x1,x2) )
-                    #^ if sx2
-                #^ for x2
-            #^if sx1
-        #^ for x1
-    #^ for s
-
-    return 0
-#^ core_initialization()
-
-
 def initialization(self, which_sources):
     """Initialize the data for the triplets (T,U,V) where U,V in {X,Y,Z}
         
@@ -56,28 +35,18 @@ def initialization(self, which_sources):
         Returns: 
             (if [1,2] u,v=x,y|if [1,3] u,v=x,z|if [2,3] u,v=y,z|)
 
-            dictionary
-
-              keys: (t,u,v)
-              values: their indices 
+            Support_Index - the triplets (t,u,v), i.e., the projection of the
+                            support onto (T,U,V) in lexicographic order
 
-            list of (t,u,v)
+            numpy.array - the position of the triplet (t,u,v) of each
+                          quadruple (t,x,y,z) of the support
     """
 
-    idx_of_trip  = dict()
-    trip_of_idx  = []
-
-    if which_sources == [1,2]:
-        core_initialization(self.T, self.X, self.Y, self.b_tx, self.b_ty, idx_of_trip, trip_of_idx)
-    elif which_sources == [1,3]:
-        core_initialization(self.T, self.X, self.Z, self.b_tx, self.b_tz, idx_of_trip, trip_of_idx)
-    elif which_sources == [2,3]:
-        core_initialization(self.T, self.Y, self.Z, self.b_ty, self.b_tz, idx_of_trip, trip_of_idx)
-    else:
+    if which_sources not in ([1,2], [1,3], [2,3]):
         print("TRIVARIATE_UNQ.initialization(): which_sources takes the values [1,2], [1,3], or [2,3]")
         exit(1)
 
-    return idx_of_trip, trip_of_idx
+    return self.support.project( [0] + list(which_sources) )
 #^ initialization()
 
 # ECOS's exp cone: (r,p,w)     w/   w>0  &  exp(r/w) ≤ p/w
@@ -174,63 +143,30 @@ def create_model(self, which_sources, output):
 
     # Initialize which sources for the model
     tic_all = time.process_time()
-    idx_of_trip,trip_of_idx = self.initialization(which_sources)
-    m = len(self.b_tx) + len(self.b_ty) + len(self.b_tz)
-    n = len(trip_of_idx)
+    trips,trip_of_quad = self.initialization(which_sources)
+    m_tx, m_ty, m_tz = len(self.b_tx), len(self.b_ty), len(self.b_tz)
+    m = m_tx + m_ty + m_tz
+    n = len(trips)
+    n_quads = len(self.support)
     ltrip_of_idx = n
-    n_vars = 3*n + len(self.quad_of_idx)
+    n_vars = 3*n + n_quads
     n_cons = 2*n + m
+    t,x,y,z = ( np.asarray(v, dtype=np.int64) for v in self.support.columns )
+    trip_of_quad = np.asarray(trip_of_quad, dtype=np.int64)
     
     # Create the equations: Ax = b
-    self.b = np.zeros((n_cons,),dtype=np.double)
-    
-    Eqn   = []
-    Var   = []
-    Coeff = []
+    # A is assembled column by column in CSC form: the column of r_i is
+    # empty, p_i has -1 in its q-p row n+i, w_i has -1 in its q-w row i, and
+    # q_j has +1 in the q-w row of its triplet, in the q-p row of every
+    # triplet sharing its (u,v), and in its three marginal rows.
 
     # The q-w coupling eqautions:
     #         if Sources = X,Y  q_{stv*} - w_{stv} = 0
     #         if Sources = X,Z  q_{st*v} - w_{stv} = 0
     #         if Sources = Y,Z  q_{s*tv} - w_{stv} = 0
     tic_w = time.process_time()
-    for i,stv in enumerate(trip_of_idx):
-        eqn   = i
-        w_var = sw_vidx(i)
-        Eqn.append( eqn )
-        Var.append( w_var )
-        Coeff.append( -1. )
-        (s,t,v) = stv
-        if which_sources == [1,2]:
-            for u in self.Z:
-                if (s,t,v,u) in self.idx_of_quad.keys(): 
-                    q_var = self.sq_vidx(self.idx_of_quad[ (s,t,v,u) ], ltrip_of_idx)
-                    Eqn.append( eqn )
-                    Var.append( q_var )
-                    Coeff.append( +1. )
-                #^ if q_{stv*}
-            #^ loop *xy*                
-        #^ if SXY
-        elif which_sources == [1,3]:  
-            for u in self.Y:
-                if (s,t,u,v) in self.idx_of_quad.keys(): 
-                    q_var = self.sq_vidx(self.idx_of_quad[ (s,t,u,v) ], ltrip_of_idx)
-                    Eqn.append( eqn )
-                    Var.append( q_var )
-                    Coeff.append( +1. )
-                #^ if q_{st*v}
-            #^ loop *x*z                
-        #^ if SXZ
-        elif which_sources == [2,3]:
-            for u in self.X:
-                if (s,u,t,v) in self.idx_of_quad.keys(): 
-                    q_var = self.sq_vidx(self.idx_of_quad[ (s,u,t,v) ], ltrip_of_idx)
-                    Eqn.append( eqn )
-                    Var.append( q_var )
-                    Coeff.append( +1. )
-                #^ if q_{s*tv}
-            #^ loop **yz                
-        #^if SYZ
-    #^ for stv
+    # q_{stvu} enters the equation of its triplet (s,t,v)
+    row_w = trip_of_quad
     toc_w = time.process_time()
 
     if output == 2:
@@ -238,97 +174,26 @@ def create_model(self, which_sources, output):
         if which_sources == [1,3]: print("TRIVARIATE_UNQ.create_model(): Time to create q-w coupling equations [min -H(S|X,Z)]:", toc_w - tic_w, "secs")
         if which_sources == [2,3]: print("TRIVARIATE_UNQ.create_model(): Time to create q-w coupling equations [min -H(S|Y,Z)]:", toc_w - tic_w, "secs")
 
-    # running number
-    eqn = -1 + len(trip_of_idx)
-    
     # The q-p coupling equations:
     #         if Sources = X,Y  q_{*tv*} - p_{stv} = 0
     #         if Sources = X,Z  q_{*t*v} - p_{stv} = 0
     #         if Sources = Y,Z  q_{**tv} - p_{stv} = 0
-    # ( Expensive step )
     tic_p = time.process_time()
 
-    Eqn_dict = defaultdict(lambda: 0.)
-    Eqn_dict_num = defaultdict(int)
-    Eqn_dict_acc = defaultdict(list)
-    Var_dict = defaultdict(list)
-    Coeff_dict = defaultdict(list)
-
-    if which_sources == [1,2]:
-        for i,stv in enumerate(trip_of_idx):
-            s,t,v = stv
-            eqn     += 1
-            Eqn_dict[(s,t,v)] = eqn
-        #^ for 
-            
-        for i,utvw in enumerate(self.quad_of_idx):
-            u,t,v,w = utvw
-            if (t,v) in self.b_xy.keys():
-                Eqn_dict_num[(t,v)] += 1
-                Coeff_dict[(t,v)].append(+1.)
-                q_var = self.sq_vidx(self.idx_of_quad[ (u,t,v,w) ], ltrip_of_idx)
-                Var_dict[(t,v)].append(q_var)
-            #^ if *xy* exists
-        #^ for utvw
-        for i,stv in enumerate(trip_of_idx):
-            s,t,v = stv
-            temp = [Eqn_dict[(s,t,v)]]*Eqn_dict_num[(t,v)]
-            Eqn_dict_acc[(s,t,v)] += temp
-        # for 
-    elif which_sources == [1,3]:
-        for i,stv in enumerate(trip_of_idx):
-            s,t,v = stv
-            eqn     += 1
-            Eqn_dict[(s,t,v)] = eqn
-        #^ for
-        for i,utwv in enumerate(self.quad_of_idx):
-            u,t,w,v = utwv
-            if (t,v) in self.b_xz.keys():
-                Eqn_dict_num[(t,v)] += 1
-                Coeff_dict[(t,v)].append(+1.)
-                q_var = self.sq_vidx(self.idx_of_quad[ (u,t,w,v) ], ltrip_of_idx)
-                Var_dict[(t,v)].append(q_var)
-            #^ if *x*z exists
-        #^ for utwv
-
-        for i,stv in enumerate(trip_of_idx):
-            s,t,v = stv
-            temp = [Eqn_dict[(s,t,v)]]*Eqn_dict_num[(t,v)]
-            Eqn_dict_acc[(s,t,v)] += temp
-        # for
-    elif which_sources == [2,3]:
-        for i,stv in enumerate(trip_of_idx):
-            s,t,v = stv
-            eqn     += 1
-            Eqn_dict[(s,t,v)] = eqn
-        #^ for
-        for i,uwtv in enumerate(self.quad_of_idx):
-            u,w,t,v = uwtv
-            if (t,v) in self.b_yz.keys():
-                Eqn_dict_num[(t,v)] += 1
-                Coeff_dict[(t,v)].append(+1.)
-                q_var = self.sq_vidx(self.idx_of_quad[ (u,w,t,v) ], ltrip_of_idx)
-                Var_dict[(t,v)].append(q_var)
-            #^ if **yz exists
-        #^ for utwv
-
-        for i,stv in enumerate(trip_of_idx):
-            s,t,v = stv
-            temp = [Eqn_dict[(s,t,v)]]*Eqn_dict_num[(t,v)]
-            Eqn_dict_acc[(s,t,v)] += temp
-        # for
-    #^ if which sources
-    
-    for i,stv in enumerate(trip_of_idx):
-            s,t,v = stv
-            p_var   = sp_vidx(i)
-            Eqn.append( Eqn_dict[(s,t,v)] )
-            Eqn += Eqn_dict_acc[(s,t,v)]
-            Var.append( p_var )
-            Var += Var_dict[(t,v)]
-            Coeff.append( -1. )
-            Coeff += Coeff_dict[(t,v)] 
-    #^ for stv
+    if which_sources == [1,2]:   b_uv = self.P_xy
+    elif which_sources == [1,3]: b_uv = self.P_xz
+    else:                        b_uv = self.P_yz
+    u_col = self.support.columns[which_sources[0]]
+    v_col = self.support.columns[which_sources[1]]
+
+    # Only q_{*tv*} with (t,v) in the support of the (U,V) marginal enter,
+    # namely the equations of all triplets sharing its (t,v)
+    uv, group = trips.project((1,2))
+    k_g     = np.bincount(group, minlength=len(uv))
+    members = np.argsort(group, kind='stable')          # triplets grouped by (u,v), ascending within a group
+    start_g = np.concatenate(( [0], np.cumsum(k_g)[:-1] )).astype(np.int64)
+    g       = group[trip_of_quad]
+    k       = np.where( b_uv[u_col,v_col] > 0, k_g[g], 0 )
     toc_p = time.process_time()
     
     if output == 2:
@@ -339,116 +204,14 @@ def create_model(self, which_sources, output):
     # Create the marginal constraints
     
     # The sx marginals q_{sx**} = b^x_{sx}
-    tic_m = time.process_time()
-    Eqn_marg = defaultdict(lambda: 0.)
-    Eqn_marg_num = defaultdict(int)
-    Eqn_marg_acc = defaultdict(list)
-    Var_marg = defaultdict(list)
-    Coeff_marg = defaultdict(list)
-
-    for sx,i in self.b_tx.items():
-        (s,x) = sx
-        eqn += 1
-        Eqn_marg[(s,x)] = eqn
-    #^ for sx exists
-        
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        if (s,x) in self.b_tx.keys():
-            q_var = self.sq_vidx(self.idx_of_quad[ (s,x,y,z) ], ltrip_of_idx)
-            Var_marg[(s,x)].append(q_var)
-            Coeff_marg[(s,x)].append(+1.)
-            Eqn_marg_num[(s,x)] += 1
-            self.b[ Eqn_marg[(s,x)] ] = self.b_tx[(s,x)]
-        #^ if sx exits
-    # for sxyz
-    
-    for sx,i in self.b_tx.items():
-        (s,x) = sx
-        temp = [ Eqn_marg[(s,x)] ]*Eqn_marg_num[(s,x)]
-        Eqn_marg_acc[(s,x)] += temp
-    #^ for  sx exists    
-    
-    for sx,i in self.b_tx.items():
-        (s,x) = sx
-        Eqn += Eqn_marg_acc[(s,x)]
-        Var += Var_marg[(s,x)]
-        Coeff += Coeff_marg[(s,x)]
-    #^ for sx exists
-
     # The sy marginals q_{s*y*} = b^y_{sy}
-
-    Eqn_marg = defaultdict(lambda: 0.)
-    Eqn_marg_num = defaultdict(int)
-    Eqn_marg_acc = defaultdict(list)
-    Var_marg = defaultdict(list)
-    Coeff_marg = defaultdict(list)
-    for sy,i in self.b_ty.items():
-        (s,y) = sy
-        eqn += 1
-        Eqn_marg[(s,y)] = eqn
-    #^ for sy exists
-        
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        if (s,y) in self.b_ty.keys():
-            q_var = self.sq_vidx(self.idx_of_quad[ (s,x,y,z) ], ltrip_of_idx)
-            Var_marg[(s,y)].append(q_var)
-            Coeff_marg[(s,y)].append(+1.)
-            Eqn_marg_num[(s,y)] += 1
-            self.b[ Eqn_marg[(s,y)] ] = self.b_ty[(s,y)]
-        #^ if sy exits
-    # for sxyz
-    
-    for sy,i in self.b_ty.items():
-        (s,y) = sy
-        temp = [ Eqn_marg[(s,y)] ]*Eqn_marg_num[(s,y)]
-        Eqn_marg_acc[(s,y)] += temp
-    #^ for  sy exists   
-        
-    for sy,i in self.b_ty.items():
-        (s,y) = sy
-        Eqn += Eqn_marg_acc[(s,y)]
-        Var += Var_marg[(s,y)]
-        Coeff += Coeff_marg[(s,y)]
-    #^ for sy exists
-
     # The sz marginals q_{s**z} = b^z_{sz}
-    Eqn_marg = defaultdict(lambda: 0.)
-    Eqn_marg_num = defaultdict(int)
-    Eqn_marg_acc = defaultdict(list)
-    Var_marg = defaultdict(list)
-    Coeff_marg = defaultdict(list)
-
-    for sz,i in self.b_tz.items():
-        (s,z) = sz
-        eqn += 1
-        Eqn_marg[(s,z)] = eqn
-    #^ for sz exists
-    
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        if (s,z) in self.b_tz.keys():
-            q_var = self.sq_vidx(self.idx_of_quad[ (s,x,y,z) ], ltrip_of_idx)
-            Var_marg[(s,z)].append(q_var)
-            Coeff_marg[(s,z)].append(+1.)
-            Eqn_marg_num[(s,z)] += 1
-            self.b[ Eqn_marg[(s,z)] ] = self.b_tz[(s,z)]
-        #^ if sz exits
-    # for sxyz
-    
-    for sz,i in self.b_tz.items():
-        (s,z) = sz
-        temp = [ Eqn_marg[(s,z)] ]*Eqn_marg_num[(s,z)]
-        Eqn_marg_acc[(s,z)] += temp
-    #^ for  sz exists    
-        
-    for sz,i in self.b_tz.items():
-        (s,z) = sz
-        Eqn += Eqn_marg_acc[(s,z)]
-        Var += Var_marg[(s,z)]
-        Coeff += Coeff_marg[(s,z)]
-    #^ for sz exists
+    tic_m = time.process_time()
+    offset = 2*n
+    row_tx = offset + self.rank_tx[t,x]
+    row_ty = offset + m_tx + self.rank_ty[t,y]
+    row_tz = offset + m_tx + m_ty + self.rank_tz[t,z]
+    b = self.marginal_rhs(offset)
     toc_m = time.process_time()
     
     if output == 2:
@@ -458,50 +221,47 @@ def create_model(self, which_sources, output):
 
     # Store the constraints in A
     tic_rest = time.process_time()
-    self.A = sparse.csc_matrix( (Coeff, (Eqn,Var)), shape=(n_cons,n_vars), dtype=np.double)
-    
-    # Generalized ieqs: gen.nneg of the variable triple (r_i,w_i,p_i), i=0,dots,n-1: 
-    Ieq   = []
-    Var   = []
-    Coeff = []
-
-    # Adding q_{s,x,y,z} >= 0 or q_{s,x,y,z} is free variable
-    for i,sxyz in enumerate(self.quad_of_idx):
-        q_var = self.sq_vidx(i, ltrip_of_idx)
-        Ieq.append( len(Ieq) )
-        Var.append( q_var )
-        Coeff.append( -1. )
-    #^ for sxyz
-
-    for i,stv in enumerate(trip_of_idx):
-        r_var = sr_vidx(i)
-        w_var = sw_vidx(i)
-        p_var = sp_vidx(i)
-        
-        Ieq.append( len(Ieq) )
-        Var.append( r_var )
-        Coeff.append( -1. )
-        
-        Ieq.append( len(Ieq) )
-        Var.append( p_var )
-        Coeff.append( -1. )
-        
-        Ieq.append( len(Ieq) )
-        Var.append( w_var )
-        Coeff.append( -1. )
-    #^ for stv
-
-    self.G         = sparse.csc_matrix( (Coeff, (Ieq,Var)), shape=(n_vars,n_vars), dtype=np.double)
-    self.h         = np.zeros( (n_vars,),dtype=np.double )
-    self.dims = dict()
-    self.dims['e'] = n
-    self.dims['l'] = len(self.quad_of_idx)
+    # Entries: one per p_i and w_i, then 1 + k_j + 3 per q_j
+    size_q  = 1 + k + 3
+    off_q   = 2*n + np.concatenate(( [0], np.cumsum(size_q) )).astype(np.int64)
+    nnz     = int(off_q[-1])
+    idx     = self.index_dtype(max(nnz, n_cons, n_vars))
+    indices = np.empty(nnz, dtype=idx)
+    data    = np.ones(nnz, dtype=np.double)
+
+    indices[0:2*n:2] = n + np.arange(n)                 # p_i
+    indices[1:2*n:2] = np.arange(n)                     # w_i
+    data[:2*n]       = -1.
+
+    indices[off_q[:-1]] = row_w
+    seg_start = np.repeat(off_q[:-1] + 1, k)
+    within    = np.arange(len(seg_start)) - np.repeat(np.cumsum(k) - k, k)
+    indices[seg_start + within] = n + members[ np.repeat(start_g[g], k) + within ]
+    last = off_q[1:] - 3
+    indices[last]     = row_tx
+    indices[last + 1] = row_ty
+    indices[last + 2] = row_tz
+
+    # The columns of r_i, p_i, w_i start at 2i, 2i, 2i+1, the column of q_j at off_q[j]
+    indptr = np.empty(n_vars + 1, dtype=idx)
+    indptr[0:3*n:3] = 2*np.arange(n)
+    indptr[1:3*n:3] = 2*np.arange(n)
+    indptr[2:3*n:3] = 2*np.arange(n) + 1
+    indptr[3*n:]    = off_q
+    A = sparse.csc_matrix( (data, indices, indptr), shape=(n_cons,n_vars) )
+    
+    # Generalized ieqs: q_{s,x,y,z} >= 0 in the rows 0,...,n_quads-1, and
+    # gen.nneg of the variable triple (r_i,p_i,w_i), i=0,dots,n-1, in the rows below
+    G_rows = np.concatenate(( n_quads + np.arange(3*n), np.arange(n_quads) )).astype(idx)
+    G         = sparse.csc_matrix( (-np.ones(n_vars), G_rows, np.arange(n_vars + 1, dtype=idx)), shape=(n_vars,n_vars) )
+    h         = np.zeros( (n_vars,),dtype=np.double )
+    dims = dict()
+    dims['e'] = n
+    dims['l'] = n_quads
     
     # Objective function:
-    self.c = np.zeros( (n_vars,),dtype=np.double )
-    for i,stv in enumerate(trip_of_idx):
-        self.c[ sr_vidx(i) ] = -1.
-    #^ for stv
+    c = np.zeros( (n_vars,),dtype=np.double )
+    c[ sr_vidx(np.arange(n)) ] = -1.
 
     toc_rest = time.process_time()
     if output == 2:
@@ -514,11 +274,46 @@ def create_model(self, which_sources, output):
         if which_sources == [1,3]: print("TRIVARIATE_UNQ.create_model(): Time to create model [min -H(S|X,Z)]:", toc_all - tic_all, "secs")
         if which_sources == [2,3]: print("TRIVARIATE_UNQ.create_model(): Time to create model [min -H(S|Y,Z)]:", toc_all - tic_all, "secs")
 
-    return self.c, self.G, self.h, self.dims, self.A, self.b
+    return self.model(c, G, h, dims, A, b)
 
 #^ create_model()
 
-def solve(self, c, G, h, dims, A, b, output):
+def model_size(supp_tx, supp_ty, supp_tz, supp_uv, which_sources):
+    """Counts the size of the exponential Cone Program min_{Delta_p}H(T|U,V) without creating it
+
+        With W the third source, the program has sum_t |U_t||V_t| triplets
+        and n = sum_t |U_t||V_t||W_t| quadruples; q_{tuvw} enters the q-p
+        equations of the K(u,v) = #{ t : P(t,u), P(t,v) > 0 } triplets of
+        its (u,v) if P(u,v) > 0. Only products of the marginal supports are
+        computed.
+
+        Args:
+             supp_tx, supp_ty, supp_tz: numpy.array - bool, P(T,X) > 0 etc.
+
+             supp_uv: numpy.array - bool, P(U,V) > 0
+
+             which_sources: list(int) - [1,2] if sources are X and Y
+                                        [1,3] if sources are X and Z
+                                        [2,3] if sources are Y and Z
+
+        Returns:
+            dictionary - as TRIVARIATE_SYN.model_size()
+    """
+    B = [ np.asarray(S, dtype=np.int64) for S in (supp_tx, supp_ty, supp_tz) ]
+    B_u, B_v = B[which_sources[0]-1], B[which_sources[1]-1]
+    B_w      = B[6 - which_sources[0] - which_sources[1] - 1]
+    m        = int( B[0].sum() + B[1].sum() + B[2].sum() )
+    n_trips  = int(np.sum( B_u.sum(axis=1)*B_v.sum(axis=1) ))
+    n_quads  = int(np.sum( B_u.sum(axis=1)*B_v.sum(axis=1)*B_w.sum(axis=1) ))
+    K        = B_u.T.dot(B_v)                                   # triplets of (u,v)
+    Q        = B_u.T.dot(B_w.sum(axis=1)[:,None]*B_v)          # quadruples of (u,v)
+    nnz_qp   = int(np.sum( (K*Q)[np.asarray(supp_uv, dtype=bool)] ))
+    n_vars   = 3*n_trips + n_quads
+    return dict( variables=n_vars, equations=2*n_trips + m, cones=n_trips, nonnegative=n_quads,
+                 nnz_A=2*n_trips + 4*n_quads + nnz_qp, nnz_G=n_vars )
+#^ model_size()
+
+def solve(self, c, G, h, dims, A, b, output, which_sources=None):
     """Solves the exponential Cone Program min_{Delta_p}H(T|U,V) where U,V in {X,Y,Z}
         
         Args:
@@ -539,6 +334,9 @@ def solve(self, c, G, h, dims, A, b, output):
             b: numpy.array - L.H.S. of equalities 
 
             output: int - print different outputs based on (int) to console
+
+            which_sources: list(int) - [1,2], [1,3], or [2,3] (needed by the
+                           NumPy engine only, default = None)
  
        Returns: 
             sol_rpq:    numpy.array - primal optimal solution
@@ -549,7 +347,7 @@ def solve(self, c, G, h, dims, A, b, output):
 
             sol_mu:     numpy.array - inequalities dual  optimal solution   
 
-            sol_info:   dictionary - Brief stats of the optimization from ECOS
+            sol_info:   dictionary - Brief stats of the optimization from the cone solver
 
     """
 
@@ -561,7 +359,21 @@ def solve(self, c, G, h, dims, A, b, output):
         self.ecos_kwargs["verbose"] = self.verbose
     #^ if
     
-    solution = ecos.solve(c, G, h, dims, A, b, **self.ecos_kwargs)
+    if self.cone_solver == 'NumPy':
+        # The NumPy engine solves the program itself (in the layout of create_model())
+        assert which_sources is not None, "TRIVARIATE_UNQ.solve(): The NumPy engine needs which_sources"
+        solution = TRIVARIATE_MAXENT.solve_unq(self, which_sources, output, **self.ecos_kwargs)
+    elif self.presolve:
+        # Fix the forced variables, solve the rest (block by block if decompose)
+        solution = TRIVARIATE_PRESOLVE.solve_presolved(c, G, h, dims, A, b, decompose=self.decompose, cone_solver=self.cone_solver, **self.ecos_kwargs)
+        if output == 2 and 'info' in solution.keys(): print("TRIVARIATE_UNQ.solve(): Number of variables eliminated by presolve:", solution['info']['eliminated'])
+    elif self.decompose:
+        # Solve the independent blocks of the program separately
+        solution = TRIVARIATE_PRESOLVE.solve_by_components(c, G, h, dims, A, b, cone_solver=self.cone_solver, **self.ecos_kwargs)
+        if output == 2 and 'info' in solution.keys(): print("TRIVARIATE_UNQ.solve(): Number of independent blocks:", solution['info']['components'])
+    else:
+        solution = TRIVARIATE_BACKENDS.solve(self.cone_solver, c, G, h, dims, A, b, **self.ecos_kwargs)
+    #^ if decompose
 
     if 'x' in solution.keys():
         self.sol_rpq    = solution['x']
@@ -606,19 +418,18 @@ def check_feasibility(self, which_sources, sol_rpq, sol_slack, sol_lambda, sol_m
     """
 
     # returns pair (p,d) of primal/dual infeasibility (maxima)
-    idx_of_trip,trip_of_idx = self.initialization(which_sources)
+    trips,trip_of_quad = self.initialization(which_sources)
 
-    n = len(trip_of_idx)
+    n = len(trips)
+    n_quads = len(self.support)
     ltrip_of_idx = n
+    t,x,y,z = self.support.columns
+    q = sol_rpq[self.sq_vidx(np.arange(n_quads), ltrip_of_idx)]
     # Primal infeasiblility
     
     # non-negative ineqaulity
     itic_neg = time.process_time()
-    max_q_negativity = 0.
-    for i in range(len(self.quad_of_idx)):
-        max_q_negativity = max(max_q_negativity, -sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-    #^ for
-    toc_neg = time.time()
+    max_q_negativity = max(0., -q.min()) if n_quads > 0 else 0.
     itoc_neg = time.process_time()
     if output == 2:
         if which_sources == [1,2]: print("TRIVARIATE_UNQ.check_feasibility(): Time to compute primal negativity violations [min -H(S|XY)]:", itoc_neg - itic_neg, "secs")
@@ -628,41 +439,14 @@ def check_feasibility(self, which_sources, sol_rpq, sol_slack, sol_lambda, sol_m
     max_violation_of_eqn = 0.
 
     itic_marg = time.process_time()
-    # sx** - marginals:
-    sol_b_sx = defaultdict(lambda: 0.)
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        sol_b_sx[s,x] += max(0., sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-    #^ for sxyz exists 
-    for sx,i in self.b_tx.items():
-        s,x  = sx
-        mysum = i - sol_b_sx[s,x]
-        max_violation_of_eqn = max( max_violation_of_eqn, abs(mysum) )
-    #^ for sx exists
-    
-    # s*y* - marginals:
-    sol_b_sy = defaultdict(lambda: 0.)
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        sol_b_sy[s,y] += max(0., sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-    #^ for sxyz exists 
-    for sy,i in self.b_ty.items():
-        s,y  = sy
-        mysum = i - sol_b_sy[s,y]
-        max_violation_of_eqn = max( max_violation_of_eqn, abs(mysum) )
-    #^ for sy exists
-    
-    # s**z - marginals:
-    sol_b_sz = defaultdict(lambda: 0.)
-    for i,sxyz in enumerate(self.quad_of_idx):
-        s,x,y,z = sxyz
-        sol_b_sz[s,z] += max(0., sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-    #^ for sxyz exists 
-    for sz,i in self.b_tz.items():
-        s,z  = sz
-        mysum = i - sol_b_sz[s,z]
-        max_violation_of_eqn = max( max_violation_of_eqn, abs(mysum) )
-    #^ for sz exists
+    q_pos = np.maximum(q, 0.)
+    for marg,v in ( (self.P_tx,x), (self.P_ty,y), (self.P_tz,z) ):
+        # sx** - marginals, s*y* - marginals, s**z - marginals:
+        sol_b = np.zeros(marg.shape)
+        np.add.at(sol_b, (t,v), q_pos)
+        exists = marg > 0
+        if exists.any(): max_violation_of_eqn = max( max_violation_of_eqn, np.abs(marg - sol_b)[exists].max() )
+    #^ for marginals
     itoc_marg = time.process_time()
     
     if output == 2:
@@ -676,206 +460,37 @@ def check_feasibility(self, which_sources, sol_rpq, sol_slack, sol_lambda, sol_m
     # Dual infeasiblility
 
     dual_infeasability = 0.
-    tic_idx = time.time()
-    itic_idx = time.process_time()
-    idx_of_sx = dict()
-    i = 0
-    for s in self.T:
-        for x in self.X:
-            if (s,x) in self.b_tx.keys():
-                idx_of_sx[(s,x)] = i
-                i += 1
-            #^ if sx exists
-        #^ for x
-    #^ for s
-
-    idx_of_sy = dict()
-    i = 0
-    for s in self.T:
-        for y in self.Y:
-            if (s,y) in self.b_ty.keys():
-                idx_of_sy[(s,y)] = i
-                i += 1
-            #^ if sy exists
-        #^ for y
-    #^ for s
-
-    idx_of_sz = dict()
-    i = 0
-    for s in self.T:
-        for z in self.Z:
-            if (s,z) in self.b_tz.keys():
-                idx_of_sz[(s,z)] = i
-                i += 1
-            #^ if sz exists
-        #^ for z
-    #^ for s
-    itoc_idx = time.process_time()
-    
-    if output == 2:
-        if which_sources == [1,2]: print("TRIVARIATE_UNQ.check_feasibility(): Time to find correct dual idx [min -H(S|XY)]:", itoc_idx - itic_idx, "secs")
-        if which_sources == [1,3]: print("TRIVARIATE_UNQ.check_feasibility(): Time to find correct dual idx [min -H(S|XZ)]:", itoc_idx - itic_idx, "secs")
-        if which_sources == [2,3]: print("TRIVARIATE_UNQ.check_feasibility(): Time to find correct dual idx [min -H(S|YZ)]:", itoc_idx - itic_idx, "secs")
 
     # non-negativity dual ineqaulity
-    
-    itic_negD12 = time.process_time()
-    if which_sources == [1,2]:
-
-        # Get indices of dual variables of the marginal constriants
-        sz_idx = defaultdict(lambda: 0.)
-        for i,sxyz in enumerate(self.quad_of_idx):
-            s,x,y,z = sxyz
-            sz_idx[(s,x,y)] = 2*n + len(self.b_tx) + len(self.b_ty) + idx_of_sz[(s,z)]
-        #^ for
-        
-        # Compute mu_xy: dual varaible of the q-t coupling contsraints
-        mu_xy = defaultdict(lambda: 0.)
-        for k, sxy in enumerate(trip_of_idx):
-            s,x,y = sxy
-            mu_xy[(x,y)] += sol_lambda[ n + idx_of_trip[(s,x,y)] ]
-        #^ for sxy
-        
-        for k, sxy in enumerate(trip_of_idx):
-            s,x,y = sxy
-            sx_idx = 2*n + idx_of_sx[(s,x)]
-            sy_idx = 2*n + len(self.b_tx) + idx_of_sy[(s,y)]
-            # nu_sxy: dual variable of the q-w coupling constraints
-            nu_sxy = sol_lambda[ idx_of_trip[(s,x,y)] ]
-            assert nu_sxy == sol_lambda[k], "problem in nu"
-
-            # mu_sxy: dual varaible of the q-t coupling contsraints
-            mu_sxy = sol_lambda[ n + idx_of_trip[(s,x,y)] ]
-            assert mu_sxy == sol_lambda[ n + k ], "problem in mu"
-            
-
-            # Find the most violated nonnegative dual ieq 
-            #     a      >= 0
-            dual_infeasability = max(dual_infeasability, -sol_lambda[sx_idx]
-                                     - sol_lambda[sy_idx]
-                                     - sol_lambda[ int(sz_idx[(s,x,y)]) ]
-                                     - mu_xy[(x,y)]
-                                     - nu_sxy
-            )
-
-
-            # Find the most violated K_exp dual ieq
-            # print("dual of kexp: ", sol_lambda[sx_idx]
-            #   + sol_lambda[sy_idx]
-            #   + mu_xy
-            #   - nu_sxy
-            #   +ln(-mu_sxy)
-            #   +1)
-        #^ for
-        itoc_negD12 = time.process_time()
-        if output == 2: print("TRIVARIATE_UNQ.check_feasibility(): Time to compute neagtive dual violations [min -H(S|XY)]:", itoc_negD12 - itic_negD12, "secs")
-    #^ if sources
-    
-    itic_negD13 = time.process_time()
-    if which_sources == [1,3]:
-
-        # Get indices of dual variables of the marginal constriants
-        sy_idx = defaultdict(lambda: 0.)
-        for i,sxyz in enumerate(self.quad_of_idx):
-            s,x,y,z = sxyz
-            sy_idx[(s,x,z)] = 2*n + len(self.b_tx) + idx_of_sy[(s,y)]
-        #^ for
-
-        # mu_xz: dual varaible of the q-t coupling contsraints
-        mu_xz = defaultdict(lambda: 0.)
-        for k, sxz in enumerate(trip_of_idx):
-            s,x,z = sxz
-            mu_xz[(x,z)] += sol_lambda[ n + idx_of_trip[(s,x,z)] ]
-        #^ for sxz
-        
-        for k, sxz in enumerate(trip_of_idx):
-            s,x,z = sxz
-            # Get indices of dual variables of the marginal constriants
-            sx_idx = 2*n + idx_of_sx[(s,x)]
-            sz_idx = 2*n + len(self.b_tx) + len(self.b_ty) + idx_of_sz[(s,z)]
-
-            # nu_sxz: dual variable of the q-w coupling constraints
-            
-            nu_sxz = sol_lambda[ idx_of_trip[(s,x,z)] ]
-            assert nu_sxz == sol_lambda[k], "problem in nu"
-
-            # mu_sxz: dual varaible of the q-t coupling contsraints
-            mu_sxz = sol_lambda[ n + idx_of_trip[(s,x,z)] ]
-            assert mu_sxz == sol_lambda[ n + k ], "problem in mu"
-
-            # Find the most violated nonnegative dual ieq 
-            #     a      >= 0
-            dual_infeasability = max(dual_infeasability, -sol_lambda[sx_idx]
-                                         - sol_lambda[sy_idx[(s,x,z)]]
-                                         - sol_lambda[sz_idx]
-                                         - mu_xz[(x,z)]
-                                         - nu_sxz
-            )
-
-            # Find the most violated K_exp dual ieq
-            # print("dual of kexp: ", sol_lambda[sx_idx]
-            #   + sol_lambda[sz_idx]
-            #   + mu_xz
-            #   - nu_sxz
-            #   +ln(-mu_sxz)
-            #   +1)
-        #^ for
-        itoc_negD13 = time.process_time()
-        if output == 2 : print("TRIVARIATE_UNQ.check_feasibility(): Time to compute neagtive dual violations [min -H(S|XZ)]:", itoc_negD13 - itic_negD13, "secs")
-    #^ if sources 
-
-    itic_negD23 = time.process_time()
-    if which_sources == [2,3]:
-
-        # Get indices of dual variables of the marginal constriants
-        sx_idx = defaultdict(lambda: 0.)
-        for i,sxyz in enumerate(self.quad_of_idx):
-            s,x,y,z = sxyz
-            sx_idx[(s,y,z)] = 2*n + idx_of_sx[(s,x)]
-        #^ for
-
-        # mu_yz: dual varaible of the q-t coupling contsraints 
-        mu_yz = defaultdict(lambda: 0.)
-        for k, syz in enumerate(trip_of_idx):
-            s,y,z = syz
-            mu_yz[(y,z)] += sol_lambda[ n + idx_of_trip[(s,y,z)] ]
-        #^ for syz
-        
-        for k, syz in enumerate(trip_of_idx):
-            s,y,z = syz
-            # Get indices of dual variables of the marginal constriants
-            sy_idx = 2*n + len(self.b_tx) + idx_of_sy[(s,y)]
-            sz_idx = 2*n + len(self.b_tx) + len(self.b_ty) + idx_of_sz[(s,z)]
-
-            # nu_syz: dual variable of the q-w coupling constraints
-            
-            nu_syz = sol_lambda[idx_of_trip[(s,y,z)]]
-            assert nu_syz == sol_lambda[k], "problem in nu"
-
-            # mu_sxy: dual varaible of the q-t coupling contsraints
-            mu_syz = sol_lambda[ n + idx_of_trip[(s,y,z)] ]
-            assert mu_syz == sol_lambda[ n + k ], "problem in mu"
-            
-            # Find the most violated nonnegative dual ieq 
-            #     a      >= 0
-            dual_infeasability = max(dual_infeasability, -sol_lambda[sx_idx[(s,y,z)]]
-                                         - sol_lambda[sy_idx]
-                                         - sol_lambda[sz_idx]
-                                         - mu_yz[(y,z)]
-                                         - nu_syz
-            )
-
-            # Find the most violated K_exp dual ieq
-            # print("dual of kexp: ", sol_lambda[sy_idx]
-            #   + sol_lambda[sz_idx]
-            #   + mu_yz
-            #   - nu_syz
-            #   +ln(-mu_syz)
-            #   +1)
-        #^ for
-        itoc_negD23 = time.process_time()
-        if output == 2: print("TRIVARIATE_UNQ.check_feasibility(): Time to compute neagtive dual violations [min -H(S|YZ)]:", itoc_negD23 - itic_negD23, "secs")
-    #^ if sources
+    itic_negD = time.process_time()
+
+    # Get indices of dual variables of the marginal constriants
+    sx_idx = 2*n + self.rank_tx[t,x]
+    sy_idx = 2*n + len(self.b_tx) + self.rank_ty[t,y]
+    sz_idx = 2*n + len(self.b_tx) + len(self.b_ty) + self.rank_tz[t,z]
+
+    # nu_stv: dual variable of the q-w coupling constraints
+    nu_stv = sol_lambda[trip_of_quad]
+
+    # mu_tv: sum of the dual varaibles of the q-t coupling contsraints of (*,t,v)
+    pairs,pair_of_trip = trips.project((1,2))
+    mu_tv = np.bincount(pair_of_trip, weights=sol_lambda[n:2*n], minlength=len(pairs))[pair_of_trip[trip_of_quad]]
+
+    # Find the most violated nonnegative dual ieq 
+    #     a      >= 0
+    if n_quads > 0:
+        dual_infeasability = max(dual_infeasability, np.max( -sol_lambda[sx_idx]
+                                                            - sol_lambda[sy_idx]
+                                                            - sol_lambda[sz_idx]
+                                                            - mu_tv
+                                                            - nu_stv ) )
+    #^ if
+    itoc_negD = time.process_time()
+    if output == 2:
+        if which_sources == [1,2]: print("TRIVARIATE_UNQ.check_feasibility(): Time to compute neagtive dual violations [min -H(S|XY)]:", itoc_negD - itic_negD, "secs")
+        if which_sources == [1,3]: print("TRIVARIATE_UNQ.check_feasibility(): Time to compute neagtive dual violations [min -H(S|XZ)]:", itoc_negD - itic_negD, "secs")
+        if which_sources == [2,3]: print("TRIVARIATE_UNQ.check_feasibility(): Time to compute neagtive dual violations [min -H(S|YZ)]:", itoc_negD - itic_negD, "secs")
+    #^ if printing
      
     return primal_infeasability, dual_infeasability
 #^ check_feasibility()    
@@ -911,45 +526,15 @@ def marginals(self, which_sources, sol_rpq, output):
              output: int - print different outputs based on (int) to console
              
         Returns: 
-            dictionary - optimal marginal distribution of T
-              keys: t
-              values: Q(t)
-            dictionary - optimal marginal distribution of X
-              keys: x
-              values: Q(x)
-            dictionary - optimal marginal distribution of Y
-              keys: y
-              values: Q(y)
-            dictionary - optimal marginal distribution of Z
-              keys: z
-              values: Q(z)
-            dictionary - optimal marginal distribution of (T,X)
-              keys: t,x
-              values: Q(t,x)
-            dictionary - optimal marginal distribution of (T,Y)
-              keys: t,y
-              values: Q(t,y)
-            dictionary - optimal marginal distribution of (T,Z)
-              keys: t,z
-              values: Q(t,z)
-            dictionary - optimal marginal distribution of (X,Y)
-              keys: x,y
-              values: Q(x,y)
-            dictionary - optimal marginal distribution of (X,Z)
-              keys: x,z
-              values: Q(x,z)
-            dictionary - optimal marginal distribution of (Y,Z)
-              keys: y,z
-              values: Q(y,z)
-            dictionary - optimal marginal distribution of (T,X,Y)
-              keys: t,x,y
-              values: Q(t,x,y)
-            dictionary - optimal marginal distribution of (T,X,Z)
-              keys: t,x,z
-              values: Q(t,x,z)
-            dictionary - optimal marginal distribution of (T,Y,Z)
-              keys: t,y,z
-              values: Q(t,y,z)
+            numpy.array - optimal marginal distributions of T, X, Y, and Z
+              (four arrays indexed by the codes, e.g., Q[t])
+
+            numpy.array - optimal marginal distributions of (T,X), (T,Y), (T,Z), (X,Y), (X,Z), and (Y,Z)
+              (six dense arrays indexed by the codes, e.g., Q[t,x])
+
+            numpy.array - optimal marginal distributions of (T,X,Y), (T,X,Z), and (T,Y,Z)
+              (three arrays aligned with the triplets of initialization([1,2]),
+               initialization([1,3]), and initialization([2,3]), respectively)
         
     """
     
@@ -957,46 +542,43 @@ def marginals(self, which_sources, sol_rpq, output):
     
     itic = time.process_time()
 
+    # Initialize the triplet 
+    trips,trip_of_quad = self.initialization(which_sources)
+    ltrip_of_idx = len(trips)
+    q = np.maximum(0, sol_rpq[self.sq_vidx(np.arange(len(self.support)), ltrip_of_idx)])
+    t,x,y,z = self.support.columns
+
+    def marg_of(*which):
+        # marginal of q on the columns which (dense)
+        shape = tuple( self.support.shape[k] for k in which )
+        idx = np.ravel_multi_index([ self.support.columns[k] for k in which ], shape)
+        return np.bincount(idx, weights=q, minlength=int(np.prod(shape))).reshape(shape)
+    #^ marg_of()
+
+    def trip_marg_of(*which):
+        # marginal of q on the projection of the support onto the columns which
+        proj,group = self.support.project(which)
+        return np.bincount(group, weights=q, minlength=len(proj))
+    #^ trip_marg_of()
+
     # First order marginals
-    marg_S = defaultdict(float)
-    marg_X = defaultdict(float)
-    marg_Y = defaultdict(float)
-    marg_Z = defaultdict(float)
+    marg_S = marg_of(0)
+    marg_X = marg_of(1)
+    marg_Y = marg_of(2)
+    marg_Z = marg_of(3)
 
     # Second order marginals 
-    marg_SX = defaultdict(float)
-    marg_SY = defaultdict(float)
-    marg_SZ = defaultdict(float)
-    marg_XY = defaultdict(float)
-    marg_XZ = defaultdict(float)
-    marg_YZ = defaultdict(float)
-
-    # Third order marginals
-    marg_SXY = defaultdict(float)
-    marg_SXZ = defaultdict(float)
-    marg_SYZ = defaultdict(float)
-
-    # Initialize the triplet 
-    idx_of_trip,trip_of_idx = self.initialization(which_sources)
-    ltrip_of_idx = len(trip_of_idx)
-
-    # Compute the marginals 
-    for sxyz,i in self.idx_of_quad.items():
-        s,x,y,z = sxyz
-        marg_S[s] += max(0, sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_X[x] += max(0, sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_Y[y] += max(0, sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_Z[z] += max(0, sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_SX[(s,x)] += max(0, sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_SY[(s,y)] += max(0, sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_SZ[(s,z)] += max(0, sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_XY[(x,y)] += max(0, sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_XZ[(x,z)] += max(0, sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_YZ[(y,z)] += max(0, sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_SXY[(s,x,y)] += max(0,sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_SXZ[(s,x,z)] += max(0,sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-        marg_SYZ[(s,y,z)] += max(0,sol_rpq[self.sq_vidx(i, ltrip_of_idx)])
-    #^ for
+    marg_SX = marg_of(0,1)
+    marg_SY = marg_of(0,2)
+    marg_SZ = marg_of(0,3)
+    marg_XY = marg_of(1,2)
+    marg_XZ = marg_of(1,3)
+    marg_YZ = marg_of(2,3)
+
+    # Third order marginals (aligned with the triplets of initialization())
+    marg_SXY = trip_marg_of(0,1,2)
+    marg_SXZ = trip_marg_of(0,1,3)
+    marg_SYZ = trip_marg_of(0,2,3)
     itoc = time.process_time()
     if output == 2:
         if which_sources == [1,2]:
@@ -1028,24 +610,11 @@ def condentropy_2vars(self, which_sources, sol_rpq, output, marg_XY, marg_XZ, ma
 
              output:   int - print different outputs based on (int) to console
 
-             marg_XY:  dictionary - optimal marginal distribution of (X,Y)
-                       keys: x,y
-                       values: Q(x,y)
-             marg_XZ:  dictionary - optimal marginal distribution of (X,Z)
-                       keys: x,z
-                       values: Q(x,z)
-             marg_YZ:  dictionary - optimal marginal distribution of (Y,Z)
-                       keys: y,z
-                       values: Q(y,z)             
-             marg_TXY: dictionary - optimal marginal distribution of (T,X,Y)
-                       keys: t,x,y
-                       values: Q(t,x,y)            
-             marg_TXZ: dictionary - optimal marginal distribution of (T,X,Z)
-                        keys: t,x,z
-                        values: Q(t,x,z)
-             marg_TYZ: dictionary - optimal marginal distribution of (T,Y,Z)
-                       keys: t,y,z
-                       values: Q(t,y,z)
+             marg_XY, marg_XZ, marg_YZ: numpy.array - optimal marginal distributions
+                       of (X,Y), (X,Z), and (Y,Z) (dense, e.g., Q[x,y])
+             marg_TXY, marg_TXZ, marg_TYZ: numpy.array - optimal marginal distributions
+                       of (T,X,Y), (T,X,Z), and (T,Y,Z) (aligned with the triplets,
+                       cf. marginals())
 
         Returns: 
             (if [1,2]: U,V=X,Y | if [1,3]: U,V=X,Z | if [2,3]: U,V=Y,Z)
@@ -1055,63 +624,29 @@ def condentropy_2vars(self, which_sources, sol_rpq, output, marg_XY, marg_XZ, ma
     """
 
     # compute cond entropy of the distribution in self.sol_rpq
-    
-    mysum = 0.
-    idx_of_trip,trip_of_idx = self.initialization(which_sources)
-    if which_sources == [1,2]:
-        itic = time.process_time()
-        # H( S | X, Y )
-        for sxy in idx_of_trip.keys():
-            s,x,y = sxy
-            if marg_XY[(x,y)] > 0 and  marg_SXY[(s,x,y)] > 0:
-                # subtract q_{sxy}*log( q_{sxy}/q_{xy} )
-                mysum -= marg_SXY[(s,x,y)]*log(marg_SXY[(s,x,y)]/marg_XY[(x,y)])
-            #^ if
-        #^ for 
-        itoc = time.process_time()
 
-        if output == 2: print("TRIVARIATE_UNQ.condentropy_2vars(): Time to compute H(S|XY):", itoc - itic,"secs")
-        # print("H(T|XY)", mysum)
-        return mysum
-    #^ if sources
+    itic = time.process_time()
+    trips,trip_of_quad = self.initialization(which_sources)
+    t,u,v = trips.columns
+    if which_sources == [1,2]:
+        # H( S | X, Y ): subtract q_{sxy}*log( q_{sxy}/q_{xy} )
+        marg_UV, marg_TUV = marg_XY[u,v], marg_SXY
     elif which_sources == [1,3]:
-        # H( S | X, Z )
-        itic = time.process_time()
-
-        for sxz in idx_of_trip.keys():
-            s,x,z = sxz
-            if marg_XZ[(x,z)] > 0 and  marg_SXZ[(s,x,z)] > 0:
-                # subtract q_{sxz}*log( q_{sxz}/q_{xz} )
-                mysum -= marg_SXZ[(s,x,z)]*log(marg_SXZ[(s,x,z)]/marg_XZ[(x,z)])
-            #^ if
-        #^ for 
-        itoc = time.process_time()
-
-        if output == 2: print("TRIVARIATE_UNQ.condentropy_2vars(): Time to compute H(S|XZ):", itoc - itic,"secs")
-        # print("H(T|XZ)", mysum)
-        return mysum
-    #^ if sources
-    elif which_sources == [2,3]:
-        # H( S | Y, Z )
-        itic = time.process_time()
-
-        for syz in idx_of_trip.keys():
-            s,y,z = syz
-            if marg_YZ[(y,z)] > 0 and  marg_SYZ[(s,y,z)] > 0:
-                # subtract q_{syz}*log( q_{syz}/q_{yz} )
-                mysum -= marg_SYZ[(s,y,z)]*log(marg_SYZ[(s,y,z)]/marg_YZ[(y,z)])
-            #^ if
-        #^ for 
-        itoc = time.process_time()
-        
-        if output == 2: print("TRIVARIATE_UNQ.condentropy_2vars(): Time to compute H(S|YZ):", itoc - itic,"secs")
-        # print("H(T|YZ)", mysum)
-        return mysum
-    #^ if sources
+        # H( S | X, Z ): subtract q_{sxz}*log( q_{sxz}/q_{xz} )
+        marg_UV, marg_TUV = marg_XZ[u,v], marg_SXZ
     else:
-        print("TRIVARIATE_UNQ.condentropy_2vars(): which_sources takes the values [1,2], [1,3], [2,3]")
-        exit(1)
+        # H( S | Y, Z ): subtract q_{syz}*log( q_{syz}/q_{yz} )
+        marg_UV, marg_TUV = marg_YZ[u,v], marg_SYZ
     #^ if sources
+    pos   = (marg_UV > 0) & (marg_TUV > 0)
+    mysum = -np.sum( marg_TUV[pos]*np.log2(marg_TUV[pos]/marg_UV[pos]) )
+    itoc = time.process_time()
+
+    if output == 2:
+        if which_sources == [1,2]: print("TRIVARIATE_UNQ.condentropy_2vars(): Time to compute H(S|XY):", itoc - itic,"secs")
+        if which_sources == [1,3]: print("TRIVARIATE_UNQ.condentropy_2vars(): Time to compute H(S|XZ):", itoc - itic,"secs")
+        if which_sources == [2,3]: print("TRIVARIATE_UNQ.condentropy_2vars(): Time to compute H(S|YZ):", itoc - itic,"secs")
+    return mysum
 
 #^ condentropy_2vars()
 
@@ -0,0 +1,41 @@
+# test_accuracy.py
+# pid(accuracy=...): all programs at relaxed tolerances, only the inaccurate ones again
+import numpy as np
+import time
+from MAXENT3D_PID import pid, MAXENT3D_PID_Exception
+
+np.random.seed(1)
+pdfs = []
+for shape in ( (2,2,2,2), (4,3,3,3), (6,5,5,4) ):
+    pdf = np.random.rand(*shape)
+    pdf[pdf < 0.4] = 0
+    pdf /= pdf.sum()
+    pdfs.append( ("random pdf of shape "+str(shape), pdf) )
+#^ for shapes
+
+parms = dict()
+parms['max_iters'] = 100
+
+keys = ['CI', 'UIX', 'UIY', 'UIZ', 'UIXY', 'UIXZ', 'UIYZ', 'SI']
+try:
+  for cone_solver in ('ECOS', 'NumPy'):
+    for name, pdf in pdfs:
+      for accuracy in (1.e-4, 1.e-7):
+        tic = time.time()
+        ref = pid(pdf, cone_solver=cone_solver, output=0, **parms)
+        toc = time.time()
+        sol = pid(pdf, cone_solver=cone_solver, output=0, accuracy=accuracy, **parms)
+        toc_acc = time.time()
+        print(cone_solver, name+", accuracy", accuracy, "bits:")
+        print("  Time one phase:", toc - tic, "secs, two phases:", toc_acc - toc, "secs, solved again:", sol['Refined'])
+        print("  Max. difference to one phase:", max( abs(sol[k] - ref[k]) for k in keys ))
+        print("  Duality gaps:", sol['Num_err_I'][2], sol['Num_err_12'][2], sol['Num_err_13'][2], sol['Num_err_23'][2])
+      #^ for accuracies
+    #^ for pdfs
+  #^ for solvers
+  sol_par = pid(pdfs[-1][1], output=0, parallel='on', accuracy=1.e-7, **parms)
+  print("Max. difference of parallel='on':", max( abs(sol_par[k] - sol[k]) for k in keys ), "solved again:", sol_par['Refined'])
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+print("The End")
@@ -0,0 +1,110 @@
+# test_assembly.py
+# Compares the models of Opt_I/Opt_II.create_model() to reference models built entry by entry
+import numpy as np
+from scipy import sparse
+from MAXENT3D_PID import Opt_I, Opt_II, model_cache
+
+def reference_syn(pdf, quads):
+    """The model min -H(T|X,Y,Z) of the definition, for the quads in the given order"""
+    n = len(quads)
+    cells = [ sorted( set( (q[0],q[k]) for q in quads ) ) for k in (1,2,3) ]
+    marg  = [ pdf.sum(axis=(2,3)), pdf.sum(axis=(1,3)), pdf.sum(axis=(1,2)) ]
+    row   = dict()
+    m = n
+    for k in range(3):
+        for cell in cells[k]:
+            row[k,cell] = m
+            m += 1
+        #^ for cells
+    #^ for marginals
+    A = sparse.dok_matrix((m, 3*n))
+    b = np.zeros(m)
+    for i,(t,x,y,z) in enumerate(quads):
+        # q-p coupling equation of quad i: q_{*xyz} - p_{txyz} = 0
+        A[i, 3*i+1] = -1.
+        for j,(s,xx,yy,zz) in enumerate(quads):
+            if (xx,yy,zz) == (x,y,z): A[i, 3*j+2] = 1.
+        #^ for quads
+        # marginal equations
+        for k,v in enumerate((x,y,z)):
+            A[row[k,(t,v)], 3*i+2] = 1.
+            b[row[k,(t,v)]]        = marg[k][t,v]
+        #^ for marginals
+    #^ for quads
+    c = np.zeros(3*n)
+    c[0::3] = -1.
+    return c, -sparse.identity(3*n, format='csc'), np.zeros(3*n), { 'e': n }, A.tocsc(), b
+#^ reference_syn()
+
+def reference_unq(pdf, quads, trips, which_sources):
+    """The model min -H(T|U,V) of the definition, for the quads and triplets (t,u,v) in the given order"""
+    n, n_quads = len(trips), len(quads)
+    u, v = which_sources
+    cells = [ sorted( set( (q[0],q[k]) for q in quads ) ) for k in (1,2,3) ]
+    marg  = [ pdf.sum(axis=(2,3)), pdf.sum(axis=(1,3)), pdf.sum(axis=(1,2)) ]
+    marg_uv = pdf.sum(axis=tuple( k for k in (0,1,2,3) if k not in which_sources ))
+    row   = dict()
+    m = 2*n
+    for k in range(3):
+        for cell in cells[k]:
+            row[k,cell] = m
+            m += 1
+        #^ for cells
+    #^ for marginals
+    A = sparse.dok_matrix((m, 3*n + n_quads))
+    b = np.zeros(m)
+    for i,(t,uu,vv) in enumerate(trips):
+        # q-w coupling equation of triplet i: q_{tuv*} - w_{tuv} = 0
+        A[i, 3*i+2] = -1.
+        # q-p coupling equation of triplet i: q_{*uv*} - p_{tuv} = 0 (only the q with P(u,v) > 0)
+        A[n+i, 3*i+1] = -1.
+        for j,q in enumerate(quads):
+            if (q[0],q[u],q[v]) == (t,uu,vv): A[i, 3*n+j] = 1.
+            if (q[u],q[v]) == (uu,vv) and marg_uv[uu,vv] > 0: A[n+i, 3*n+j] = 1.
+        #^ for quads
+    #^ for triplets
+    for j,q in enumerate(quads):
+        for k in range(3):
+            A[row[k,(q[0],q[k+1])], 3*n+j] = 1.
+            b[row[k,(q[0],q[k+1])]]        = marg[k][q[0],q[k+1]]
+        #^ for marginals
+    #^ for quads
+    # q >= 0 in the rows 0,...,n_quads-1, the cones (r,p,w) below
+    G = sparse.dok_matrix((3*n + n_quads, 3*n + n_quads))
+    for j in range(n_quads): G[j, 3*n+j] = -1.
+    for i in range(3*n):     G[n_quads+i, i] = -1.
+    c = np.zeros(3*n + n_quads)
+    c[0:3*n:3] = -1.
+    return c, G.tocsc(), np.zeros(3*n + n_quads), { 'e': n, 'l': n_quads }, A.tocsc(), b
+#^ reference_unq()
+
+def same_model(model, ref):
+    c, G, h, dims, A, b = model
+    c_r, G_r, h_r, dims_r, A_r, b_r = ref
+    return ( A.shape == A_r.shape and (A != A_r).nnz == 0 and G.shape == G_r.shape and (G != G_r).nnz == 0
+             and np.array_equal(c, c_r) and np.array_equal(h, h_r) and np.array_equal(b, b_r) and dims == dims_r )
+#^ same_model()
+
+np.random.seed(0)
+for shape in ( (2,2,2,2), (3,4,2,3), (5,3,4,3) ):
+  for density in ( 0.1, 0.3, 1. ):
+    pdf = np.random.rand(*shape)
+    pdf[ np.random.rand(*shape) > density ] = 0.
+    pdf /= pdf.sum()
+    marginals = ( pdf.sum(axis=(2,3)), pdf.sum(axis=(1,3)), pdf.sum(axis=(1,2)), pdf.sum(axis=(0,3)), pdf.sum(axis=(0,2)), pdf.sum(axis=(0,1)) )
+    model_cache.clear()
+    subsolver = Opt_I(*marginals)
+    quads = list(zip(*( np.asarray(v).tolist() for v in subsolver.support.columns )))
+    supp  = set( (t,x,y,z) for t,x,y,z in np.ndindex(*shape) if marginals[0][t,x] > 0 and marginals[1][t,y] > 0 and marginals[2][t,z] > 0 )
+    print("Shape", shape, "density", density, "quads:", len(quads))
+    print("  Support of the marginals:", set(quads) == supp and len(quads) == len(supp))
+    print("  min -H(T|X,Y,Z) equal to the reference:", same_model(subsolver.create_model(0), reference_syn(pdf, quads)))
+    subsolver = Opt_II(*marginals)
+    for ws in ( [1,2], [1,3], [2,3] ):
+      trips = list(zip(*( np.asarray(v).tolist() for v in subsolver.initialization(ws)[0].columns )))
+      print("  min -H(T|"+"XYZ"[ws[0]-1]+","+"XYZ"[ws[1]-1]+") equal to the reference:", same_model(subsolver.create_model(ws, 0), reference_unq(pdf, quads, trips, ws)))
+    #^ for programs
+  #^ for densities
+#^ for shapes
+
+print("The End")
@@ -0,0 +1,31 @@
+# test_backends.py
+# The PID by the cone solvers of TRIVARIATE_BACKENDS
+import numpy as np
+import time
+import TRIVARIATE_BACKENDS
+from MAXENT3D_PID import pid, MAXENT3D_PID_Exception
+
+np.random.seed(0)
+pdf = np.random.rand(6, 5, 5, 4)
+pdf[pdf < 0.3] = 0
+pdf /= pdf.sum()
+
+keys = ['CI', 'UIX', 'UIY', 'UIZ', 'UIXY', 'UIXZ', 'UIYZ', 'SI']
+# Parameters per cone solver (SCS is first order: tolerances instead of interior-point iterations)
+parms = { 'ECOS': dict(max_iters=100), 'Clarabel': dict(max_iters=100), 'SCS': dict(abstol=1.e-6, reltol=1.e-6) }
+
+print("Available cone solvers:", TRIVARIATE_BACKENDS.available_backends())
+try:
+  ref = pid(pdf, cone_solver='ECOS', output=0, **parms['ECOS'])
+  for cone_solver in TRIVARIATE_BACKENDS.available_backends() + ['NumPy']:
+    tic = time.time()
+    sol = pid(pdf, cone_solver=cone_solver, output=0, **parms.get(cone_solver, dict()))
+    toc = time.time()
+    print(sol['Solver'], "time", toc - tic, "secs")
+    print("  Max. difference to ECOS:", max( abs(sol[k] - ref[k]) for k in keys ))
+    print("  Numerical errors:", sol['Num_err_I'], sol['Num_err_12'], sol['Num_err_13'], sol['Num_err_23'])
+  #^ for cone_solver
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+print("The End")
@@ -0,0 +1,34 @@
+# test_decompose.py
+# pid() with decompose='on' on a pdf whose cone programs split into independent blocks
+import numpy as np
+import time
+from MAXENT3D_PID import pid, MAXENT3D_PID_Exception
+
+# Six blocks: the values of T, X, Y, and Z of different blocks never occur together
+np.random.seed(0)
+blocks, k, k_T = 6, 4, 3
+pdf = np.zeros((blocks*k_T, blocks*k, blocks*k, blocks*k))
+for i in range(blocks):
+  pdf[i*k_T:(i+1)*k_T, i*k:(i+1)*k, i*k:(i+1)*k, i*k:(i+1)*k] = np.random.rand(k_T,k,k,k)*np.random.rand()
+pdf /= pdf.sum()
+
+# ECOS parameters
+parms = dict()
+parms['max_iters'] = 100
+
+keys = ['CI', 'UIX', 'UIY', 'UIZ', 'UIXY', 'UIXZ', 'UIYZ', 'SI']
+print("Starting MAXENT3D_PID.pid() on", blocks, "independent blocks.")
+try:
+  tic = time.time()
+  sol = pid(pdf, output=0, **parms)
+  toc = time.time()
+  sol_dec = pid(pdf, output=0, decompose='on', **parms)
+  toc_dec = time.time()
+  print("PID:", { k: sol_dec[k] for k in keys })
+  print("Max. difference to the undecomposed programs:", max( abs(sol[k] - sol_dec[k]) for k in keys ))
+  print("Numerical errors:", sol_dec['Num_err_I'], sol_dec['Num_err_12'])
+  print("Time undecomposed:", toc - tic, "secs, decomposed:", toc_dec - toc, "secs")
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+print("The End")
@@ -0,0 +1,42 @@
+# test_estimate_cost.py
+# Sizes of the cone programs predicted by estimate_cost() against the programs of pid()
+import numpy as np
+import time
+from MAXENT3D_PID import pid, estimate_cost, MAXENT3D_PID_Exception
+
+np.random.seed(0)
+pdf = np.random.rand(8, 6, 5, 6)
+pdf[pdf < 0.3] = 0
+pdf /= pdf.sum()
+
+estimate = estimate_cost(pdf)
+print("Predicted: nnz", estimate['nnz'], "time", estimate['Time_estimate'], "secs, memory", estimate['Memory_estimate'], "MB")
+
+# ECOS parameters
+parms = dict()
+parms['max_iters'] = 100
+parms['keep_solver_object'] = True
+
+try:
+  tic = time.time()
+  sol = pid(pdf, output=0, symmetry='off', measure_memory='on', **parms)
+  toc = time.time()
+  print("Actual: time", toc - tic, "secs, peak RSS", sol['Peak_RSS'], "MB")
+  subsolver_I, subsolver_II = sol['Opt I Solver Object'], sol['Opt II Solver Object']
+  A, G, dims = subsolver_I.A, subsolver_I.G, subsolver_I.dims
+  print("min -H(T|X,Y,Z) predicted:", estimate['Size_I'])
+  print("min -H(T|X,Y,Z) created:  ", dict(variables=A.shape[1], equations=A.shape[0], cones=dims['e'], nonnegative=dims.get('l',0), nnz_A=A.nnz, nnz_G=G.nnz))
+  # subsolver_II keeps the last program, min -H(T|Y,Z)
+  A, G, dims = subsolver_II.A, subsolver_II.G, subsolver_II.dims
+  print("min -H(T|Y,Z) predicted:", estimate['Size_23'])
+  print("min -H(T|Y,Z) created:  ", dict(variables=A.shape[1], equations=A.shape[0], cones=dims['e'], nonnegative=dims.get('l',0), nnz_A=A.nnz, nnz_G=G.nnz))
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+# Only the marginals of a large alphabet: nothing is enumerated
+marginals = ( np.ones((40,200)), np.ones((40,200)), np.ones((40,200)), np.ones((200,200)), np.ones((200,200)), np.ones((200,200)) )
+tic = time.time()
+estimate = estimate_cost(marginals=marginals)
+print("40x200x200x200: nnz", estimate['nnz'], "predicted time", estimate['Time_estimate'], "secs, memory", estimate['Memory_estimate'], "MB (estimated in", time.time() - tic, "secs)")
+
+print("The End")
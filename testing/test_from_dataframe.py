@@ -0,0 +1,47 @@
+# test_from_dataframe.py
+# pid_from_dataframe() compared to pid_from_samples() on the complete rows
+import numpy as np
+import pandas as pd
+from MAXENT3D_PID import pid_from_dataframe, pdf_from_dataframe, pid_from_samples, MAXENT3D_PID_Exception
+
+np.random.seed(0)
+n = 10000
+x = np.random.randint(0, 2, n)
+y = np.random.randint(0, 3, n)
+z = np.where( np.random.rand(n) < 0.8, x, 1 - x )
+t = (x + y) % 2
+w = np.random.rand(n)
+
+df = pd.DataFrame({ 'T': t, 'X': x, 'Y': y, 'Z': z, 'W': w })
+# X as a categorical with an unused category
+df['X'] = pd.Categorical(np.where(x == 0, 'off', 'on'), categories=['off', 'on', 'unused'])
+# Rows with a missing value (their weights are invalid, but not used)
+df.loc[[0, 1], 'Y'] = np.nan
+df.loc[[0], 'W'] = np.nan
+df.loc[[1], 'W'] = -1.
+complete = np.ones(n, dtype=bool)
+complete[[0, 1]] = False
+
+# ECOS parameters
+parms = dict()
+parms['max_iters'] = 100
+
+keys = ['CI', 'UIX', 'UIY', 'UIZ', 'UIXY', 'UIXZ', 'UIYZ', 'SI']
+try:
+  pdf, alphabets = pdf_from_dataframe(df, 'T', 'X', 'Y', 'Z', weights='W')
+  print("Alphabets:", alphabets, "\nShape:", pdf.shape, "\nP(X = unused) =", pdf[:,2].sum())
+  sol = pid_from_dataframe(df, 'T', 'X', 'Y', 'Z', weights='W', output=0, **parms)
+  ref = pid_from_samples(t[complete], x[complete], y[complete], z[complete], weights=w[complete], output=0, **parms)
+  print("Max. difference to pid_from_samples():", max( abs(sol[k] - ref[k]) for k in keys ))
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+# Weights which are 0 on all complete rows
+df.loc[complete, 'W'] = 0.
+try:
+  pdf_from_dataframe(df, 'T', 'X', 'Y', 'Z', weights='W')
+  print("Zero weights were not rejected")
+except ValueError as e:
+  print("Zero weights rejected:", e)
+
+print("The End")
@@ -0,0 +1,80 @@
+# test_from_samples.py
+import numpy as np
+import os, tempfile
+from MAXENT3D_PID import pid, pid_from_samples, pdf_from_samples, pdf_from_memmap, Histogram_Accumulator, MAXENT3D_PID_Exception
+
+
+# XOR gate with a noisy copy of X in Z
+np.random.seed(0)
+n = 1000000
+x = np.random.randint(0, 2, n)
+y = np.random.randint(0, 2, n)
+z = np.where( np.random.rand(n) < 0.9, x, 1 - x )
+t = x ^ y
+
+# ECOS parameters
+parms = dict()
+parms['max_iters'] = 100
+
+print("Starting MAXENT3D_PID.pid_from_samples() on", n, "samples.")
+try:
+  sol = pid_from_samples(t, x, y, z, output=0, **parms)
+  # Reference: fill the dictionary sample by sample
+  counts = dict()
+  for txyz in zip(t.tolist(), x.tolist(), y.tolist(), z.tolist()):
+    counts[txyz] = counts.get(txyz, 0) + 1
+  gate = { k: v/n for k,v in counts.items() }
+  ref = pid(gate, output=0, **parms)
+  keys = ['CI', 'UIX', 'UIY', 'UIZ', 'UIXY', 'UIXZ', 'UIYZ', 'SI']
+  print("PID:", { k: sol[k] for k in keys })
+  print("Max. difference to dictionary input:", max( abs(sol[k] - ref[k]) for k in keys ))
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+# Chunked ingestion
+print("Starting MAXENT3D_PID.Histogram_Accumulator on chunks of 100000 samples.")
+try:
+  acc = Histogram_Accumulator(2, 2, 2, 2)
+  for i in range(0, n, 100000):
+    acc.add(t[i:i+100000], x[i:i+100000], y[i:i+100000], z[i:i+100000])
+  sol_acc = acc.pid(output=0, **parms)
+  print("Max. difference to pid_from_samples():", max( abs(sol_acc[k] - sol[k]) for k in keys ))
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+# Samples on disk (.npy files and a raw binary file)
+tmp = tempfile.mkdtemp()
+np.save(os.path.join(tmp, "t.npy"), t.astype(np.int8))
+np.save(os.path.join(tmp, "x.npy"), x.astype(np.int8))
+np.save(os.path.join(tmp, "y.npy"), y.astype(np.int8))
+z.astype(np.int8).tofile(os.path.join(tmp, "z.bin"))
+pdf_disk = pdf_from_memmap(os.path.join(tmp, "t.npy"), os.path.join(tmp, "x.npy"), os.path.join(tmp, "y.npy"), os.path.join(tmp, "z.bin"), dtype=np.int8, block_size=65536)
+print("Max. difference of pdf_from_memmap() to the histogram of the samples:", abs(pdf_disk - acc.pdf()).max())
+
+# Counts and weighted samples
+print("Starting MAXENT3D_PID.pid() on the count tensor and on weighted samples.")
+try:
+  sol_cnt = pid(acc.counts, output=0, **parms)
+  print("Max. difference of count input to pid_from_samples():", max( abs(sol_cnt[k] - sol[k]) for k in keys ))
+  # Duplicating every sample is the same as giving it weight 2
+  w = np.where( np.arange(n) % 2 == 0, 2., 1. )
+  tt,xx,yy,zz = ( np.concatenate([v, v[::2]]) for v in (t,x,y,z) )
+  sol_w   = pid_from_samples(t, x, y, z, weights=w, output=0, **parms)
+  sol_dup = pid_from_samples(tt, xx, yy, zz, output=0, **parms)
+  print("Max. difference of weighted to duplicated samples:", max( abs(sol_w[k] - sol_dup[k]) for k in keys ))
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+# Categorical observations
+pdf, alphabets = pdf_from_samples(np.array(['a','b','a']), np.array([3,1,3]), np.array([0,0,0]), np.array([1.5,2.5,1.5]))
+print("Alphabets:", alphabets, "\nShape:", pdf.shape, "\nP(a,3,0,1.5) =", pdf[0,1,0,0])
+
+# Invalid counts raise ValueError (also with python -O)
+for bad in ( {(0,0,0,0): -1, (1,0,0,0): 2}, np.zeros((2,2,2,2), dtype=int) ):
+  try:
+    pid(bad, output=0)
+    print("Invalid counts were not rejected")
+  except ValueError as e:
+    print("Invalid counts rejected:", e)
+
+print("The End")
@@ -0,0 +1,49 @@
+# test_maxent.py
+# pid() by the NumPy engine of TRIVARIATE_MAXENT, compared to ECOS
+import numpy as np
+import time
+from MAXENT3D_PID import pid, MAXENT3D_PID_Exception
+
+# XOR gate (the optimum has blocks without mass)
+xorgate = dict()
+xorgate[ (0,0,0,0) ] = .125
+xorgate[ (1,0,0,1) ] = .125
+xorgate[ (1,0,1,0) ] = .125
+xorgate[ (1,1,0,0) ] = .125
+xorgate[ (0,0,1,1) ] = .125
+xorgate[ (0,1,0,1) ] = .125
+xorgate[ (0,1,1,0) ] = .125
+xorgate[ (1,1,1,1) ] = .125
+
+pdfs = [ ('XOR gate', xorgate) ]
+np.random.seed(0)
+for shape in ( (3,2,2,2), (6,5,5,4), (12,8,8,8) ):
+    pdf = np.random.rand(*shape)
+    pdf[pdf < 0.4] = 0
+    pdf /= pdf.sum()
+    pdfs.append( ("random pdf of shape "+str(shape), pdf) )
+#^ for shapes
+
+# ECOS parameters (translated for the engine: max_iters bounds the Newton steps)
+parms = dict()
+parms['max_iters'] = 100
+
+keys = ['CI', 'UIX', 'UIY', 'UIZ', 'UIXY', 'UIXZ', 'UIYZ', 'SI']
+try:
+  for name, pdf in pdfs:
+    tic = time.time()
+    ref = pid(pdf, cone_solver='ECOS', output=0, **parms)
+    toc = time.time()
+    sol = pid(pdf, cone_solver='NumPy', output=0, **parms)
+    toc_np = time.time()
+    print(name+":")
+    print("  Time ECOS:", toc - tic, "secs, NumPy:", toc_np - toc, "secs")
+    print("  Max. difference to ECOS:", max( abs(sol[k] - ref[k]) for k in keys ))
+    print("  Numerical errors:", sol['Num_err_I'], sol['Num_err_12'], sol['Num_err_13'], sol['Num_err_23'])
+  #^ for pdfs
+  sol_par = pid(pdfs[-1][1], cone_solver='NumPy', output=0, parallel='on', **parms)
+  print("Max. difference of parallel='on':", max( abs(sol_par[k] - sol[k]) for k in keys ))
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+print("The End")
@@ -0,0 +1,49 @@
+# test_memory.py
+# The models are int32-indexed and not kept on the subsolvers unless asked; the peak RSS is only reset on request
+import numpy as np
+import MAXENT3D_PID
+from MAXENT3D_PID import pid, Opt_I, Opt_II, MAXENT3D_PID_Exception
+
+np.random.seed(0)
+pdf = np.random.rand(6,5,5,4)
+pdf[pdf < 0.4] = 0
+pdf /= pdf.sum()
+marginals = ( pdf.sum(axis=(2,3)), pdf.sum(axis=(1,3)), pdf.sum(axis=(1,2)), pdf.sum(axis=(0,3)), pdf.sum(axis=(0,2)), pdf.sum(axis=(0,1)) )
+
+def held(subsolver):
+    return [ name for name in ('c', 'G', 'h', 'dims', 'A', 'b') if hasattr(subsolver, name) ]
+def index_types(A, G):
+    return set( str(M.indices.dtype) for M in (A, G) ) | set( str(M.indptr.dtype) for M in (A, G) )
+
+subsolver_I  = Opt_I(*marginals)
+subsolver_II = Opt_II(*marginals)
+c, G, h, dims, A, b = subsolver_I.create_model(0)
+print("min -H(T|X,Y,Z): index types", index_types(A, G), "held by the subsolver:", held(subsolver_I))
+for ws in ( [1,2], [1,3], [2,3] ):
+  c, G, h, dims, A, b = subsolver_II.create_model(ws, 0)
+  print("min -H(T|"+"XYZ"[ws[0]-1]+","+"XYZ"[ws[1]-1]+"): index types", index_types(A, G), "held by the subsolver:", held(subsolver_II))
+#^ for programs
+subsolver_I.keep_model = True
+subsolver_I.create_model(0)
+print("With keep_model, held by the subsolver:", held(subsolver_I))
+
+# ECOS parameters
+parms = dict()
+parms['max_iters'] = 100
+
+try:
+  sol = pid(pdf, output=0, **parms)
+  print("Peak RSS (of the process):", sol['Peak_RSS'], "MB, models in the cache:", len(MAXENT3D_PID.model_cache.templates))
+  if MAXENT3D_PID.peak_rss() is not None:
+    # A large array raises the peak; pid() does not reset it unless measure_memory='on'
+    big = np.ones(2**25)
+    del big
+    before = MAXENT3D_PID.peak_rss()
+    sol = pid(pdf, output=0, **parms)
+    print("Peak RSS kept by pid():", sol['Peak_RSS'] >= before)
+    sol = pid(pdf, output=0, measure_memory='on', **parms)
+    print("Peak RSS of the call with measure_memory='on' below the earlier peak:", sol['Peak_RSS'] < before)
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+print("The End")
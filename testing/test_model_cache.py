@@ -0,0 +1,47 @@
+# test_model_cache.py
+# pid(..., model_cache='on'): a pdf with the support of an earlier one reuses its model templates
+import numpy as np
+import MAXENT3D_PID
+from MAXENT3D_PID import pid, MAXENT3D_PID_Exception
+
+np.random.seed(0)
+shape = (4,3,3,3)
+support = np.random.rand(*shape) > 0.4
+pdfs = []
+for i in range(2):
+    pdf = np.where(support, np.random.rand(*shape), 0.)
+    pdfs.append( pdf/pdf.sum() )
+#^ for pdfs
+
+# ECOS parameters
+parms = dict()
+parms['max_iters'] = 100
+
+cache = MAXENT3D_PID.model_cache
+keys = ['CI', 'UIX', 'UIY', 'UIZ', 'UIXY', 'UIXZ', 'UIYZ', 'SI']
+try:
+  # Default: the cache is not used, nothing outlives the call
+  cache.clear()
+  cold = pid(pdfs[1], output=0, **parms)
+  print("Templates after a call with model_cache='off':", len(cache.templates))
+
+  pid(pdfs[0], output=0, model_cache='on', **parms)
+  print("Templates after the first call with model_cache='on':", len(cache.templates), "hits:", cache.hits)
+  hits = cache.hits
+  sol = pid(pdfs[1], output=0, model_cache='on', **parms)
+  print("Hits of the second call (support and four programs):", cache.hits - hits)
+  print("Max. difference to a cold solve:", max( abs(sol[k] - cold[k]) for k in keys ))
+
+  # parallel='on': the models are created in this process (not in the workers), so they are cached here
+  cache.clear()
+  pid(pdfs[0], output=0, parallel='on', model_cache='on', **parms)
+  print("Templates after the first call with parallel='on':", len(cache.templates), "hits:", cache.hits)
+  hits = cache.hits
+  sol_par = pid(pdfs[1], output=0, parallel='on', model_cache='on', **parms)
+  print("Hits of the second call with parallel='on':", cache.hits - hits)
+  print("Max. difference to a cold solve:", max( abs(sol_par[k] - cold[k]) for k in keys ))
+  cache.clear()
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+print("The End")
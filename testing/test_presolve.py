@@ -0,0 +1,37 @@
+# test_presolve.py
+# pid() with presolve='on' on a pdf whose cone programs are mostly fixed by the marginals
+import numpy as np
+import time
+from MAXENT3D_PID import pid, MAXENT3D_PID_Exception
+
+# T = (Y,Z) for most values: each such t has a single compatible (y,z), so
+# the (t,x) marginals pin q(t,x,y,z); the last values of T are noisy
+np.random.seed(0)
+k = 12
+pdf = np.zeros((k*k + 2, k, k, k))
+for y in range(k):
+  for z in range(k):
+    pdf[y*k + z, :, y, z] = np.random.rand(k)
+pdf[k*k:] = np.random.rand(2, k, k, k)*0.01
+pdf /= pdf.sum()
+
+# ECOS parameters
+parms = dict()
+parms['max_iters'] = 100
+
+keys = ['CI', 'UIX', 'UIY', 'UIZ', 'UIXY', 'UIXZ', 'UIYZ', 'SI']
+print("Starting MAXENT3D_PID.pid() on a pdf of shape", pdf.shape)
+try:
+  tic = time.time()
+  sol = pid(pdf, output=0, **parms)
+  toc = time.time()
+  sol_pre = pid(pdf, output=0, presolve='on', keep_solver_object=False, **parms)
+  toc_pre = time.time()
+  print("PID:", { k: sol_pre[k] for k in keys })
+  print("Max. difference to the programs without presolve:", max( abs(sol[k] - sol_pre[k]) for k in keys ))
+  print("Numerical errors:", sol_pre['Num_err_I'], sol_pre['Num_err_12'])
+  print("Time without presolve:", toc - tic, "secs, with presolve:", toc_pre - toc, "secs")
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+print("The End")
@@ -0,0 +1,36 @@
+# test_symmetry.py
+# pid() on a pdf with exchangeable sources: the twin programs min -H(T|U,V) are solved once
+import numpy as np
+import time
+from MAXENT3D_PID import pid, coded_pdf, exchangeable_sources, twin_programs, MAXENT3D_PID_Exception
+
+# P(t,x,y,z) = P(t,y,x,z): X and Y are exchangeable
+np.random.seed(0)
+pdf = np.random.rand(4, 6, 6, 5)
+pdf = pdf + pdf.transpose(0, 2, 1, 3)
+pdf /= pdf.sum()
+
+codes, values, alphabets = coded_pdf(pdf)
+swaps = exchangeable_sources(codes, values, pdf.shape)
+print("Exchangeable sources:", swaps, "Twin programs:", twin_programs(swaps))
+
+# ECOS parameters
+parms = dict()
+parms['max_iters'] = 100
+
+keys = ['CI', 'UIX', 'UIY', 'UIZ', 'UIXY', 'UIXZ', 'UIYZ', 'SI']
+print("Starting MAXENT3D_PID.pid() on a pdf of shape", pdf.shape)
+try:
+  tic = time.time()
+  sol_off = pid(pdf, output=0, symmetry='off', **parms)
+  toc = time.time()
+  sol = pid(pdf, output=0, **parms)
+  toc_sym = time.time()
+  print("PID:", { k: sol[k] for k in keys })
+  print("Max. difference to solving all programs:", max( abs(sol[k] - sol_off[k]) for k in keys ))
+  print("Numerical errors of min -H(T|X,Z) and its twin min -H(T|Y,Z):", sol['Num_err_13'], sol['Num_err_23'])
+  print("Time solving all programs:", toc - tic, "secs, solving the distinct ones:", toc_sym - toc, "secs")
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+print("The End")
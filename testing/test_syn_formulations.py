@@ -0,0 +1,29 @@
+# test_syn_formulations.py
+# Compares the formulations of the cone program min -H(T|X,Y,Z) (cf. Opt_I.syn_formulation)
+import numpy as np
+import time
+from MAXENT3D_PID import Opt_I, model_cache
+
+formulations = ['standard', 'reduced', 'auxiliary']
+
+np.random.seed(0)
+for shape in [ (2,2,2,2), (8,6,6,6), (20,8,8,8) ]:
+  pdf = np.random.rand(*shape)
+  pdf[ pdf < 0.3 ] = 0.
+  pdf /= pdf.sum()
+  marginals = ( pdf.sum(axis=(2,3)), pdf.sum(axis=(1,3)), pdf.sum(axis=(1,2)), pdf.sum(axis=(0,3)), pdf.sum(axis=(0,2)), pdf.sum(axis=(0,1)) )
+  print("Alphabet sizes |T|x|X|x|Y|x|Z| =", shape)
+  for formulation in formulations:
+    model_cache.clear()
+    subsolver = Opt_I(*marginals)
+    subsolver.syn_formulation = formulation
+    tic = time.time()
+    c, G, h, dims, A, b = subsolver.create_model(0)
+    toc_model = time.time()
+    retval, sol_rpq, sol_slack, sol_lambda, sol_mu, sol_info = subsolver.solve(c, G, h, dims, A, b, 0)
+    toc_solve = time.time()
+    primal_infeas, dual_infeas = subsolver.check_feasibility(sol_rpq, sol_lambda, 0)
+    print("  %-9s variables: %6d  nnz(A)+nnz(G): %8d  H(T|X,Y,Z): %.10f  model: %.3fs  solve: %.3fs  infeasibility: %.1e %.1e"
+          % (formulation, len(c), A.nnz + G.nnz, subsolver.condentropy(sol_rpq, 0), toc_model - tic, toc_solve - toc_model, primal_infeas, dual_infeas))
+
+print("The End")
@@ -0,0 +1,44 @@
+# test_tensor_input.py
+import numpy as np
+from MAXENT3D_PID import pid, MAXENT3D_PID_Exception
+
+
+# AND DUBLICATE as a dictionary
+andDgate = dict()
+andDgate[ (0,0,0,0) ] = .25
+andDgate[ (0,0,1,0) ] = .25
+andDgate[ (0,1,0,1) ] = .25
+andDgate[ (1,1,1,1) ] = .25
+
+# AND DUBLICATE as a tensor of shape |T|x|X|x|Y|x|Z|
+andDtensor = np.zeros((2,2,2,2))
+for txyz,r in andDgate.items(): andDtensor[txyz] = r
+
+# Random tensor with zeros
+np.random.seed(0)
+randtensor = np.random.rand(3,2,4,3)
+randtensor[ randtensor < 0.3 ] = 0.
+randtensor /= randtensor.sum()
+randgate = { tuple(txyz): float(randtensor[tuple(txyz)]) for txyz in np.argwhere(randtensor > 0).tolist() }
+
+# ECOS parameters
+parms = dict()
+parms['max_iters'] = 100
+
+keys = ['CI', 'UIX', 'UIY', 'UIZ', 'UIXY', 'UIXZ', 'UIYZ', 'SI']
+for name,gate,tensor in [ ("AND gate", andDgate, andDtensor), ("Random gate", randgate, randtensor) ]:
+  print("Starting MAXENT3D_PID.pid() on "+name+" (dictionary vs. tensor).")
+  try:
+    sol_dict   = pid(gate, output=0, **parms)
+    sol_tensor = pid(tensor, output=0, **parms)
+    print("PID (tensor):", { k: sol_tensor[k] for k in keys })
+    print("Max. difference to dictionary input:", max( abs(sol_dict[k] - sol_tensor[k]) for k in keys ))
+    # The shared context with parallel='on' (shipped to the workers once) gives the same results
+    sol_par_dict   = pid(gate, output=0, parallel='on', **parms)
+    sol_par_tensor = pid(tensor, output=0, parallel='on', **parms)
+    print("Max. difference of parallel='on' to 'off' (dictionary, tensor):", max( abs(sol_par_dict[k] - sol_dict[k]) for k in keys ), max( abs(sol_par_tensor[k] - sol_tensor[k]) for k in keys ))
+    print("Max. difference of the numerical errors:", max( abs(a - b) for e in ('Num_err_I', 'Num_err_12', 'Num_err_13', 'Num_err_23') for a,b in zip(sol_par_dict[e], sol_dict[e]) ))
+  except MAXENT3D_PID_Exception:
+    print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+print("The End")
@@ -0,0 +1,40 @@
+# test_warm_start.py
+# A bootstrap of pid() by the NumPy engine, each call started at the optima of the previous one
+import numpy as np
+import time
+from MAXENT3D_PID import pid, MAXENT3D_PID_Exception
+
+np.random.seed(0)
+shape = (8,6,6,5)
+pdf = np.random.rand(*shape)
+pdf[pdf < 0.4] = 0
+pdf /= pdf.sum()
+# Resamples of 20000 observations of pdf
+samples = [ np.random.multinomial(20000, pdf.ravel()).reshape(shape) for i in range(5) ]
+
+keys = ['CI', 'UIX', 'UIY', 'UIZ', 'UIXY', 'UIXZ', 'UIYZ', 'SI']
+try:
+  previous = pid(pdf, cone_solver='NumPy', output=0)
+  for i, sample in enumerate(samples):
+    tic = time.time()
+    cold = pid(sample, cone_solver='NumPy', output=0)
+    toc = time.time()
+    warm = pid(sample, cone_solver='NumPy', output=0, warm_start=previous)
+    toc_warm = time.time()
+    print("Resample", i, "time cold:", toc - tic, "secs, warm:", toc_warm - toc, "secs")
+    print("  Max. difference warm - cold:", max( abs(warm[k] - cold[k]) for k in keys ))
+    print("  Numerical errors:", warm['Num_err_I'], warm['Num_err_12'], warm['Num_err_13'], warm['Num_err_23'])
+    previous = warm
+  #^ for samples
+  # The alphabets may change: a sample without the symbol 0 of T
+  sample = samples[0]
+  alphabets = [ list(range(n)) for n in shape ]
+  cold = pid(sample[1:], cone_solver='NumPy', output=0, alphabets=[ alphabets[0][1:] ] + alphabets[1:])
+  warm = pid(sample[1:], cone_solver='NumPy', output=0, alphabets=[ alphabets[0][1:] ] + alphabets[1:], warm_start=previous)
+  print("Smaller alphabet of T, max. difference warm - cold:", max( abs(warm[k] - cold[k]) for k in keys ))
+  warm_par = pid(samples[-1], cone_solver='NumPy', output=0, parallel='on', warm_start=previous)
+  print("Max. difference of parallel='on':", max( abs(warm_par[k] - previous[k]) for k in keys ))
+except MAXENT3D_PID_Exception:
+  print("Cone Programming solver failed to find (near) optimal solution. Please report the input probability density function to abdullah.makkeh@gmail.com")
+
+print("The End")